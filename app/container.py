@@ -0,0 +1,47 @@
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.database.materialized_views import TeamTasksMaterializedView
+from app.database.versions import VersionCounters
+from app.events import TaskEventHub
+from app.repositories.task_repository import TaskRepository
+from app.repositories.team_member_repository import TeamMemberRepository
+from app.repositories.team_repository import TeamRepository
+from app.services.dashboard_service import DashboardService
+from app.services.task_service import TaskService
+from app.services.team_member_service import TeamMemberService
+from app.services.team_service import TeamService
+
+
+class ServiceContainer:
+    """
+    Application-scoped repositories and services.
+
+    Built once in the lifespan on the shared database handle and stored on
+    `app.state`, so route dependencies hand out the same instances instead
+    of constructing a repository and a service per request. Repositories
+    and services keep no per-request state; request data (the current user,
+    the projection) is passed to their methods. The materialized team task
+    rows and the version counters are shared by every repository, so a
+    write refreshes the same view instance the maintenance task watches.
+    """
+
+    def __init__(self, db: AsyncDatabase):
+        self.db = db
+        self.team_tasks = TeamTasksMaterializedView(db)
+        self.versions = VersionCounters(db)
+        self.task_repository = TaskRepository(db, self.team_tasks, self.versions)
+        self.team_repository = TeamRepository(db, self.team_tasks, self.versions)
+        self.team_member_repository = TeamMemberRepository(
+            db, self.team_tasks, self.versions
+        )
+        self.task_service = TaskService(self.task_repository)
+        self.team_service = TeamService(self.team_repository)
+        self.team_member_service = TeamMemberService(self.team_member_repository)
+        self.dashboard_service = DashboardService(
+            self.task_repository,
+            self.team_repository,
+            self.team_member_repository,
+            self.team_tasks,
+            self.versions,
+        )
+        self.task_events = TaskEventHub(self.task_repository)
@@ -0,0 +1,307 @@
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.database.views import TEAM_TASKS_JOIN_STAGES
+from app.logging_config import logger
+from config.database import close_mongo_connection, get_database
+
+TEAM_TASKS_COLLECTION = "team_tasks"
+STATE_COLLECTION = "materialized_views"
+
+# Upper bound on how old the last full rebuild may be before the
+# background task rebuilds the rows. Catches writes made outside the
+# repositories (seeding, manual fixes). 0 disables the periodic rebuild.
+TEAM_TASKS_MAX_STALENESS_SECONDS = int(
+    os.getenv("TEAM_TASKS_MAX_STALENESS_SECONDS", "300")
+)
+# How long readers trust their last look at the rebuild state, and how often
+# the background task checks it.
+TEAM_TASKS_STATE_CHECK_SECONDS = float(os.getenv("TEAM_TASKS_STATE_CHECK_SECONDS", "5"))
+
+
+class TeamTasksMaterializedView:
+    """
+    On-demand materialized copy of team_tasks_view.
+
+    Rows are written with $merge into the team_tasks collection and kept
+    current by the repositories, which refresh only the tasks touched by a
+    write. Each refresh stamps rows with `refreshed_at`, taken before it
+    reads the sources; rows in the refresh scope that were not re-emitted by
+    the join (task, team or assignee gone) are removed afterwards. A row is
+    only replaced by one of a later refresh, so concurrent refreshes that
+    finish out of order leave the newest rows in place.
+
+    The refresh runs before the write's request returns and before the
+    version bump that changes the list ETags, so a client never caches an
+    ETag of the new version with rows of the old one. Rows thus reflect a
+    write once its request completes. When a refresh fails the rows are
+    invalidated and readers use the view until `maintain` rebuilds them,
+    within TEAM_TASKS_STATE_CHECK_SECONDS. Writes made outside the
+    repositories, and a row re-inserted by a refresh that finished after a
+    later one removed it, last until the next periodic rebuild, within
+    TEAM_TASKS_MAX_STALENESS_SECONDS.
+
+    Full rebuilds run in a background task (`maintain`), never in a request:
+    readers serve the rows, stale or not, once they have been built, and
+    the view until then or after an invalidation.
+    """
+
+    _rebuild_lock = asyncio.Lock()
+
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        max_staleness: Optional[timedelta] = timedelta(
+            seconds=TEAM_TASKS_MAX_STALENESS_SECONDS
+        ),
+    ):
+        self.source = db["tasks"]
+        self.view = db["team_tasks_view"]
+        self.collection = db[TEAM_TASKS_COLLECTION]
+        self.state = db[STATE_COLLECTION]
+        self.max_staleness = max_staleness or None
+        self.state_check_seconds = TEAM_TASKS_STATE_CHECK_SECONDS
+        self._built: Optional[bool] = None
+        self._built_checked_at = 0.0
+
+    def _pipeline(self, match: Optional[Dict], refreshed_at: datetime) -> List[Dict]:
+        stages = [{"$match": match}] if match else []
+        return (
+            stages
+            + TEAM_TASKS_JOIN_STAGES
+            + [
+                {
+                    "$project": {
+                        "title": 1,
+                        "status": 1,
+                        "team_name": "$team.name",
+                        "team_member": "$assignee.name",
+                        "team_id": 1,
+                        "assigned_to": 1,
+                        "refreshed_at": {"$literal": refreshed_at},
+                    }
+                },
+                {
+                    "$merge": {
+                        "into": TEAM_TASKS_COLLECTION,
+                        "on": "_id",
+                        # Keep a row written by a refresh that started later.
+                        "whenMatched": [
+                            {
+                                "$replaceWith": {
+                                    "$cond": [
+                                        {
+                                            "$gte": [
+                                                "$$new.refreshed_at",
+                                                "$refreshed_at",
+                                            ]
+                                        },
+                                        "$$new",
+                                        "$$ROOT",
+                                    ]
+                                }
+                            }
+                        ],
+                        "whenNotMatched": "insert",
+                    }
+                },
+            ]
+        )
+
+    async def _refresh(self, match: Optional[Dict]) -> None:
+        refreshed_at = datetime.now(timezone.utc)
+        await self.source.aggregate(self._pipeline(match, refreshed_at))
+        await self.collection.delete_many(
+            {**(match or {}), "refreshed_at": {"$lt": refreshed_at}}
+        )
+
+    async def _refresh_scope(self, match: Dict, description: str) -> None:
+        try:
+            await self._refresh(match)
+        except Exception as e:
+            # The write itself succeeded; force a rebuild on the next read
+            # rather than failing the request.
+            logger.error(
+                "Error refreshing '%s' for %s: %s",
+                TEAM_TASKS_COLLECTION,
+                description,
+                e,
+            )
+            await self.invalidate()
+
+    async def rebuild(self) -> None:
+        """
+        Recompute every row from the tasks, teams and team_members collections.
+        """
+        logger.info("Rebuilding materialized view '%s'...", TEAM_TASKS_COLLECTION)
+        started_at = datetime.now(timezone.utc)
+        await self._refresh(None)
+        await self.state.update_one(
+            {"_id": TEAM_TASKS_COLLECTION},
+            {"$set": {"refreshed_at": started_at}},
+            upsert=True,
+        )
+        self._built, self._built_checked_at = True, time.monotonic()
+        logger.info("Rebuilt materialized view '%s'.", TEAM_TASKS_COLLECTION)
+
+    async def invalidate(self) -> None:
+        """
+        Mark the materialized rows as incomplete: reads use the view until
+        the background task has rebuilt them.
+        """
+        self._built, self._built_checked_at = False, time.monotonic()
+        await self.state.delete_one({"_id": TEAM_TASKS_COLLECTION})
+
+    async def _last_rebuild(self) -> Optional[datetime]:
+        state = await self.state.find_one({"_id": TEAM_TASKS_COLLECTION})
+        if not state or not state.get("refreshed_at"):
+            return None
+        refreshed_at = state["refreshed_at"]
+        if refreshed_at.tzinfo is None:
+            refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+        return refreshed_at
+
+    async def is_fresh(self) -> bool:
+        """
+        Check the last full rebuild against the staleness bound.
+
+        Returns:
+            bool: True if the rows can be served without a rebuild.
+        """
+        refreshed_at = await self._last_rebuild()
+        if refreshed_at is None:
+            return False
+        if self.max_staleness is None:
+            return True
+        return datetime.now(timezone.utc) - refreshed_at <= self.max_staleness
+
+    async def is_built(self) -> bool:
+        """
+        Check that the rows have been rebuilt since the last invalidation.
+        The state is read at most every `state_check_seconds`, so most
+        reads cost no extra round trip.
+
+        Returns:
+            bool: True if the rows can be served.
+        """
+        now = time.monotonic()
+        if self._built is None or (
+            now - self._built_checked_at >= self.state_check_seconds
+        ):
+            self._built = await self._last_rebuild() is not None
+            self._built_checked_at = now
+        return self._built
+
+    async def ensure_fresh(self) -> bool:
+        """
+        Rebuild if the rows are missing or older than the staleness bound.
+
+        Returns:
+            bool: False if a needed rebuild failed.
+        """
+        if await self.is_fresh():
+            return True
+        async with self._rebuild_lock:
+            # Another request may have rebuilt while we waited.
+            if await self.is_fresh():
+                return True
+            try:
+                await self.rebuild()
+                return True
+            except Exception as e:
+                logger.error("Error rebuilding '%s': %s", TEAM_TASKS_COLLECTION, e)
+                return False
+
+    async def maintain(self) -> None:
+        """
+        Keep the rows within the staleness bound for the application's
+        lifetime: check the state every `state_check_seconds` and rebuild
+        when the last rebuild is too old or was invalidated. Started as a
+        background task in the lifespan.
+        """
+        while True:
+            try:
+                await self.ensure_fresh()
+            except Exception:
+                logger.exception("Error checking '%s'", TEAM_TASKS_COLLECTION)
+            await asyncio.sleep(self.state_check_seconds)
+
+    async def find(
+        self,
+        query: Optional[Dict] = None,
+        batch_size: int = 0,
+        projection: Optional[Dict] = None,
+    ) -> AsyncCursor:
+        """
+        Cursor over the team task rows. Falls back to the non-materialized
+        view until the rows have been built; stale rows are served while
+        the background task rebuilds them.
+
+        Args:
+            query (dict, optional): Filter on the rows.
+            batch_size (int): Rows per batch; 0 keeps the server default.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            AsyncCursor: Cursor for the team task rows.
+        """
+        if await self.is_built():
+            return self.collection.find(
+                query or {},
+                projection or {"refreshed_at": 0},
+                batch_size=batch_size,
+            )
+        return self.view.find(query or {}, projection, batch_size=batch_size)
+
+    async def refresh_tasks(self, task_ids: Iterable) -> None:
+        """
+        Refresh the rows for the given task IDs.
+        """
+        ids = [ObjectId(str(task_id)) for task_id in task_ids]
+        await self._refresh_scope({"_id": {"$in": ids}}, f"tasks {ids}")
+
+    async def remove_tasks(self, task_ids: Iterable) -> None:
+        """
+        Drop the rows of deleted tasks.
+        """
+        ids = [ObjectId(str(task_id)) for task_id in task_ids]
+        await self.collection.delete_many({"_id": {"$in": ids}})
+
+    async def refresh_team(self, team_id: str) -> None:
+        """
+        Refresh the rows of every task belonging to a team.
+        """
+        match = {"team_id": ObjectId(str(team_id))}
+        await self._refresh_scope(match, f"team {team_id}")
+
+    async def refresh_member(self, member_id: str) -> None:
+        """
+        Refresh the rows of every task assigned to a team member.
+        """
+        match = {"assigned_to": ObjectId(str(member_id))}
+        await self._refresh_scope(match, f"team member {member_id}")
+
+
+async def _main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Maintain materialized views of the task management database."
+    )
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args(argv)
+
+    try:
+        await TeamTasksMaterializedView(get_database()).rebuild()
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,263 @@
+import argparse
+import asyncio
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.database.materialized_views import TeamTasksMaterializedView
+from app.database.views import VIEW_DEFINITIONS
+from app.logging_config import logger
+from app.utils import to_object_id
+from config.database import close_mongo_connection, get_database
+
+MIGRATIONS_COLLECTION = "schema_migrations"
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_PAUSE_SECONDS = 0.05
+# Collections holding the application's data; a database where all are
+# empty has nothing to migrate.
+DATA_COLLECTIONS = ("tasks", "teams", "team_members")
+
+
+class Migration(ABC):
+    """
+    Base class for a versioned data migration.
+
+    Subclasses set `version` and `name` and implement `up`. Long running
+    migrations persist progress through `save_checkpoint` so an interrupted
+    run resumes where it stopped.
+    """
+
+    version: int
+    name: str
+
+    def __init__(self, db: AsyncDatabase, batch_size: int, pause_seconds: float):
+        self.db = db
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.records = db[MIGRATIONS_COLLECTION]
+
+    async def load_checkpoint(self, key: str):
+        record = await self.records.find_one({"_id": self.version})
+        return (record or {}).get("checkpoints", {}).get(key)
+
+    async def save_checkpoint(self, key: str, value) -> None:
+        await self.records.update_one(
+            {"_id": self.version},
+            {"$set": {f"checkpoints.{key}": value}},
+            upsert=True,
+        )
+
+    @abstractmethod
+    async def up(self) -> None:
+        """
+        Apply the migration; must be safe to run again after an interruption.
+        """
+
+
+class CanonicalObjectIdReferences(Migration):
+    """
+    Rewrite every reference field to ObjectId.
+
+    Tasks written by the seeding script and the API stored team_id and
+    assigned_to as strings while teams store member_ids and project_manager
+    as ObjectId, forcing team_tasks_view to $convert each row before its
+    $lookup. Documents are rewritten in _id order, one batch at a time.
+    """
+
+    version = 1
+    name = "canonical_object_id_references"
+
+    REFERENCE_FIELDS = {
+        "tasks": ("team_id", "assigned_to", "created_by"),
+        "teams": ("member_ids", "project_manager"),
+        "team_members": ("teams",),
+    }
+
+    async def _rewrite_collection(self, collection_name: str, fields) -> int:
+        collection = self.db[collection_name]
+        # Matches scalar strings and arrays containing a string.
+        string_refs = {"$or": [{field: {"$type": "string"}} for field in fields]}
+        last_id = await self.load_checkpoint(collection_name)
+        rewritten = 0
+
+        while True:
+            query = dict(string_refs)
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            cursor = (
+                collection.find(query, {field: 1 for field in fields})
+                .sort("_id", 1)
+                .limit(self.batch_size)
+            )
+            batch = await cursor.to_list(length=None)
+            if not batch:
+                break
+
+            updates = []
+            for document in batch:
+                changes = {
+                    field: to_object_id(document[field])
+                    for field in fields
+                    if document.get(field) is not None
+                }
+                updates.append(UpdateOne({"_id": document["_id"]}, {"$set": changes}))
+            await collection.bulk_write(updates, ordered=False)
+
+            rewritten += len(updates)
+            last_id = batch[-1]["_id"]
+            await self.save_checkpoint(collection_name, last_id)
+            logger.info(
+                "[migration %s] %s: %d documents rewritten",
+                self.version,
+                collection_name,
+                rewritten,
+            )
+            await asyncio.sleep(self.pause_seconds)
+        return rewritten
+
+    async def up(self) -> None:
+        for collection_name, fields in self.REFERENCE_FIELDS.items():
+            await self._rewrite_collection(collection_name, fields)
+
+        # Existing deployments still hold the $convert based view definition.
+        view_def = VIEW_DEFINITIONS["team_tasks_view"]
+        if "team_tasks_view" in await self.db.list_collection_names():
+            await self.db.command(
+                {
+                    "collMod": "team_tasks_view",
+                    "viewOn": view_def["viewOn"],
+                    "pipeline": view_def["pipeline"],
+                }
+            )
+        await TeamTasksMaterializedView(self.db).rebuild()
+
+
+MIGRATIONS = [CanonicalObjectIdReferences]
+
+
+async def applied_versions(db: AsyncDatabase) -> List[int]:
+    """
+    Get the versions of all fully applied migrations.
+    """
+    cursor = db[MIGRATIONS_COLLECTION].find({"applied_at": {"$ne": None}}, {"_id": 1})
+    return [record["_id"] for record in await cursor.to_list(length=None)]
+
+
+async def pending_migrations(db: AsyncDatabase) -> List[type]:
+    """
+    Get the registered migrations that have not been applied yet.
+    """
+    applied = set(await applied_versions(db))
+    return [m for m in MIGRATIONS if m.version not in applied]
+
+
+async def mark_applied(db: AsyncDatabase, migration_classes: List[type]) -> None:
+    """
+    Record migrations as applied without running them, for databases whose
+    data already has their shape.
+    """
+    for migration_cls in migration_classes:
+        await db[MIGRATIONS_COLLECTION].update_one(
+            {"_id": migration_cls.version},
+            {
+                "$set": {
+                    "name": migration_cls.name,
+                    "applied_at": datetime.now(timezone.utc),
+                }
+            },
+            upsert=True,
+        )
+
+
+async def ensure_migrated(db: AsyncDatabase) -> None:
+    """
+    Refuse to serve a database with pending migrations.
+
+    The queries assume the data has the shape of the latest migration (e.g.
+    references stored as ObjectId), so running against older data would
+    silently miss documents. A database without data has nothing to migrate
+    and is marked as up to date.
+
+    Raises:
+        RuntimeError: If migrations are pending on a database holding data.
+    """
+    pending = await pending_migrations(db)
+    if not pending:
+        return
+    for name in DATA_COLLECTIONS:
+        if await db[name].find_one({}, {"_id": 1}) is not None:
+            raise RuntimeError(
+                f"Pending database migrations: {[m.name for m in pending]}. "
+                "Run 'python -m app.database.migrations upgrade' first."
+            )
+    await mark_applied(db, pending)
+
+
+async def run_migrations(
+    db: AsyncDatabase,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pause_seconds: float = DEFAULT_PAUSE_SECONDS,
+    target: Optional[int] = None,
+) -> List[int]:
+    """
+    Apply pending migrations in version order.
+
+    Args:
+        db (AsyncDatabase): The database instance.
+        batch_size (int): Documents rewritten per bulk write.
+        pause_seconds (float): Pause between batches to throttle load.
+        target (int, optional): Stop after this version.
+
+    Returns:
+        List[int]: Versions applied by this run.
+    """
+    applied = []
+    pending = sorted(await pending_migrations(db), key=lambda m: m.version)
+    for migration_cls in pending:
+        if target is not None and migration_cls.version > target:
+            break
+        logger.info(
+            "Applying migration %s: %s", migration_cls.version, migration_cls.name
+        )
+        migration = migration_cls(db, batch_size, pause_seconds)
+        await migration.records.update_one(
+            {"_id": migration_cls.version},
+            {"$set": {"name": migration_cls.name, "applied_at": None}},
+            upsert=True,
+        )
+        await migration.up()
+        await migration.records.update_one(
+            {"_id": migration_cls.version},
+            {"$set": {"applied_at": datetime.now(timezone.utc)}},
+        )
+        applied.append(migration_cls.version)
+    return applied
+
+
+async def _main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run database migrations.")
+    parser.add_argument("command", choices=["upgrade", "status"])
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=DEFAULT_PAUSE_SECONDS)
+    parser.add_argument("--target", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    db = get_database()
+    try:
+        if args.command == "status":
+            applied = set(await applied_versions(db))
+            for migration_cls in MIGRATIONS:
+                state = "applied" if migration_cls.version in applied else "pending"
+                print(f"{migration_cls.version:04d} {migration_cls.name}: {state}")
+        else:
+            applied = await run_migrations(db, args.batch_size, args.pause, args.target)
+            logger.info("Applied migrations: %s", applied or "none")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
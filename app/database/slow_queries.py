@@ -0,0 +1,321 @@
+"""
+Capture of slow MongoDB commands with their explain plans.
+
+A command listener registered on the shared client records every command
+slower than SLOW_QUERY_THRESHOLD_MS together with the code that issued it
+(e.g. TaskRepository.get_tasks_by_team_ids), then runs
+explain("executionStats") for it in the background. Commands of the same
+shape (collection and filtered fields) are explained once per
+SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS, and at most SLOW_QUERY_MAX_EXPLAINS
+explains run at a time, so a burst of slow queries does not add as many
+explains to an already loaded server. The most recent captures are kept in
+a bounded ring buffer served by /project-manager/slow-queries, with the
+values of their filters, pipelines and updates replaced by their type names
+so no user data (emails, password hashes) is retained.
+"""
+
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from contextvars import Context
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Dict, List, Optional
+
+from bson import json_util
+from pymongo import monitoring
+
+from app.logging_config import logger
+from config.database import get_client
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+# Number of captured commands kept; 0 disables the capture.
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+# Commands of a shape already explained within this interval are not
+# explained again.
+SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS = float(
+    os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", "60")
+)
+# Explains running at once; further slow commands are captured unexplained.
+SLOW_QUERY_MAX_EXPLAINS = int(os.getenv("SLOW_QUERY_MAX_EXPLAINS", "2"))
+
+# Commands explain() accepts.
+EXPLAINABLE_COMMANDS = frozenset(
+    ["aggregate", "count", "delete", "distinct", "find", "findAndModify", "update"]
+)
+# Fields the driver adds that explain rejects or ignores.
+_DRIVER_FIELDS = frozenset(
+    [
+        "lsid",
+        "txnNumber",
+        "$clusterTime",
+        "$db",
+        "$readPreference",
+        "readConcern",
+        "writeConcern",
+    ]
+)
+# Parts of an explain result that do not describe the chosen plan.
+_NON_PLAN_FIELDS = frozenset(
+    ["command", "filter", "parsedQuery", "rejectedPlans", "serverInfo"]
+)
+# Frames of these modules are skipped when looking for the caller.
+_LIBRARY_MODULES = ("pymongo.", "bson.", "asyncio.", __name__)
+
+
+def _caller() -> Optional[str]:
+    """
+    Qualified name of the innermost function outside the driver, e.g.
+    TaskRepository.get_tasks_by_team_ids. Awaiting coroutines are linked
+    through their frames, so this also finds async callers.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_LIBRARY_MODULES):
+            code = frame.f_code
+            return getattr(code, "co_qualname", code.co_name)
+        frame = frame.f_back
+    return None
+
+
+def _filter(command_name: str, command: Dict) -> Dict:
+    if command_name in ("update", "delete"):
+        statements = command.get("updates") or command.get("deletes") or [{}]
+        return statements[0].get("q") or {}
+    return command.get("filter") or command.get("query") or {}
+
+
+def command_shape(command_name: str, database: str, command: Dict) -> tuple:
+    """
+    What decides a command's plan, without the values: the collection, the
+    fields it filters on and, for aggregations, the pipeline's stages and
+    the fields of its first $match.
+    """
+    shape = [database, command_name, command.get(command_name)]
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        shape.append(tuple(next(iter(stage), None) for stage in pipeline))
+        match = next((s["$match"] for s in pipeline if "$match" in s), {})
+        shape.append(tuple(sorted(match)))
+    else:
+        shape.append(tuple(sorted(_filter(command_name, command))))
+    return tuple(shape)
+
+
+def redact(value):
+    """
+    The structure of a command argument with each value replaced by its
+    type name, e.g. {"email": "<str>"}; operators and field names are kept.
+    """
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    return None if value is None else f"<{type(value).__name__}>"
+
+
+def _redact_command(command: Dict) -> Dict:
+    # Top-level options (collection, limit, ...) are kept as they are.
+    return {
+        key: redact(value) if isinstance(value, (dict, list)) else value
+        for key, value in command.items()
+    }
+
+
+def summarize_plan(explain: Dict) -> Dict:
+    """
+    Reduce an explain("executionStats") result to what identifies a bad
+    plan: the stages of the winning plan, whether a collection was scanned,
+    and how many keys and documents were examined for the rows returned.
+    """
+    stages: List[str] = []
+    totals = dict.fromkeys(
+        ("totalKeysExamined", "totalDocsExamined", "collectionScans"), 0
+    )
+
+    def walk(node):
+        if isinstance(node, list):
+            for value in node:
+                walk(value)
+        elif isinstance(node, dict):
+            for key, value in node.items():
+                if key == "stage":
+                    if value not in stages:
+                        stages.append(value)
+                elif key in totals:
+                    totals[key] += value if isinstance(value, int) else 0
+                elif key not in _NON_PLAN_FIELDS:
+                    walk(value)
+
+    walk(explain)
+    # Aggregations list their pipeline stages by operator ($cursor, $lookup).
+    for stage in explain.get("stages", []):
+        name = next(iter(stage), None)
+        if name not in stages:
+            stages.append(name)
+    stats = explain.get("executionStats", {})
+    return {
+        "stages": stages,
+        "collection_scan": "COLLSCAN" in stages or totals["collectionScans"] > 0,
+        "keys_examined": totals["totalKeysExamined"],
+        "docs_examined": totals["totalDocsExamined"],
+        "returned": stats.get("nReturned"),
+        "execution_ms": stats.get("executionTimeMillis"),
+    }
+
+
+class SlowQueryLog(monitoring.CommandListener):
+    """
+    Command listener keeping the slowest recent commands and their plans.
+
+    Commands are held from `started` until they complete; only those over
+    the threshold are copied, so fast commands cost a dict insert and pop.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        size: int,
+        explain_interval: float = SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS,
+        max_explains: int = SLOW_QUERY_MAX_EXPLAINS,
+    ):
+        self.threshold_ms = threshold_ms
+        self.size = size
+        self.explain_interval = explain_interval
+        self.max_explains = max_explains
+        self._entries: deque = deque(maxlen=max(size, 1))
+        self._running: Dict[tuple, tuple] = {}
+        self._explains: set = set()
+        # Command shape -> time.monotonic() of its last explain.
+        self._explained: Dict[tuple, float] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(event) -> tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event):
+        if self.size <= 0 or event.command_name not in EXPLAINABLE_COMMANDS:
+            return
+        with self._lock:
+            self._running[self._key(event)] = (event.command, event.database_name)
+
+    def succeeded(self, event):
+        self._completed(event, failure=None)
+
+    def failed(self, event):
+        self._completed(event, failure=str(event.failure))
+
+    def _completed(self, event, failure: Optional[str]) -> None:
+        if self.size <= 0:
+            return
+        with self._lock:
+            running = self._running.pop(self._key(event), None)
+        duration_ms = event.duration_micros / 1000
+        if running is None or duration_ms < self.threshold_ms:
+            return
+        command, database = running
+        explainable = {k: v for k, v in command.items() if k not in _DRIVER_FIELDS}
+        entry = {
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+            "command_name": event.command_name,
+            "database": database,
+            "collection": command.get(event.command_name),
+            "caller": _caller(),
+            "duration_ms": round(duration_ms, 3),
+            "failure": failure,
+            "command": json.loads(json_util.dumps(_redact_command(explainable))),
+            "plan": None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning(
+            "Slow %s on %s.%s from %s: %s ms",
+            event.command_name,
+            database,
+            entry["collection"],
+            entry["caller"],
+            entry["duration_ms"],
+        )
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        skipped = self._skip_explain(
+            command_shape(event.command_name, database, explainable)
+        )
+        if skipped:
+            with self._lock:
+                entry["plan"] = {"skipped": skipped}
+            return
+        # Run outside the request's context so the explain is not counted in
+        # its timings, and keep a reference until the task finishes.
+        task = loop.create_task(
+            self._explain(entry, database, explainable), context=Context()
+        )
+        self._explains.add(task)
+        task.add_done_callback(self._explains.discard)
+
+    def _skip_explain(self, shape: tuple) -> Optional[str]:
+        """
+        Why a command of this shape is not explained now, or None after
+        recording that it is.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if len(self._explains) >= self.max_explains:
+                return "explains already running"
+            if now - self._explained.get(shape, -math.inf) < self.explain_interval:
+                return "same shape explained recently"
+            # Forget shapes whose interval is over, keeping the dict small.
+            for expired in [
+                key
+                for key, at in self._explained.items()
+                if now - at >= self.explain_interval
+            ]:
+                del self._explained[expired]
+            self._explained[shape] = now
+        return None
+
+    async def _run_explain(self, database: str, command: Dict) -> Dict:
+        return await get_client()[database].command(
+            {"explain": command, "verbosity": "executionStats"}
+        )
+
+    async def _explain(self, entry: Dict, database: str, command: Dict) -> None:
+        started = time.perf_counter()
+        try:
+            plan = summarize_plan(await self._run_explain(database, command))
+        except Exception as e:
+            plan = {"error": str(e)}
+        plan["explain_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        with self._lock:
+            entry["plan"] = plan
+
+    def entries(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Captured commands, most recent first.
+
+        Args:
+            limit (int, optional): Maximum number of entries.
+
+        Returns:
+            list: Copies of the captured entries.
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in reversed(self._entries)]
+        return entries[:limit] if limit is not None else entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._running.clear()
+            self._explained.clear()
+
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_SIZE)
@@ -0,0 +1,80 @@
+"""
+Version counters of the data behind the cacheable list endpoints.
+
+Each scope is one small document in the `versions` collection whose
+counter the repositories increment after every write affecting it:
+
+    teams            any team
+    team_members     any team member
+    tasks            tasks of any team (writes whose team is not known)
+    tasks:<team_id>  tasks of one team
+
+The ETags of the list endpoints are derived from these counters (see
+app/dependencies/etags.py), so a conditional request is answered by reading them
+without touching the data collections. `epoch` is set when a counter
+document is created, so counters that restart after the collection is
+dropped do not repeat earlier ETags.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+VERSIONS_COLLECTION = "versions"
+
+TEAMS_SCOPE = "teams"
+TEAM_MEMBERS_SCOPE = "team_members"
+TASKS_SCOPE = "tasks"
+
+
+def team_tasks_scope(team_id) -> str:
+    """
+    Scope of the tasks of one team.
+    """
+    return f"{TASKS_SCOPE}:{team_id}"
+
+
+class VersionCounters:
+    def __init__(self, db: AsyncDatabase):
+        self.collection = db[VERSIONS_COLLECTION]
+
+    async def bump(self, scopes: Iterable[str]) -> None:
+        """
+        Increment the counter of each scope, creating missing ones.
+
+        Args:
+            scopes (Iterable[str]): Scopes whose data changed.
+        """
+        operations = [
+            UpdateOne(
+                {"_id": scope},
+                {"$inc": {"version": 1}, "$setOnInsert": {"epoch": ObjectId()}},
+                upsert=True,
+            )
+            for scope in dict.fromkeys(scopes)
+        ]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def get(self, scopes: Iterable[str]) -> Dict[str, Optional[Tuple]]:
+        """
+        Read the current version of each scope in one query.
+
+        Args:
+            scopes (Iterable[str]): Scopes to read.
+
+        Returns:
+            Dict[str, tuple or None]: (epoch, version) by scope; None for a
+            scope never written since the counters were created.
+        """
+        scopes = list(dict.fromkeys(scopes))
+        versions = dict.fromkeys(scopes)
+        cursor = self.collection.find({"_id": {"$in": scopes}})
+        async for document in cursor:
+            versions[document["_id"]] = (
+                str(document.get("epoch")),
+                document.get("version", 0),
+            )
+        return versions
@@ -1,55 +1,50 @@
+from typing import Dict, List, Tuple
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import OperationFailure
 from app.logging_config import logger
 
+# Join stages shared by team_tasks_view and its materialized copy
+# (see app/database/materialized_views.py).
+TEAM_TASKS_JOIN_STAGES = [
+    # team_id and assigned_to are stored as ObjectId (see
+    # app/database/migrations.py), so both lookups hit the _id index.
+    {
+        "$lookup": {
+            "from": "teams",
+            "localField": "team_id",
+            "foreignField": "_id",
+            "as": "team",
+        }
+    },
+    {"$unwind": "$team"},
+    {
+        "$lookup": {
+            "from": "team_members",
+            "localField": "assigned_to",
+            "foreignField": "_id",
+            "as": "assignee",
+        }
+    },
+    {"$unwind": "$assignee"},
+]
+
 # Define your views and their pipelines here
 VIEW_DEFINITIONS = {
     "team_tasks_view": {
         "viewOn": "tasks",
-        "pipeline": [
-            {
-                "$addFields": {
-                    "team_id_obj": {
-                        "$convert": {
-                            "input": "$team_id",
-                            "to": "objectId",
-                            "onError": "",
-                            "onNull": "",
-                        }
-                    },
-                    "assigned_to_obj": {
-                        "$convert": {
-                            "input": "$assigned_to",
-                            "to": "objectId",
-                            "onError": "",
-                            "onNull": "",
-                        }
-                    },
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "teams",
-                    "localField": "team_id_obj",
-                    "foreignField": "_id",
-                    "as": "team",
-                }
-            },
-            {"$unwind": "$team"},
-            {
-                "$lookup": {
-                    "from": "team_members",
-                    "localField": "assigned_to_obj",
-                    "foreignField": "_id",
-                    "as": "assignee",
-                }
-            },
-            {"$unwind": "$assignee"},
+        "pipeline": TEAM_TASKS_JOIN_STAGES
+        + [
             {
                 "$project": {
                     "title": 1,
                     "status": 1,
                     "team_name": "$team.name",
                     "team_member": "$assignee.name",
+                    # Filtered on by the repositories when they read the
+                    # view instead of the materialized rows.
+                    "team_id": 1,
+                    "assigned_to": 1,
                 }
             },
         ],
@@ -128,6 +123,149 @@ VIEW_DEFINITIONS = {
     },
 }
 
+# Indexes backing the repository queries, keyed by collection.
+INDEX_DEFINITIONS = {
+    "team_members": [
+        # TeamMemberRepository.get_team_member_by_email (every /auth/login)
+        {"name": "email_unique", "keys": [("email", ASCENDING)], "unique": True},
+        # TeamMemberRepository.get_team_members_by_role
+        {"name": "role", "keys": [("role", ASCENDING)]},
+    ],
+    "teams": [
+        # TeamRepository.get_team_by_project_manager
+        {"name": "project_manager", "keys": [("project_manager", ASCENDING)]},
+        {"name": "member_ids", "keys": [("member_ids", ASCENDING)]},
+    ],
+    "tasks": [
+        # TaskRepository.get_tasks_by_team_ids, newest first within a status
+        {
+            "name": "team_id_status_updated_at",
+            "keys": [
+                ("team_id", ASCENDING),
+                ("status", ASCENDING),
+                ("updated_at", DESCENDING),
+            ],
+        },
+        # Keyset pagination of a team lead's tasks (team_id $in, sort _id)
+        {"name": "team_id__id", "keys": [("team_id", ASCENDING), ("_id", ASCENDING)]},
+        # Tasks assigned to a team member (/team-member/tasks/)
+        {
+            "name": "assigned_to_status",
+            "keys": [("assigned_to", ASCENDING), ("status", ASCENDING)],
+        },
+    ],
+    # Materialized team_tasks_view; scopes incremental refreshes
+    "team_tasks": [
+        {"name": "team_id", "keys": [("team_id", ASCENDING)]},
+        {"name": "assigned_to", "keys": [("assigned_to", ASCENDING)]},
+    ],
+}
+
+
+def _normalize_key(key) -> List[tuple]:
+    """
+    Normalize an index key spec to a list of (field, direction) tuples.
+    """
+    items = key.items() if isinstance(key, dict) else key
+    return [
+        (field, int(direction) if isinstance(direction, float) else direction)
+        for field, direction in items
+    ]
+
+
+async def create_indexes(db: AsyncDatabase) -> Dict[str, List[str]]:
+    """
+    Create every index in INDEX_DEFINITIONS. Safe to run on each startup:
+    MongoDB treats an identical index spec as a no-op.
+
+    Args:
+        db (AsyncDatabase): The database instance.
+
+    Returns:
+        dict: Names of the indexes ensured per collection.
+    """
+    logger.info("Ensuring MongoDB indexes...")
+    created = {}
+    for collection_name, index_defs in INDEX_DEFINITIONS.items():
+        models = [
+            IndexModel(
+                index_def["keys"],
+                name=index_def["name"],
+                unique=index_def.get("unique", False),
+            )
+            for index_def in index_defs
+        ]
+        try:
+            created[collection_name] = await db[collection_name].create_indexes(models)
+        except OperationFailure as e:
+            # A conflicting definition or duplicate data blocks the build;
+            # keep the app up and let the drift report flag it.
+            logger.error("Error creating indexes on '%s': %s", collection_name, e)
+            created[collection_name] = []
+    return created
+
+
+# Oldest server the queries run on: the team lead board groups tasks with
+# $topN and joins with $lookup using both localField and a pipeline.
+MIN_SERVER_VERSION = (5, 2)
+
+
+async def check_server_version(db: AsyncDatabase) -> Tuple[int, ...]:
+    """
+    Read the server version, warning when it is older than
+    MIN_SERVER_VERSION.
+
+    Args:
+        db (AsyncDatabase): The database instance.
+
+    Returns:
+        tuple: The server version, e.g. (7, 0, 2).
+    """
+    build_info = await db.command("buildInfo")
+    version = tuple(build_info.get("versionArray", [])[:3])
+    if version < MIN_SERVER_VERSION:
+        logger.warning(
+            "MongoDB %s is older than %s: GET /team-lead/board will fail",
+            build_info.get("version"),
+            ".".join(map(str, MIN_SERVER_VERSION)),
+        )
+    return version
+
+
+async def verify_indexes(db: AsyncDatabase) -> Dict[str, Dict[str, List]]:
+    """
+    Compare the live indexes with INDEX_DEFINITIONS.
+
+    Args:
+        db (AsyncDatabase): The database instance.
+
+    Returns:
+        dict: Per collection with drift, the "missing", "mismatched" and
+        "unexpected" index names. Empty when everything matches.
+    """
+    report = {}
+    for collection_name, index_defs in INDEX_DEFINITIONS.items():
+        live = await db[collection_name].index_information()
+        live.pop("_id_", None)
+        drift = {"missing": [], "mismatched": [], "unexpected": []}
+
+        for index_def in index_defs:
+            name = index_def["name"]
+            if name not in live:
+                drift["missing"].append(name)
+                continue
+            info = live.pop(name)
+            same_keys = _normalize_key(info["key"]) == index_def["keys"]
+            same_unique = bool(info.get("unique")) == index_def.get("unique", False)
+            if not (same_keys and same_unique):
+                drift["mismatched"].append(name)
+
+        drift["unexpected"] = sorted(live)
+        if any(drift.values()):
+            logger.warning("Index drift on '%s': %s", collection_name, drift)
+            report[collection_name] = drift
+    return report
+
 
 async def create_views(db: AsyncDatabase):
     logger.info("Attempting to create or update MongoDB views...")
@@ -136,15 +274,23 @@ async def create_views(db: AsyncDatabase):
 
     for view_name, view_def in VIEW_DEFINITIONS.items():
         if view_name in collections:
-            logger.info(f"View '{view_name}' exists in the database.")
+            # Keep existing views in step with their definitions.
+            await db.command(
+                {
+                    "collMod": view_name,
+                    "viewOn": view_def["viewOn"],
+                    "pipeline": view_def["pipeline"],
+                }
+            )
+            logger.info("Updated view '%s'.", view_name)
             continue
 
         try:
             # Drop the view if it already exists to ensure a clean creation/update
             await db.command({"drop": view_name})
-            logger.info(f"Dropped existing '{view_name}'.")
+            logger.info("Dropped existing '%s'.", view_name)
         except Exception as e:
-            logger.info(f"'{view_name}' did not exist or could not be dropped: {e}")
+            logger.info("'%s' did not exist or could not be dropped: %s", view_name, e)
 
         try:
             await db.create_collection(
@@ -152,7 +298,7 @@ async def create_views(db: AsyncDatabase):
                 viewOn=view_def["viewOn"],
                 pipeline=view_def["pipeline"],
             )
-            logger.info(f"Successfully created '{view_name}'.")
+            logger.info("Successfully created '%s'.", view_name)
         except Exception as e:
-            logger.error(f"Error creating '{view_name}': {e}")
+            logger.error("Error creating '%s': %s", view_name, e)
             raise
@@ -1,23 +1,170 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional
+import hashlib
+import os
+import time
+
+from bson import ObjectId
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-import os
+
+from app.membership import membership_changes, membership_versions
+from app.services.team_member_service import (
+    TeamMemberService,
+    get_team_member_service,
+)
+from app.services.team_service import TeamService, get_team_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecret")
 ALGORITHM = "HS256"
+# Number of verified tokens kept in memory; 0 disables the cache.
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified token claims.
+
+    Entries are keyed by a SHA-256 of the token, so raw tokens are not kept
+    in memory, and expire at the token's `exp` claim. Dependencies run in
+    the threadpool, hence the lock.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        """
+        Get the cached claims of a token, or None if absent or expired.
+        """
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, token: str, claims: Dict, expires_at: float) -> None:
+        """
+        Cache verified claims until `expires_at` (epoch seconds).
+        """
+        if self.maxsize <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the cache size and hit/miss counters.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
 
 def get_current_user(token: str = Depends(oauth2_scheme)):
+    user = token_cache.get(token)
+    if user is not None:
+        return user
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         role: str = payload.get("role")
         if user_id is None or role is None:
             raise HTTPException(status_code=401, detail="Invalid token")
-        return {"user_id": user_id, "role": role}
+        user = {
+            "user_id": user_id,
+            "role": role,
+            "teams": payload.get("teams"),
+            "member_of": payload.get("member_of"),
+            "mv": payload.get("mv"),
+            "iat": payload.get("iat"),
+        }
+        # Tokens without an expiry are verified every time.
+        if payload.get("exp") is not None:
+            token_cache.put(token, user, float(payload["exp"]))
+        return user
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+async def current_membership_version(
+    user_id: str, team_member_service: TeamMemberService
+) -> Optional[int]:
+    """
+    The member's `membership_version` as stored, cached for at most
+    MEMBERSHIP_VERSION_TTL_SECONDS. None if the member does not exist.
+    """
+
+    async def load(member_id: str) -> Optional[int]:
+        if not ObjectId.is_valid(member_id):
+            return None
+        member = await team_member_service.get_team_member_by_id(
+            member_id, {"membership_version": 1}
+        )
+        return member.get("membership_version", 0) if member else None
+
+    return await membership_versions.get(user_id, load)
+
+
+async def get_managed_team_ids(
+    user: dict = Depends(get_current_user),
+    team_service: TeamService = Depends(get_team_service),
+    team_member_service: TeamMemberService = Depends(get_team_member_service),
+) -> List[str]:
+    """
+    IDs of the teams managed by the current user.
+
+    Taken from the token's `teams` claim while its `mv` claim matches the
+    member's stored membership version, which any process bumps when the
+    member's teams change; otherwise the teams are looked up. The version
+    is cached for MEMBERSHIP_VERSION_TTL_SECONDS, which bounds how long
+    another process's change can go unnoticed; changes made by this process
+    are noticed at once.
+    """
+    teams = user.get("teams")
+    if (
+        teams is not None
+        and not membership_changes.changed_since(user["user_id"], user.get("iat"))
+        and await current_membership_version(user["user_id"], team_member_service)
+        == user.get("mv")
+    ):
+        return teams
+    return list(await team_service.get_managed_teams(user["user_id"], {"_id": 1}))
+
 def require_roles(*roles):
     def role_checker(user=Depends(get_current_user)):
         if user["role"] not in roles:
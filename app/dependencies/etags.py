@@ -0,0 +1,102 @@
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+import orjson
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.database.versions import (
+    TASKS_SCOPE,
+    TEAM_MEMBERS_SCOPE,
+    TEAMS_SCOPE,
+    VersionCounters,
+    team_tasks_scope,
+)
+from app.dependencies.auth import get_managed_team_ids
+from app.dependencies.services import get_services
+
+
+def compute_etag(request: Request, versions: Dict, *extra) -> str:
+    """
+    Strong ETag of a list response.
+
+    The response is fully determined by the request (path, query string and
+    Accept header), the versions of the data it reads and `extra` values
+    such as the teams the user may see, so hashing those stands in for
+    hashing the body.
+    """
+    key = [
+        request.url.path,
+        request.url.query,
+        request.headers.get("accept", ""),
+        sorted(versions.items()),
+        extra,
+    ]
+    digest = hashlib.sha256(orjson.dumps(key, default=str)).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches `etag`, with the weak comparison
+    RFC 9110 prescribes for it.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def _conditional(
+    request: Request,
+    response: Response,
+    versions: VersionCounters,
+    scopes: Iterable[str],
+    *extra,
+) -> str:
+    etag = compute_etag(request, await versions.get(scopes), *extra)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return etag
+
+
+def conditional_get(*scopes: str):
+    """
+    Dependency answering a conditional GET of a list that depends only on
+    the given version scopes and the request.
+
+    It reads the scopes' counters and raises a bodiless 304 when the
+    If-None-Match header matches, before the route touches the data;
+    otherwise it sets the ETag header and returns it, for routes building
+    their own Response.
+    """
+
+    async def check(
+        request: Request, response: Response, services=Depends(get_services)
+    ) -> str:
+        return await _conditional(request, response, services.versions, scopes)
+
+    return check
+
+
+async def team_tasks_etag(
+    request: Request,
+    response: Response,
+    team_ids: List[str] = Depends(get_managed_team_ids),
+    services=Depends(get_services),
+) -> str:
+    """
+    Conditional GET of the tasks of the current team lead's teams: the
+    version of each of those teams and of writes whose team is unknown.
+    """
+    scopes = [TASKS_SCOPE, *(team_tasks_scope(team_id) for team_id in team_ids)]
+    return await _conditional(
+        request, response, services.versions, scopes, sorted(map(str, team_ids))
+    )
+
+
+teams_etag = conditional_get(TEAMS_SCOPE)
+team_members_etag = conditional_get(TEAM_MEMBERS_SCOPE)
@@ -0,0 +1,63 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Union, get_args, get_origin
+
+from fastapi import Request
+from pydantic import BaseModel
+
+# Fields of the paged list envelopes (Response*Collection); such a model is
+# projected through the schema of its rows.
+PAGE_FIELDS = {"next_cursor", "has_more"}
+
+
+def _unwrap(annotation):
+    """
+    Strip Optional[...] and List[...] down to the row type.
+    """
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _unwrap(args[0]) if len(args) == 1 else None
+    if origin in (list, List):
+        return _unwrap(get_args(annotation)[0])
+    return annotation
+
+
+def _row_model(response_model) -> Optional[type]:
+    model = _unwrap(response_model)
+    if not (isinstance(model, type) and issubclass(model, BaseModel)):
+        return None
+    if PAGE_FIELDS <= set(model.model_fields):
+        rows = [
+            field
+            for name, field in model.model_fields.items()
+            if name not in PAGE_FIELDS
+        ]
+        return _row_model(rows[0].annotation) if len(rows) == 1 else None
+    return model
+
+
+@lru_cache(maxsize=None)
+def projection_for(response_model) -> Optional[Dict[str, int]]:
+    """
+    MongoDB projection covering the fields a response model serializes.
+
+    Fields are addressed by alias where one is set (e.g. `_id`). Returns
+    None when no projection can be derived, meaning the full document.
+    The result is cached per model and must not be mutated.
+    """
+    model = _row_model(response_model)
+    if model is None:
+        return None
+    return {field.alias or name: 1 for name, field in model.model_fields.items()}
+
+
+def response_projection(request: Request) -> Optional[Dict[str, int]]:
+    """
+    Dependency returning the projection for the matched route's
+    response_model, so repositories only fetch the fields it returns.
+    """
+    route = request.scope.get("route")
+    response_model = getattr(route, "response_model", None)
+    if response_model is None:
+        return None
+    return projection_for(response_model)
@@ -0,0 +1,13 @@
+from typing import TYPE_CHECKING
+
+from fastapi import Request
+
+if TYPE_CHECKING:
+    from app.container import ServiceContainer
+
+
+def get_services(request: Request) -> "ServiceContainer":
+    """
+    The application's service container, built once in the lifespan.
+    """
+    return request.app.state.services
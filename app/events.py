@@ -0,0 +1,377 @@
+"""
+Task changes pushed to clients as Server-Sent Events.
+
+Each process opens one change stream on the tasks collection, when the
+first client subscribes, and fans its events out to the subscriptions whose
+scope they fall in: the teams of a team lead, or the tasks assigned to a
+developer. A subscription keeps at most one pending event per task, so a
+burst of updates to a task is delivered as its latest state, and a client
+that falls `queue_limit` tasks behind gets a single `reset` event telling it
+to reload its list instead of an ever growing backlog. A slow client never
+holds up the change stream or the other clients.
+
+Events:
+
+    task    {"operation", "task_id", "title", "status", "team_id",
+             "assigned_to", "updated_at"} of a task in the scope
+    remove  {"task_id"} of a task deleted or moved out of the scope; only
+            sent to subscriptions the task was in before the change, known
+            from the change's pre-image or from the task events sent on it
+    reset   {} the client missed changes and should reload
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from fastapi import Depends
+from fastapi.responses import StreamingResponse
+from pymongo.errors import PyMongoError
+
+from app.dependencies.services import get_services
+from app.logging_config import get_logger
+from app.repositories.task_repository import TaskRepository
+from app.streaming import SSE_MEDIA_TYPE, sse_event
+
+logger = get_logger(__name__)
+
+# Tasks a subscription may have pending before it is reset.
+TASK_EVENTS_QUEUE_LIMIT = int(os.getenv("TASK_EVENTS_QUEUE_LIMIT", "1000"))
+# Idle time after which a comment line is sent, so proxies keep the
+# connection open and dead clients are noticed.
+TASK_EVENTS_HEARTBEAT_SECONDS = 15
+# Delay before reopening a failed change stream, doubled up to the maximum.
+CHANGE_STREAM_RETRY_SECONDS = 1
+CHANGE_STREAM_MAX_RETRY_SECONDS = 30
+# Reconnection delay suggested to EventSource clients, in milliseconds.
+SSE_RETRY_MS = 5000
+
+# Task fields sent in `task` events.
+TASK_EVENT_FIELDS = ("title", "status", "team_id", "assigned_to", "updated_at")
+# Fields that decide which subscriptions see a task.
+SCOPE_FIELDS = {"team_id", "assigned_to"}
+
+
+@dataclass(frozen=True)
+class TaskChange:
+    """
+    One change stream event reduced to what the subscriptions need.
+    """
+
+    task_id: str
+    # Body of the `task` event; None when the task no longer exists.
+    task: Optional[Dict]
+    team_id: Optional[str]
+    assigned_to: Optional[str]
+    # The team or assignee may have changed, so the task may have left the
+    # scope of subscriptions it is no longer in.
+    moved: bool
+    # Team and assignee before the change, from the pre-image; unknown when
+    # the collection keeps no pre-images.
+    previous_team_id: Optional[str] = None
+    previous_assigned_to: Optional[str] = None
+
+
+def _str_or_none(value) -> Optional[str]:
+    return str(value) if value else None
+
+
+def task_change(event: Dict) -> TaskChange:
+    """
+    Build a TaskChange from a change stream event of `TaskRepository.watch`.
+    """
+    task_id = str(event["documentKey"]["_id"])
+    before = event.get("fullDocumentBeforeChange") or {}
+    previous = {
+        "previous_team_id": _str_or_none(before.get("team_id")),
+        "previous_assigned_to": _str_or_none(before.get("assigned_to")),
+    }
+    document = event.get("fullDocument")
+    if not document:
+        # Deleted, or deleted before the update could be looked up.
+        return TaskChange(task_id, None, None, None, moved=True, **previous)
+    updated = event.get("updateDescription", {}).get("updatedFields", {})
+    return TaskChange(
+        task_id=task_id,
+        task={
+            "operation": event["operationType"],
+            "task_id": task_id,
+            **{field: document.get(field) for field in TASK_EVENT_FIELDS},
+        },
+        team_id=_str_or_none(document.get("team_id")),
+        assigned_to=_str_or_none(document.get("assigned_to")),
+        moved=event["operationType"] == "replace"
+        or not SCOPE_FIELDS.isdisjoint(updated),
+        **previous,
+    )
+
+
+class Subscription:
+    """
+    Events pending for one client, at most one per task.
+    """
+
+    def __init__(
+        self,
+        queue_limit: int,
+        team_ids: Optional[Iterable[str]] = None,
+        assigned_to: Optional[str] = None,
+    ):
+        self.queue_limit = queue_limit
+        self.team_ids = {str(team_id) for team_id in team_ids or ()}
+        self.assigned_to = str(assigned_to) if assigned_to else None
+        self._pending: "OrderedDict[str, Tuple[str, Dict]]" = OrderedDict()
+        # Tasks sent to this client in `task` events and not removed since.
+        self._sent: Set[str] = set()
+        self._reset = False
+        self._ready = asyncio.Event()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _in_scope(self, team_id: Optional[str], assigned_to: Optional[str]) -> bool:
+        return team_id in self.team_ids or (
+            self.assigned_to is not None and assigned_to == self.assigned_to
+        )
+
+    def sees(self, change: TaskChange) -> bool:
+        return self._in_scope(change.team_id, change.assigned_to)
+
+    def saw(self, change: TaskChange) -> bool:
+        """
+        Whether the task was in this client's scope before the change.
+        """
+        return change.task_id in self._sent or self._in_scope(
+            change.previous_team_id, change.previous_assigned_to
+        )
+
+    def push(self, change: TaskChange) -> None:
+        """
+        Queue the event a change means for this client, replacing the one
+        pending for the same task. Never blocks.
+        """
+        if change.task is not None and self.sees(change):
+            event = ("task", change.task)
+            self._sent.add(change.task_id)
+        elif change.moved and self.saw(change):
+            event = ("remove", {"task_id": change.task_id})
+            self._sent.discard(change.task_id)
+        else:
+            return
+        self._pending.pop(change.task_id, None)
+        self._pending[change.task_id] = event
+        if len(self._pending) > self.queue_limit:
+            self.reset()
+        self._ready.set()
+
+    def reset(self) -> None:
+        """
+        Drop the pending events and tell the client to reload instead.
+        """
+        self._pending.clear()
+        self._reset = True
+        self._ready.set()
+
+    async def next_events(self, timeout: float) -> List[Tuple[str, Dict]]:
+        """
+        Wait for pending events and take all of them, oldest first.
+
+        Args:
+            timeout (float): Longest wait, in seconds.
+
+        Returns:
+            List[Tuple[str, dict]]: (event, data) pairs; empty on timeout.
+        """
+        if not self._pending and not self._reset:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        if self._reset:
+            self._reset = False
+            return [("reset", {})]
+        events = list(self._pending.values())
+        self._pending.clear()
+        return events
+
+
+class TaskEventHub:
+    """
+    The process's task change stream and its subscriptions.
+
+    The change stream runs while at least one client is subscribed. When it
+    fails it is reopened after a delay and every subscription is reset,
+    since changes may have been missed in between.
+    """
+
+    def __init__(
+        self,
+        task_repository: TaskRepository,
+        queue_limit: int = TASK_EVENTS_QUEUE_LIMIT,
+    ):
+        self.task_repository = task_repository
+        self.queue_limit = queue_limit
+        self.changes = 0
+        self.stream_failures = 0
+        self._pre_images_enabled = False
+        self._subscriptions: Set[Subscription] = set()
+        self._consumer: Optional[asyncio.Task] = None
+
+    def subscribe(
+        self,
+        team_ids: Optional[Iterable[str]] = None,
+        assigned_to: Optional[str] = None,
+    ) -> Subscription:
+        """
+        Register a client interested in the tasks of `team_ids` or assigned
+        to `assigned_to`, starting the change stream if needed.
+        """
+        subscription = Subscription(self.queue_limit, team_ids, assigned_to)
+        self._subscriptions.add(subscription)
+        if self._consumer is None or self._consumer.done():
+            self._consumer = asyncio.create_task(self._consume())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Remove a client, stopping the change stream after the last one.
+        Synchronous so it can run while the client's response is cancelled.
+        """
+        self._subscriptions.discard(subscription)
+        if not self._subscriptions and self._consumer is not None:
+            self._consumer.cancel()
+            self._consumer = None
+
+    def publish(self, change: TaskChange) -> None:
+        self.changes += 1
+        for subscription in self._subscriptions:
+            subscription.push(change)
+
+    async def _consume(self) -> None:
+        delay = CHANGE_STREAM_RETRY_SECONDS
+        while True:
+            try:
+                if not self._pre_images_enabled:
+                    # Tells which clients a moved or deleted task was sent to.
+                    await self.task_repository.enable_pre_images()
+                    self._pre_images_enabled = True
+                async with await self.task_repository.watch(
+                    TASK_EVENT_FIELDS, SCOPE_FIELDS
+                ) as stream:
+                    logger.info("Task change stream opened")
+                    delay = CHANGE_STREAM_RETRY_SECONDS
+                    async for event in stream:
+                        self.publish(task_change(event))
+            except PyMongoError as e:
+                self.stream_failures += 1
+                logger.warning(
+                    "Task change stream failed, reopening in %ss: %s", delay, e
+                )
+            except Exception:
+                # An unexpected event must not end the stream for good.
+                self.stream_failures += 1
+                logger.exception(
+                    "Task change stream consumer failed, reopening in %ss", delay
+                )
+            for subscription in self._subscriptions:
+                subscription.reset()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, CHANGE_STREAM_MAX_RETRY_SECONDS)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return subscription and change stream counters.
+        """
+        return {
+            "subscriptions": len(self._subscriptions),
+            "pending_events": sum(s.pending for s in self._subscriptions),
+            "changes": self.changes,
+            "stream_failures": self.stream_failures,
+            "streaming": int(self._consumer is not None),
+        }
+
+    async def close(self) -> None:
+        """
+        Stop the change stream; called when the application shuts down.
+        """
+        consumer, self._consumer = self._consumer, None
+        self._subscriptions.clear()
+        if consumer is not None:
+            consumer.cancel()
+            try:
+                await consumer
+            except asyncio.CancelledError:
+                pass
+
+
+async def sse_events(
+    hub: TaskEventHub,
+    subscription: Subscription,
+    heartbeat: float = TASK_EVENTS_HEARTBEAT_SECONDS,
+    still_valid: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Write a subscription's events as they come, as one chunk per batch.
+
+    The next batch is only taken once the previous one was sent, so events
+    for a slow client coalesce in its subscription rather than in buffers.
+    `still_valid` is checked after every batch and heartbeat; once it fails
+    (the client's scope changed) the stream ends with a `reset` event.
+    """
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+        while True:
+            events = await subscription.next_events(heartbeat)
+            if still_valid is not None and not await still_valid():
+                yield sse_event("reset", {})
+                return
+            if not events:
+                yield b": keep-alive\n\n"
+                continue
+            yield b"".join(sse_event(event, data) for event, data in events)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def sse_response(
+    hub: TaskEventHub,
+    subscription: Subscription,
+    still_valid: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> StreamingResponse:
+    """
+    Stream a subscription as a text/event-stream response, until
+    `still_valid` fails (see `sse_events`).
+    """
+    return StreamingResponse(
+        sse_events(hub, subscription, still_valid=still_valid),
+        media_type=SSE_MEDIA_TYPE,
+        # Keep reverse proxies from buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def get_task_event_hub(services=Depends(get_services)) -> TaskEventHub:
+    """
+    Dependency provider for the application's TaskEventHub.
+
+    Args:
+        services (ServiceContainer): The application's service container.
+
+    Returns:
+        TaskEventHub: The application-scoped hub.
+    """
+    return services.task_events
@@ -0,0 +1,104 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import Dict, Optional
+
+from app.logging_config import logger
+from app.utils import get_password_hash, verify_password
+
+# Worker processes for password hashing; 0 hashes on the calling thread
+# (tests, single-core deployments).
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+# Hash operations allowed in flight at once; the rest wait on the semaphore
+# instead of piling up in the executor queue.
+PASSWORD_HASH_CONCURRENCY = int(
+    os.getenv("PASSWORD_HASH_CONCURRENCY", str(max(1, PASSWORD_HASH_WORKERS) * 2))
+)
+
+
+class PasswordHasher:
+    """
+    Runs passlib hashing and verification in a process pool so the
+    CPU-bound key derivation never blocks the event loop.
+
+    The pool is started on first use and shut down with the application.
+    """
+
+    def __init__(self, workers: int, max_concurrency: int):
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: workers must not inherit the server's threads and
+                # open sockets.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info("Started password hashing pool (%s workers)", self.workers)
+            return self._executor
+
+    async def _run(self, fn, *args):
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            if self.workers <= 0:
+                return fn(*args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password off the event loop.
+        """
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against its hash off the event loop.
+        """
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return pool size and queue-depth counters.
+        """
+        return {
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+        }
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes, if started.
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_CONCURRENCY)
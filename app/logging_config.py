@@ -1,9 +1,237 @@
+"""
+Logging pipeline.
+
+Records are handed to a queue on the calling thread and formatted and
+written by a background listener thread, so request handlers never block on
+the output stream. Messages use %-style arguments, which are interpolated
+only for records that pass the level and sampling filters: on the calling
+thread, when the record is queued, so later changes to mutable arguments
+do not show up in the output.
+
+Configuration (environment):
+    LOG_LEVEL: minimum level, default INFO.
+    LOG_FORMAT: "json" (default), one JSON object per line, or "text".
+    LOG_SAMPLE_RATES: comma-separated logger=rate pairs, e.g.
+        "task_management_app.repositories=0.1", keeping that fraction of the
+        logger's (and its children's) records below WARNING.
+    LOG_QUEUE_SIZE: records buffered before new ones are dropped.
+"""
+
+import atexit
+import json
 import logging
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+APP_LOGGER_NAME = "task_management_app"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(request_id)s - %(message)s"
+
+REQUEST_ID_HEADER = b"x-request-id"
+# Incoming request IDs are reused only when they look like an identifier.
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed through `extra`.
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None))
+) | {"message", "asctime", "request_id"}
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """
+    Parse LOG_SAMPLE_RATES ("logger=rate,...") into a mapping.
+    """
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of the records below WARNING of the configured loggers.
+
+    The most specific configured logger name applies, so
+    "task_management_app.repositories=0.1" samples every repository module.
+    Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._cache: Dict[str, Optional[float]] = {}
+
+    def _rate(self, name: str) -> Optional[float]:
+        if name not in self._cache:
+            matches = [
+                logger_name
+                for logger_name in self.rates
+                if name == logger_name or name.startswith(logger_name + ".")
+            ]
+            self._cache[name] = self.rates[max(matches, key=len)] if matches else None
+        return self._cache[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        return rate is None or random.random() < rate
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamps records with the ID of the request being handled.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as a single-line JSON object. Fields passed with
+    `extra` are included as top-level keys.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that interpolates the message before queueing, leaving the
+    rest of the formatting to the listener, and drops records, counting them,
+    instead of blocking when the queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Interpolate now: the arguments may be mutable objects changed by the
+        # time the listener gets to the record. exc_info is kept so the
+        # listener's formatter still renders the traceback its own way.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _build_formatter() -> logging.Formatter:
+    if LOG_FORMAT == "text":
+        return logging.Formatter(TEXT_FORMAT)
+    return JsonFormatter()
+
+
+def setup_logging() -> QueueListener:
+    """
+    Route every log record through a queue to a background writer.
+
+    Returns:
+        QueueListener: The started listener, stopped (and flushed) at exit.
+    """
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    rates = parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+    queue_handler.addFilter(SamplingFilter(rates))
+    queue_handler.addFilter(RequestIdFilter())
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(_build_formatter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def get_logger(module_name: str) -> logging.Logger:
+    """
+    Logger of an application module, named after it under the application
+    logger: app.repositories.task_repository logs as
+    task_management_app.repositories.task_repository.
+    """
+    name = module_name.removeprefix("app.")
+    return logging.getLogger(f"{APP_LOGGER_NAME}.{name}")
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware assigning every HTTP request an ID, available to log
+    records as `request_id` and returned in the X-Request-ID header. A
+    well-formed X-Request-ID sent by the client is kept.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                candidate = value.decode("latin-1")
+                if _REQUEST_ID_PATTERN.match(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER, request_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _request_id.reset(token)
 
-# Logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
-)
 
-logger = logging.getLogger("task_management_app")
+log_listener = setup_logging()
+logger = logging.getLogger(APP_LOGGER_NAME)
@@ -1,20 +1,67 @@
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 from app.routes import team_lead, team_member, project_manager, auth
-from app.logging_config import logger
+from app.logging_config import RequestIdMiddleware, logger
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from app.database.views import create_views
-from config.database import get_database
-
+from app.container import ServiceContainer
+from app.database.views import (
+    check_server_version,
+    create_indexes,
+    create_views,
+    verify_indexes,
+)
+from app.database.migrations import ensure_migrated
+from app.database.slow_queries import slow_query_log
+from app.dependencies.auth import require_roles, token_cache
+from app.hashing import password_hasher
+from app.metrics import (
+    TimedJSONResponse,
+    TimingMiddleware,
+    db_command_listener,
+    request_metrics,
+)
+from config.database import (
+    close_mongo_connection,
+    connect_to_mongo,
+    get_database,
+    get_pool_stats,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    db = get_database()
-    await create_views(db)
-    yield
+    # One pooled client and one set of repositories and services per
+    # process, shared by every request.
+    connect_to_mongo(event_listeners=[db_command_listener, slow_query_log])
+    team_tasks_maintenance = None
+    try:
+        db = get_database()
+        # Queries rely on the migrated data shape; refuse to start without it.
+        await ensure_migrated(db)
+        app.state.server_version = await check_server_version(db)
+        app.state.services = ServiceContainer(db)
+        await create_views(db)
+        await create_indexes(db)
+        app.state.index_drift = await verify_indexes(db)
+        # Rebuilds of the materialized team_tasks rows run in the
+        # background; requests serve the current rows meanwhile.
+        team_tasks_maintenance = asyncio.create_task(
+            app.state.services.team_tasks.maintain()
+        )
+        yield
+    finally:
+        if team_tasks_maintenance is not None:
+            team_tasks_maintenance.cancel()
+        services = getattr(app.state, "services", None)
+        if services is not None:
+            await services.task_events.close()
+        password_hasher.shutdown()
+        await close_mongo_connection()
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=TimedJSONResponse)
 logger.info("FastAPI application instance created.")
 
 app.include_router(team_lead.router, prefix="/team-lead", tags=["Team Lead"])
@@ -31,9 +78,64 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Has-More", "Server-Timing", "X-Request-ID"],
 )
+app.add_middleware(TimingMiddleware, metrics=request_metrics)
+# Added last so it wraps every other middleware and its ID is on all records.
+app.add_middleware(RequestIdMiddleware)
 
 @app.get("/")
 def read_root():
     logger.info("Root endpoint accessed.")
-    return {"message": "Welcome to the Task Management API"}
\ No newline at end of file
+    return {"message": "Welcome to the Task Management API"}
+
+
+# Operational counters describe the deployment and its users' load, so they
+# are only served to project managers (or scrapers holding such a token).
+internal = APIRouter(dependencies=[Depends(require_roles("project_manager"))])
+
+
+@internal.get("/health/db-pool")
+def read_db_pool_stats():
+    """
+    Expose MongoDB connection pool counters for capacity planning.
+    """
+    return get_pool_stats()
+
+
+@internal.get("/health/token-cache")
+def read_token_cache_stats():
+    """
+    Expose hit/miss counters of the verified-token cache.
+    """
+    return token_cache.stats()
+
+
+@internal.get("/health/password-hashing")
+def read_password_hashing_stats():
+    """
+    Expose the password hashing pool size and queue depth.
+    """
+    return password_hasher.stats()
+
+
+@internal.get("/health/task-events")
+def read_task_events_stats():
+    """
+    Expose the task event subscriptions and change stream counters.
+    """
+    return app.state.services.task_events.stats()
+
+
+@internal.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """
+    Expose per-route request counts, latency and MongoDB time histograms in
+    the Prometheus text format.
+    """
+    return PlainTextResponse(
+        request_metrics.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+app.include_router(internal)
@@ -0,0 +1,106 @@
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+# How long a membership change is remembered. Must exceed the access token
+# lifetime: tokens issued before an older change have already expired.
+MEMBERSHIP_CHANGE_RETENTION_SECONDS = 2 * 60 * 60
+# How long a member's membership version read from the database is trusted.
+# Bounds how long a process keeps honouring the team claims of a token after
+# another process changed the member's teams.
+MEMBERSHIP_VERSION_TTL_SECONDS = float(os.getenv("MEMBERSHIP_VERSION_TTL_SECONDS", "5"))
+MEMBERSHIP_VERSION_CACHE_SIZE = 10000
+
+
+class MembershipChanges:
+    """
+    Process-local record of when each user's team membership last changed.
+
+    Access tokens embed the caller's teams; a token issued before a change
+    recorded here no longer reflects the user's teams and its claims are
+    ignored. This lets the process that made a change notice it at once.
+    Changes made by other processes are caught by `get_managed_team_ids`,
+    which also compares the token's `mv` claim to the member's stored
+    `membership_version` through MembershipVersions. That version is cached
+    for MEMBERSHIP_VERSION_TTL_SECONDS (default 5), which bounds how long
+    another process's change can go unnoticed.
+    """
+
+    def __init__(self, retention_seconds: float):
+        self.retention_seconds = retention_seconds
+        self._changed_at: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def record(self, user_ids: Iterable) -> None:
+        now = time.time()
+        with self._lock:
+            for user_id in user_ids:
+                self._changed_at[str(user_id)] = now
+            cutoff = now - self.retention_seconds
+            for user_id in [u for u, t in self._changed_at.items() if t < cutoff]:
+                del self._changed_at[user_id]
+
+    def changed_since(self, user_id: str, issued_at: Optional[float]) -> bool:
+        """
+        Check whether the user's membership changed after a token was issued.
+        Tokens without an issue time are treated as stale.
+        """
+        if issued_at is None:
+            return True
+        with self._lock:
+            changed_at = self._changed_at.get(str(user_id))
+        return changed_at is not None and changed_at >= issued_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._changed_at.clear()
+
+
+class MembershipVersions:
+    """
+    Process-local cache of each member's current `membership_version`.
+
+    The version is stored on the member, so every process sees a change
+    made by any other one; it is read at most once per member and TTL. A
+    token whose `mv` claim differs from it no longer reflects the member's
+    teams. Used from the event loop only.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._versions: "OrderedDict[str, Tuple[float, Optional[int]]]" = OrderedDict()
+
+    async def get(
+        self, user_id: str, load: Callable[[str], Awaitable[Optional[int]]]
+    ) -> Optional[int]:
+        """
+        Get a member's version, calling `load` when the cached one expired.
+        None stands for a member that does not exist.
+        """
+        user_id = str(user_id)
+        now = time.monotonic()
+        entry = self._versions.get(user_id)
+        if entry is not None and now - entry[0] < self.ttl_seconds:
+            return entry[1]
+        version = await load(user_id)
+        self._versions[user_id] = (now, version)
+        self._versions.move_to_end(user_id)
+        while len(self._versions) > self.maxsize:
+            self._versions.popitem(last=False)
+        return version
+
+    def forget(self, user_ids: Iterable) -> None:
+        for user_id in user_ids:
+            self._versions.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        self._versions.clear()
+
+
+membership_changes = MembershipChanges(MEMBERSHIP_CHANGE_RETENTION_SECONDS)
+membership_versions = MembershipVersions(
+    MEMBERSHIP_VERSION_TTL_SECONDS, MEMBERSHIP_VERSION_CACHE_SIZE
+)
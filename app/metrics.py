@@ -0,0 +1,325 @@
+"""
+Per-request timing: database time attributed to the current request, a
+Server-Timing header on every response and per-route histograms rendered in
+the Prometheus text format by /metrics.
+"""
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+from pymongo import monitoring
+
+from app.serialization import dumps
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Responses held open for as long as the client listens (server-sent events,
+# NDJSON streams). Their lifetime says nothing about latency, so it is only
+# added to http_stream_seconds_total.
+STREAMING_MEDIA_TYPES = (b"text/event-stream", b"application/x-ndjson")
+# Route label of requests that matched no route, so unknown paths do not
+# create new series.
+UNMATCHED_ROUTE = "unmatched"
+
+
+@dataclass
+class RequestTimings:
+    """
+    Time spent by the current request, filled in while it runs.
+    """
+
+    db_seconds: float = 0.0
+    db_commands: int = 0
+    render_seconds: float = 0.0
+
+
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """
+    Timings of the request being handled, or None outside of a request.
+    """
+    return _request_timings.get()
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """
+    Adds the duration of every MongoDB command to the request that issued it.
+
+    The async driver runs commands in the calling task, so the request's
+    timings are found through the context variable set by TimingMiddleware.
+    """
+
+    def started(self, event):
+        pass
+
+    def _add(self, event):
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.db_seconds += event.duration_micros / 1_000_000
+            timings.db_commands += 1
+
+    def succeeded(self, event):
+        self._add(event)
+
+    def failed(self, event):
+        self._add(event)
+
+
+class TimedJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson that records how long rendering the
+    body took.
+    """
+
+    def render(self, content) -> bytes:
+        started = time.perf_counter()
+        body = dumps(content)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.render_seconds += time.perf_counter() - started
+        return body
+
+
+def _label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(LATENCY_BUCKETS, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+class RequestMetrics:
+    """
+    Per-route request counters and latency histograms.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+        self._durations: Dict[Tuple[str, str], _Histogram] = {}
+        self._db_durations: Dict[Tuple[str, str], _Histogram] = {}
+        self._db_commands: Dict[Tuple[str, str], int] = {}
+        self._stream_seconds: Dict[Tuple[str, str], float] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        seconds: float,
+        timings: RequestTimings,
+        streamed: bool = False,
+    ) -> None:
+        key = (method, route)
+        with self._lock:
+            status_key = (method, route, status_code)
+            self._requests[status_key] = self._requests.get(status_key, 0) + 1
+            if streamed:
+                self._stream_seconds[key] = self._stream_seconds.get(key, 0) + seconds
+                return
+            self._durations.setdefault(key, _Histogram()).observe(seconds)
+            self._db_durations.setdefault(key, _Histogram()).observe(timings.db_seconds)
+            self._db_commands[key] = self._db_commands.get(key, 0) + timings.db_commands
+
+    def clear(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._durations.clear()
+            self._db_durations.clear()
+            self._db_commands.clear()
+            self._stream_seconds.clear()
+
+    @staticmethod
+    def _labels(method: str, route: str, **extra) -> str:
+        labels = {"method": method, "route": route, **extra}
+        return ",".join(
+            f'{name}="{_label_value(value)}"' for name, value in labels.items()
+        )
+
+    @classmethod
+    def _histogram_lines(
+        cls, name: str, histograms: Dict[Tuple[str, str], _Histogram]
+    ) -> List[str]:
+        lines = []
+        for (method, route), histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                cumulative += count
+                labels = cls._labels(method, route, le=bound)
+                lines.append(f"{name}_bucket{{{labels}}} {cumulative}")
+            labels = cls._labels(method, route, le="+Inf")
+            lines.append(f"{name}_bucket{{{labels}}} {histogram.count}")
+            labels = cls._labels(method, route)
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return lines
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            lines = [
+                "# HELP http_requests_total Requests handled, by route and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status_code), count in sorted(self._requests.items()):
+                labels = self._labels(method, route, status=status_code)
+                lines.append(f"http_requests_total{{{labels}}} {count}")
+            lines += [
+                "# HELP http_request_duration_seconds Request latency.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            lines += self._histogram_lines(
+                "http_request_duration_seconds", self._durations
+            )
+            lines += [
+                "# HELP http_request_db_seconds MongoDB time per request.",
+                "# TYPE http_request_db_seconds histogram",
+            ]
+            lines += self._histogram_lines(
+                "http_request_db_seconds", self._db_durations
+            )
+            lines += [
+                "# HELP http_request_db_commands_total MongoDB commands issued.",
+                "# TYPE http_request_db_commands_total counter",
+            ]
+            for (method, route), count in sorted(self._db_commands.items()):
+                labels = self._labels(method, route)
+                lines.append(f"http_request_db_commands_total{{{labels}}} {count}")
+            lines += [
+                "# HELP http_stream_seconds_total Time streamed responses were open.",
+                "# TYPE http_stream_seconds_total counter",
+            ]
+            for (method, route), seconds in sorted(self._stream_seconds.items()):
+                labels = self._labels(method, route)
+                lines.append(f"http_stream_seconds_total{{{labels}}} {seconds}")
+        return "\n".join(lines) + "\n"
+
+
+def server_timing(total_seconds: float, timings: RequestTimings) -> str:
+    """
+    Build a Server-Timing header value splitting the request time into
+    database, response rendering and the rest of the application
+    (dependencies, the endpoint and response validation).
+    """
+    app_seconds = max(0.0, total_seconds - timings.db_seconds - timings.render_seconds)
+    db_desc = f"{timings.db_commands} commands"
+    return ", ".join(
+        [
+            f'db;dur={timings.db_seconds * 1000:.2f};desc="{db_desc}"',
+            f"render;dur={timings.render_seconds * 1000:.2f}",
+            f"app;dur={app_seconds * 1000:.2f}",
+            f"total;dur={total_seconds * 1000:.2f}",
+        ]
+    )
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the route that handled a request, e.g. /team-lead/tasks
+    for any request served by that route.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    # Routes of an included router may carry their path without the router
+    # prefix; the prefix is then the leading segments of the request path.
+    depth = scope["path"].count("/") - template.count("/")
+    if depth <= 0:
+        return template
+    return "/".join(scope["path"].split("/")[: depth + 1]) + template
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware timing every HTTP request.
+
+    Adds a Server-Timing header to the response and records the request in
+    `metrics` under its route template (e.g. /team-lead/tasks) once it
+    completes. Server-Timing covers the time until the headers are sent; the
+    recorded latency also includes sending the body. Event streams are only
+    counted, their open time kept out of the latency histograms.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        status_code = 500
+        streamed = False
+
+        async def send_with_timing(message):
+            nonlocal status_code, streamed
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                streamed = any(
+                    name.lower() == b"content-type"
+                    and value.startswith(STREAMING_MEDIA_TYPES)
+                    for name, value in message.get("headers", [])
+                )
+                elapsed = time.perf_counter() - started
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (b"server-timing", server_timing(elapsed, timings).encode())
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            self.metrics.observe(
+                scope["method"],
+                route_template(scope),
+                status_code,
+                time.perf_counter() - started,
+                timings,
+                streamed,
+            )
+
+
+db_command_listener = CommandTimingListener()
+request_metrics = RequestMetrics()
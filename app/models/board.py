@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
+
+from app.models.task import PyObjectId
+from app.models.team import ResponseTeamMemberSchema, ResponseTeamSchema
+
+# Bounds of the number of tasks listed in each status column.
+DEFAULT_BOARD_TASKS_PER_STATUS = 20
+MAX_BOARD_TASKS_PER_STATUS = 100
+
+
+class BoardTask(BaseModel):
+    task_id: PyObjectId = Field(alias="_id")
+    title: Optional[str] = None
+    description: Optional[str] = None
+    team_id: Optional[PyObjectId] = None
+    assigned_to: Optional[PyObjectId] = None
+    updated_at: Optional[datetime] = None
+
+    @field_serializer("updated_at", when_used="json")
+    def serialize_datetime(self, value):
+        return value.astimezone(timezone.utc).isoformat() if value else None
+
+    model_config = ConfigDict(validate_by_name=True)
+
+
+class BoardColumn(BaseModel):
+    """
+    Tasks of one status: how many there are and the most recently updated.
+    Tasks without a status are listed in a column whose status is None.
+    """
+
+    status: Optional[str] = None
+    count: int = 0
+    tasks: List[BoardTask] = Field(default_factory=list)
+
+
+class TeamLeadBoardSchema(BaseModel):
+    """
+    Everything the team lead board shows: the lead's teams, the members of
+    those teams and their tasks in one column per status, followed by a
+    column of the tasks without a status when there are any.
+    """
+
+    teams: List[ResponseTeamSchema] = Field(default_factory=list)
+    members: List[ResponseTeamMemberSchema] = Field(default_factory=list)
+    columns: List[BoardColumn] = Field(default_factory=list)
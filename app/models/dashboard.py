@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
+
+from app.models.task import PyObjectId
+
+# Bounds of the number of teams, members and recent tasks listed.
+DEFAULT_DASHBOARD_LIMIT = 5
+MAX_DASHBOARD_LIMIT = 50
+
+
+class DashboardTotals(BaseModel):
+    tasks: int = 0
+    teams: int = 0
+    members: int = 0
+    unassigned_tasks: int = 0
+
+
+class TeamTaskCount(BaseModel):
+    team_id: PyObjectId = Field(alias="_id")
+    name: Optional[str] = None
+    tasks: int
+    completed: int
+
+    model_config = ConfigDict(validate_by_name=True)
+
+
+class MemberTaskCount(BaseModel):
+    member_id: PyObjectId = Field(alias="_id")
+    name: Optional[str] = None
+    tasks: int
+    completed: int
+
+    model_config = ConfigDict(validate_by_name=True)
+
+
+class RecentTask(BaseModel):
+    task_id: PyObjectId = Field(alias="_id")
+    title: Optional[str] = None
+    status: Optional[str] = None
+    team_id: Optional[PyObjectId] = None
+    assigned_to: Optional[PyObjectId] = None
+    updated_at: Optional[datetime] = None
+
+    @field_serializer("updated_at", when_used="json")
+    def serialize_datetime(self, value):
+        return value.astimezone(timezone.utc).isoformat() if value else None
+
+    model_config = ConfigDict(validate_by_name=True)
+
+
+class DashboardSchema(BaseModel):
+    """
+    Summary shown on the project manager dashboard. Its size depends on the
+    requested limit, not on the number of tasks, teams or members.
+    """
+
+    totals: DashboardTotals
+    tasks_by_status: Dict[str, int]
+    top_teams: List[TeamTaskCount]
+    top_members: List[MemberTaskCount]
+    recent_tasks: List[RecentTask]
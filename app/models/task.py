@@ -97,3 +97,51 @@ class ResponseTeamTaskViewSchema(BaseModel):
 
 class ResponseTeamTaskViewCollection(BaseModel):
     tasks: List[ResponseTeamTaskViewSchema]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+# Upper bound on the items accepted by one bulk request.
+MAX_BULK_TASKS = 1000
+
+
+class BulkCreateTasksSchema(BaseModel):
+    tasks: List[CreateTaskSchema] = Field(..., min_length=1, max_length=MAX_BULK_TASKS)
+
+
+class BulkUpdateTaskItem(UpdateTaskSchema):
+    task_id: PyObjectId
+
+
+class BulkUpdateTasksSchema(BaseModel):
+    tasks: List[BulkUpdateTaskItem] = Field(
+        ..., min_length=1, max_length=MAX_BULK_TASKS
+    )
+
+
+class BulkAssignTaskItem(AssignTaskSchema):
+    task_id: PyObjectId
+
+
+class BulkAssignTasksSchema(BaseModel):
+    assignments: List[BulkAssignTaskItem] = Field(
+        ..., min_length=1, max_length=MAX_BULK_TASKS
+    )
+
+
+class BulkTaskResult(BaseModel):
+    """
+    Outcome of one item of a bulk request, reported at the item's index with
+    the status code the single-item endpoint would have returned.
+    """
+
+    index: int
+    task_id: Optional[PyObjectId] = None
+    status_code: int
+    detail: Optional[str] = None
+
+
+class BulkTaskResponse(BaseModel):
+    results: List[BulkTaskResult]
+    succeeded: int = 0
+    failed: int = 0
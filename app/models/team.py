@@ -257,6 +257,8 @@ class ResponseTeamMembersCollection(BaseModel):
     """
 
     members: Optional[List[ResponseTeamMemberSchema]]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
 
 
 class ResponseTeamCollection(BaseModel):
@@ -265,3 +267,5 @@ class ResponseTeamCollection(BaseModel):
     """
 
     teams: Optional[List[ResponseTeamSchema]]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
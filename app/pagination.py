@@ -0,0 +1,62 @@
+import base64
+import binascii
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+@dataclass
+class Page:
+    """
+    One page of a keyset-paginated listing.
+    """
+
+    items: List[Dict] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+def encode_cursor(last_id) -> str:
+    """
+    Encode the _id of the last item on a page as an opaque cursor.
+    """
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> ObjectId:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return ObjectId(base64.urlsafe_b64decode(padded).decode())
+    except (binascii.Error, UnicodeDecodeError, InvalidId, TypeError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def keyset_query(query: Dict, after: Optional[str]) -> Dict:
+    """
+    Restrict a query to documents after the given cursor, in _id order.
+    """
+    if after is None:
+        return query
+    return {**query, "_id": {"$gt": decode_cursor(after)}}
+
+
+def build_page(documents: List[Dict], limit: int) -> Page:
+    """
+    Build a page from up to limit + 1 documents fetched in _id order; the
+    extra document only signals that another page exists.
+    """
+    has_more = len(documents) > limit
+    items = documents[:limit]
+    next_cursor = encode_cursor(items[-1]["_id"]) if has_more else None
+    return Page(items=items, next_cursor=next_cursor, has_more=has_more)
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+from app.pagination import Page
 
 class AbstractRepository(ABC):
     @abstractmethod
@@ -7,7 +8,7 @@ class AbstractRepository(ABC):
         pass
 
     @abstractmethod
-    async def get(self, obj_id: str) -> Dict:
+    async def get(self, obj_id: str, projection: Optional[Dict] = None) -> Dict:
         pass
 
     @abstractmethod
@@ -21,3 +22,12 @@ class AbstractRepository(ABC):
     @abstractmethod
     async def get_all(self) -> List[Dict]:
         pass
+
+    @abstractmethod
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Dict] = None,
+    ) -> Page:
+        pass
@@ -1,38 +1,315 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
 from bson import ObjectId
-from typing import List, Dict
+from datetime import datetime, timezone
+from typing import Iterable, List, Dict, Optional, Tuple
 from app.models.task import TaskModel
+from pymongo.asynchronous.change_stream import AsyncChangeStream
 from pymongo.asynchronous.cursor import AsyncCursor
 from .abstract_repository import AbstractRepository
-from app.logging_config import logger
+from app.logging_config import get_logger
+from app.database.materialized_views import TeamTasksMaterializedView
+from app.database.versions import TASKS_SCOPE, VersionCounters, team_tasks_scope
+from app.utils import (
+    BulkUpdateResult,
+    UpdateResult,
+    differs_expression,
+    differs_from,
+    modifies,
+    to_object_id,
+    with_object_ids,
+)
+from app.pagination import Page, build_page, keyset_query
+
+logger = get_logger(__name__)
+
+# References stored as ObjectId so lookups can use the _id indexes.
+REFERENCE_FIELDS = ("team_id", "assigned_to", "created_by")
+# Change stream events that add, modify or remove a task.
+TASK_CHANGE_OPERATIONS = ("insert", "update", "replace", "delete")
+
+
+def _write_errors(bwe: BulkWriteError) -> Dict[int, str]:
+    return {
+        error["index"]: error.get("errmsg", "Write failed")
+        for error in bwe.details.get("writeErrors", [])
+    }
+
+
+def _stamped(changes: Dict) -> Dict:
+    """
+    The $set document of a task update: the changed fields and updated_at,
+    which orders the recent tasks of the dashboard and of the team board.
+    """
+    return {**changes, "updated_at": datetime.now(timezone.utc)}
+
+
+def _stamped_if_changed(changes: Dict, now: datetime) -> List[Dict]:
+    """
+    Update pipeline applying the $set of `changes` and advancing updated_at
+    only when one of them differs from the stored value. The values are
+    $literal so strings starting with "$" are not read as field paths.
+    """
+    return [
+        {
+            "$set": {
+                **{field: {"$literal": value} for field, value in changes.items()},
+                "updated_at": {
+                    "$cond": [
+                        differs_expression(changes),
+                        {"$literal": now},
+                        "$updated_at",
+                    ]
+                },
+            }
+        }
+    ]
+
+
+def _team_scopes(documents: Iterable[Dict]) -> List[str]:
+    """
+    Version scopes of the teams of the given tasks; tasks without a team are
+    listed by no team lead.
+    """
+    return [team_tasks_scope(d["team_id"]) for d in documents if d.get("team_id")]
+
+
+# Tasks counted per group in the dashboard facets.
+_COMPLETED_COUNT = {"$sum": {"$cond": [{"$eq": ["$status", "completed"]}, 1, 0]}}
+
+
+def _top_by(field: str, collection: str, limit: int) -> List[Dict]:
+    """
+    Facet of the `limit` values of `field` with the most tasks, named from
+    the referenced collection. Only those groups are joined.
+    """
+    return [
+        {"$match": {field: {"$ne": None}}},
+        {
+            "$group": {
+                "_id": f"${field}",
+                "tasks": {"$sum": 1},
+                "completed": _COMPLETED_COUNT,
+            }
+        },
+        {"$sort": {"tasks": -1, "_id": 1}},
+        {"$limit": limit},
+        {
+            "$lookup": {
+                "from": collection,
+                "localField": "_id",
+                "foreignField": "_id",
+                "as": "named",
+            }
+        },
+        {
+            "$project": {
+                "tasks": 1,
+                "completed": 1,
+                "name": {"$arrayElemAt": ["$named.name", 0]},
+            }
+        },
+    ]
+
+
+def dashboard_pipeline(limit: int) -> List[Dict]:
+    """
+    One pass over tasks computing every dashboard statistic with $facet:
+    the task count, the count per status, the unassigned count, the `limit`
+    teams and members with the most tasks, and the `limit` most recently
+    updated tasks. The result is a single document of bounded size.
+    """
+    return [
+        {
+            "$facet": {
+                "total": [{"$count": "count"}],
+                "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+                "unassigned": [
+                    {"$match": {"assigned_to": None}},
+                    {"$count": "count"},
+                ],
+                "top_teams": _top_by("team_id", "teams", limit),
+                "top_members": _top_by("assigned_to", "team_members", limit),
+                "recent_tasks": [
+                    {"$sort": {"updated_at": -1, "_id": -1}},
+                    {"$limit": limit},
+                    {
+                        "$project": {
+                            "title": 1,
+                            "status": 1,
+                            "team_id": 1,
+                            "assigned_to": 1,
+                            "updated_at": 1,
+                        }
+                    },
+                ],
+            }
+        }
+    ]
 
 
 class TaskRepository(AbstractRepository):
-    def __init__(self, db):
+    def __init__(
+        self,
+        db,
+        team_tasks: Optional[TeamTasksMaterializedView] = None,
+        versions: Optional[VersionCounters] = None,
+    ):
         self.collection = db["tasks"]
-        self.view = db["team_tasks_view"]
-        logger.info("TaskRepository initialized.")
+        # Shared with the other repositories when built by the container.
+        self.team_tasks = team_tasks or TeamTasksMaterializedView(db)
+        self.versions = versions or VersionCounters(db)
+        logger.debug("TaskRepository initialized.")
 
     async def create(self, obj: Dict) -> str:
-        logger.info(f"Inserting new task: {obj}")
+        logger.debug("Inserting new task: %s", obj)
         # Ensure obj is serialized correctly for MongoDB
-        return await self.collection.insert_one(obj)
+        document = with_object_ids(obj, REFERENCE_FIELDS)
+        result = await self.collection.insert_one(document)
+        await self.team_tasks.refresh_tasks([result.inserted_id])
+        await self.versions.bump(_team_scopes([document]))
+        return result
 
-    async def get(self, obj_id: str) -> Dict:
+    async def create_many(self, objs: List[Dict]) -> Dict[int, str]:
+        """
+        Insert tasks with one unordered insert_many.
+
+        Args:
+            objs (List[dict]): Task documents, each with its _id set.
+
+        Returns:
+            Dict[int, str]: Error message by position of each document that
+            was not inserted; the others were.
+        """
+        logger.info("Inserting %d tasks", len(objs))
+        documents = [with_object_ids(obj, REFERENCE_FIELDS) for obj in objs]
+        errors = {}
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as bwe:
+            errors = _write_errors(bwe)
+        inserted = [d for i, d in enumerate(documents) if i not in errors]
+        if inserted:
+            await self.team_tasks.refresh_tasks([d["_id"] for d in inserted])
+            await self.versions.bump(_team_scopes(inserted))
+        return errors
+
+    async def update_many(
+        self, updates: List[Tuple[str, Dict, Optional[Iterable]]]
+    ) -> BulkUpdateResult:
+        """
+        Apply per-task $set updates with one unordered bulk_write.
+
+        Each update may be restricted to tasks of some teams, as part of its
+        filter so the check is atomic with the write. The bulk result only
+        has totals, so when fewer tasks matched than were written the
+        written tasks are read again to tell which ones were missed.
+
+        Args:
+            updates (List[Tuple[str, dict, Iterable]]): Task ID, fields to
+                update and the teams the task must be in (None for any
+                task; include None to allow tasks without a team).
+
+        Returns:
+            BulkUpdateResult: Failed, missing and out of scope updates.
+        """
+        operations = []
+        for obj_id, obj_update, team_ids in updates:
+            query = {"_id": ObjectId(obj_id)}
+            if team_ids is not None:
+                query["team_id"] = {"$in": [to_object_id(t) for t in team_ids]}
+            operations.append(
+                UpdateOne(
+                    query,
+                    {"$set": _stamped(with_object_ids(obj_update, REFERENCE_FIELDS))},
+                )
+            )
+        result = BulkUpdateResult()
+        try:
+            matched = (
+                await self.collection.bulk_write(operations, ordered=False)
+            ).matched_count
+        except BulkWriteError as bwe:
+            result.errors = _write_errors(bwe)
+            matched = bwe.details.get("nMatched", 0)
+        written = [i for i in range(len(updates)) if i not in result.errors]
+        if matched < len(written):
+            await self._find_unmatched(updates, written, result)
+        updated = [
+            updates[i][0]
+            for i in written
+            if i not in result.missing and i not in result.out_of_scope
+        ]
+        if updated:
+            await self.team_tasks.refresh_tasks(updated)
+            # The previous teams of the tasks are not known.
+            await self.versions.bump([TASKS_SCOPE])
+        return result
+
+    async def _find_unmatched(
+        self,
+        updates: List[Tuple[str, Dict, Optional[Iterable]]],
+        positions: List[int],
+        result: BulkUpdateResult,
+    ) -> None:
+        """
+        Record which of the written updates matched no task: those whose
+        task is gone, or is neither in the allowed teams nor in the team
+        the update moved it to.
+        """
+        tasks = {
+            str(task["_id"]): task
+            for task in await self.get_many(
+                [updates[i][0] for i in positions], {"team_id": 1}
+            )
+        }
+        for i in positions:
+            obj_id, obj_update, team_ids = updates[i]
+            task = tasks.get(obj_id)
+            if task is None:
+                result.missing.add(i)
+            elif team_ids is not None:
+                allowed = {str(t) for t in team_ids}
+                if obj_update.get("team_id") is not None:
+                    allowed.add(str(obj_update["team_id"]))
+                if str(task.get("team_id")) not in allowed:
+                    result.out_of_scope.add(i)
+
+    async def get_many(
+        self, obj_ids: List[str], projection: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Get the tasks with the given IDs in one query.
+
+        Args:
+            obj_ids (List[str]): Task IDs.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            List[dict]: The tasks found, in no particular order.
+        """
+        cursor = self.collection.find(
+            {"_id": {"$in": [to_object_id(obj_id) for obj_id in obj_ids]}},
+            projection,
+        )
+        return await cursor.to_list(length=None)
+
+    async def get(self, obj_id: str, projection: Optional[Dict] = None) -> Dict:
         """
         Get a task by ID.
 
         Args:
             obj_id (str): Task ID.
+            projection (dict, optional): Fields to return; all when omitted.
 
         Returns:
             dict: Task document.
         """
-        return await self.collection.find_one({"_id": ObjectId(obj_id)})
+        return await self.collection.find_one({"_id": ObjectId(obj_id)}, projection)
 
     async def update(self, obj_id: str, obj_update: Dict) -> bool:
         """
-        Update a task.
+        Update a task. updated_at is only advanced when a field changes.
 
         Args:
             obj_id (str): Task ID.
@@ -41,11 +318,70 @@ class TaskRepository(AbstractRepository):
         Returns:
             bool: True if updated.
         """
+        changes = with_object_ids(obj_update, REFERENCE_FIELDS)
+        if not changes:
+            return False
         result = await self.collection.update_one(
-            {"_id": ObjectId(obj_id)}, {"$set": obj_update}
+            {"_id": ObjectId(obj_id), **differs_from(changes)},
+            {"$set": _stamped(changes)},
         )
+        if result.modified_count > 0:
+            await self.team_tasks.refresh_tasks([obj_id])
+            await self.versions.bump([TASKS_SCOPE])
         return result.modified_count > 0
 
+    async def update_and_get(
+        self,
+        obj_id: str,
+        obj_update: Dict,
+        team_ids: Optional[Iterable] = None,
+    ) -> UpdateResult:
+        """
+        Update a task and return it in one round trip.
+
+        The update is applied unconditionally and returns the task as it was
+        before, so whether it changed is decided by comparing that document
+        to the update. A found, unchanged task thus costs one round trip as
+        well. Only a task outside of `team_ids` is read again, to tell it
+        apart from a missing task.
+
+        Args:
+            obj_id (str): Task ID.
+            obj_update (dict): Fields to set.
+            team_ids (Iterable, optional): Restrict the write to tasks of these
+                teams; include None to allow tasks without a team. The check
+                is part of the update filter, so it is atomic with the write.
+
+        Returns:
+            UpdateResult: Whether the task exists and was modified, and the
+            task as stored after the call. An unmodified task may be outside
+            of `team_ids`; callers check its team_id.
+        """
+        changes = with_object_ids(obj_update, REFERENCE_FIELDS)
+        query = {"_id": ObjectId(obj_id)}
+        if team_ids is not None:
+            query["team_id"] = {"$in": [to_object_id(t) for t in team_ids]}
+        if not changes:
+            task = await self.collection.find_one(query)
+        else:
+            now = datetime.now(timezone.utc)
+            task = await self.collection.find_one_and_update(
+                query,
+                _stamped_if_changed(changes, now),
+                return_document=ReturnDocument.BEFORE,
+            )
+            if task is not None and modifies(task, changes):
+                task = {**task, **changes, "updated_at": now}
+                await self.team_tasks.refresh_tasks([obj_id])
+                # A task moved to another team also leaves its previous team.
+                await self.versions.bump(
+                    [TASKS_SCOPE] if "team_id" in changes else _team_scopes([task])
+                )
+                return UpdateResult(matched=True, modified=True, document=task)
+        if task is None and team_ids is not None:
+            task = await self.get(obj_id)
+        return UpdateResult(matched=task is not None, modified=False, document=task)
+
     async def delete(self, obj_id: str) -> bool:
         """
         Delete a task.
@@ -56,23 +392,68 @@ class TaskRepository(AbstractRepository):
         Returns:
             bool: True if deleted.
         """
-        logger.info(f"Deleting task with ID: {obj_id}")
+        logger.info("Deleting task with ID: %s", obj_id)
         result = await self.collection.delete_one({"_id": ObjectId(obj_id)})
+        if result.deleted_count > 0:
+            await self.team_tasks.remove_tasks([obj_id])
+            await self.versions.bump([TASKS_SCOPE])
         return result.deleted_count > 0
 
     async def get_all(self) -> list:
         """
-        Get all tasks.
+        Get all tasks as team task rows, read from the materialized
+        team_tasks_view.
 
         Returns:
             list: All tasks.
         """
         results = []
-        cursor = self.view.find()
+        cursor = await self.team_tasks.find()
         async for task in cursor:
             results.append(task)
         return results
 
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Dict] = None,
+    ) -> Page:
+        """
+        Get one page of team task rows in _id order.
+
+        Args:
+            limit (int): Page size.
+            after (str, optional): Cursor returned with the previous page.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            Page: The rows and the cursor of the next page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        cursor = await self.team_tasks.find(
+            keyset_query({}, after), projection=projection
+        )
+        tasks = await cursor.sort("_id", 1).limit(limit + 1).to_list(length=None)
+        return build_page(tasks, limit)
+
+    async def get_all_cursor(
+        self, batch_size: int, projection: Optional[Dict] = None
+    ) -> AsyncCursor:
+        """
+        Get a cursor over all team task rows, for streaming.
+
+        Args:
+            batch_size (int): Rows fetched per round trip.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            AsyncCursor: Cursor for the team task rows.
+        """
+        return await self.team_tasks.find(batch_size=batch_size, projection=projection)
+
     def get_all_tasks2(self) -> AsyncCursor:
         """
         Get all tasks (cursor).
@@ -88,26 +469,127 @@ class TaskRepository(AbstractRepository):
         """
         Get tasks for a list of team IDs.
         """
-        # Convert strings to ObjectIds if stored as ObjectId in tasks collection
-        # But wait, app/seeding.py stored team_id as string: "team_id": str(team_id)
-        # And TaskModel defines team_id as PyObjectId (string).
-        # Let's check how it's stored.
-        # TaskModel: team_id: Optional[PyObjectId]
-        # In Mongo, PyObjectId usually serializes to str if not handled.
-        # But TaskRepository.create uses insert_one(obj).
-        # And TaskModel serializer serializes objectid to str.
-        # So in DB it might be string.
-        # Seeding script definitely uses string.
-        # So let's query with strings first.
-        cursor = self.collection.find({"team_id": {"$in": team_ids}})
-        # Also try ObjectIds just in case
-        # cursor = self.collection.find({"team_id": {"$in": [ObjectId(tid) for tid in team_ids]}})
-        # Actually seeding script: "team_id": str(team_id)
+        cursor = self.collection.find(
+            {"team_id": {"$in": [to_object_id(tid) for tid in team_ids]}}
+        )
         results = []
         async for task in cursor:
             results.append(task)
         return results
 
+    async def get_page_by_team_ids(
+        self,
+        team_ids: List[str],
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Dict] = None,
+    ) -> Page:
+        """
+        Get one page of the tasks for a list of team IDs, in _id order.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        query = keyset_query(
+            {"team_id": {"$in": [to_object_id(tid) for tid in team_ids]}}, after
+        )
+        cursor = self.collection.find(query, projection).sort("_id", 1).limit(limit + 1)
+        return build_page(await cursor.to_list(length=None), limit)
+
+    async def get_tasks_by_member(
+        self, assigned_to: str, projection: Optional[Dict] = None
+    ) -> list:
+        """
+        Get tasks assigned to a team member.
+
+        Args:
+            assigned_to (str): Member ID.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            list: Tasks assigned to the member.
+        """
+        cursor = self.collection.find(
+            {"assigned_to": to_object_id(assigned_to)}, projection
+        )
+        return await cursor.to_list(length=None)
+
+    async def get_dashboard(self, limit: int) -> Dict:
+        """
+        Task statistics for the project manager dashboard, computed by the
+        single $facet aggregation of `dashboard_pipeline`.
+
+        Args:
+            limit (int): Number of teams, members and recent tasks returned.
+
+        Returns:
+            dict: One key per facet, each a list of result documents.
+        """
+        cursor = await self.collection.aggregate(dashboard_pipeline(limit))
+        [result] = await cursor.to_list(length=1)
+        return result
+
+    async def watch(
+        self, fields: Iterable[str], previous_fields: Iterable[str] = ()
+    ) -> AsyncChangeStream:
+        """
+        Open a change stream on tasks. Needs a replica set or sharded cluster.
+
+        Updates carry the task as it is after the change (`updateLookup`),
+        limited to `fields`, and the names of the updated fields. Updates,
+        replacements and deletes also carry `previous_fields` of the task as
+        it was before, when pre-images are enabled on the collection (see
+        `enable_pre_images`).
+
+        Args:
+            fields (Iterable[str]): Task fields included in each change.
+            previous_fields (Iterable[str]): Fields of the pre-image included.
+
+        Returns:
+            AsyncChangeStream: Stream of insert, update, replace and delete
+            events.
+        """
+        pipeline = [
+            {"$match": {"operationType": {"$in": list(TASK_CHANGE_OPERATIONS)}}},
+            {
+                "$project": {
+                    "operationType": 1,
+                    "documentKey": 1,
+                    "updateDescription.updatedFields": 1,
+                    **{f"fullDocument.{field}": 1 for field in fields},
+                    **{
+                        f"fullDocumentBeforeChange.{field}": 1
+                        for field in previous_fields
+                    },
+                }
+            },
+        ]
+        return await self.collection.watch(
+            pipeline,
+            full_document="updateLookup",
+            full_document_before_change="whenAvailable",
+        )
+
+    async def enable_pre_images(self) -> bool:
+        """
+        Have MongoDB keep the previous version of changed tasks for change
+        streams (MongoDB 6.0+). Costs one extra write per update or delete.
+
+        Returns:
+            bool: False if the server does not support it.
+        """
+        try:
+            await self.collection.database.command(
+                {
+                    "collMod": self.collection.name,
+                    "changeStreamPreAndPostImages": {"enabled": True},
+                }
+            )
+        except OperationFailure as e:
+            logger.warning("Task change stream pre-images not enabled: %s", e)
+            return False
+        return True
+
     # Keep legacy methods for backward compatibility or refactor usage in codebase
     async def create_task(self, task: Dict) -> str:
         return await self.create(task)
@@ -4,29 +4,52 @@ from bson import ObjectId
 from typing import List, Dict, Optional
 from app.models.team import TeamModel, TeamMemberModel
 from .abstract_repository import AbstractRepository
-from app.logging_config import logger
+from app.logging_config import get_logger
+from app.database.materialized_views import TeamTasksMaterializedView
+from app.database.versions import TEAM_MEMBERS_SCOPE, VersionCounters
+from app.utils import with_object_ids
+from app.pagination import Page, build_page, keyset_query
+
+logger = get_logger(__name__)
+
+# References stored as ObjectId so lookups can use the _id indexes.
+REFERENCE_FIELDS = ("teams",)
 
 class TeamMemberRepository(AbstractRepository):
-    def __init__(self, db):
+    def __init__(
+        self,
+        db,
+        team_tasks: Optional[TeamTasksMaterializedView] = None,
+        versions: Optional[VersionCounters] = None,
+    ):
         self.collection = db['team_members']
-        logger.info("TeamMemberRepository initialized.")
+        # Shared with the other repositories when built by the container.
+        self.team_tasks = team_tasks or TeamTasksMaterializedView(db)
+        self.versions = versions or VersionCounters(db)
+        logger.debug("TeamMemberRepository initialized.")
 
     async def create(self, obj: Dict) -> str:
-        logger.info(f"Inserting new team member: {obj}")
-        result = await self.collection.insert_one(obj)
+        logger.debug("Inserting new team member: %s", obj.get("email"))
+        result = await self.collection.insert_one(
+            with_object_ids(obj, REFERENCE_FIELDS)
+        )
+        await self.versions.bump([TEAM_MEMBERS_SCOPE])
         return str(result.inserted_id)
 
-    async def get(self, obj_id: str) -> Optional[Dict]:
+    async def get(
+        self, obj_id: str, projection: Optional[Dict] = None
+    ) -> Optional[Dict]:
         """
         Get a team member by ID.
 
         Args:
             team_member_id (str): Member ID.
+            projection (dict, optional): Fields to return; all when omitted.
 
         Returns:
             dict or None: Member document.
         """
-        return await self.collection.find_one({"_id": ObjectId(obj_id)})
+        return await self.collection.find_one({"_id": ObjectId(obj_id)}, projection)
 
     async def update(self, obj_id: str, obj_update: Dict) -> bool:
         """
@@ -39,7 +62,13 @@ class TeamMemberRepository(AbstractRepository):
         Returns:
             bool: True if updated.
         """
-        result = await self.collection.update_one({"_id": ObjectId(obj_id)}, {"$set": obj_update})
+        result = await self.collection.update_one(
+            {"_id": ObjectId(obj_id)},
+            {"$set": with_object_ids(obj_update, REFERENCE_FIELDS)},
+        )
+        if result.modified_count > 0:
+            await self.team_tasks.refresh_member(obj_id)
+            await self.versions.bump([TEAM_MEMBERS_SCOPE])
         return result.modified_count > 0
 
     async def delete(self, obj_id: str) -> bool:
@@ -53,8 +82,20 @@ class TeamMemberRepository(AbstractRepository):
             bool: True if deleted.
         """
         result = await self.collection.delete_one({"_id": ObjectId(obj_id)})
+        if result.deleted_count > 0:
+            await self.team_tasks.refresh_member(obj_id)
+            await self.versions.bump([TEAM_MEMBERS_SCOPE])
         return result.deleted_count > 0
 
+    async def count(self) -> int:
+        """
+        Approximate number of team members, from the collection metadata.
+
+        Returns:
+            int: Document count.
+        """
+        return await self.collection.estimated_document_count()
+
     async def get_all(self) -> List[Dict]:
         """
         Get all team members.
@@ -65,19 +106,62 @@ class TeamMemberRepository(AbstractRepository):
         cursor = self.collection.find()
         return await cursor.to_list(length=None)
 
+    async def get_all_cursor(
+        self, batch_size: int, projection: Optional[Dict] = None
+    ) -> AsyncCursor:
+        """
+        Get a cursor over all team members, for streaming.
+
+        Args:
+            batch_size (int): Documents fetched per round trip.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            AsyncCursor: Cursor for the team members.
+        """
+        return self.collection.find(projection=projection, batch_size=batch_size)
+
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Dict] = None,
+    ) -> Page:
+        """
+        Get one page of team members in _id order.
+
+        Args:
+            limit (int): Page size.
+            after (str, optional): Cursor returned with the previous page.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            Page: The members and the cursor of the next page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        query = keyset_query({}, after)
+        cursor = (
+            self.collection.find(query, projection).sort("_id", 1).limit(limit + 1)
+        )
+        return build_page(await cursor.to_list(length=None), limit)
  
-    async def get_team_members_by_role(self, role: str) -> List[Dict]:
+    async def get_team_members_by_role(
+        self, role: str, projection: Optional[Dict] = None
+    ) -> List[Dict]:
         """
         Get team members by role.
 
         Args:
             role (str): Role to filter by.
+            projection (dict, optional): Fields to return.
 
         Returns:
             List[dict]: Team members with the specified role.
         """
-        print(f"Fetching team members with role: {role}")
-        cursor = self.collection.find({"role": role})
+        logger.debug("Fetching team members with role: %s", role)
+        cursor = self.collection.find({"role": role}, projection)
         return await cursor.to_list(length=None)
     
     
@@ -86,8 +170,10 @@ class TeamMemberRepository(AbstractRepository):
     async def create_team_member(self, team_member_data: Dict) -> str:
         return await self.create(team_member_data)
 
-    async def get_team_member_by_id(self, team_member_id: str) -> Optional[Dict]:
-        return await self.get(team_member_id)
+    async def get_team_member_by_id(
+        self, team_member_id: str, projection: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        return await self.get(team_member_id, projection)
 
     async def update_team_member(self, team_member_id: str, update_data: Dict) -> bool:
         return await self.update(team_member_id, update_data)
@@ -1,67 +1,263 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument
 from pymongo.results import InsertOneResult
 from pymongo.asynchronous.cursor import AsyncCursor
 from bson import ObjectId
 from typing import List, Dict, Optional
 from app.models.team import TeamModel, TeamMemberModel
 from .abstract_repository import AbstractRepository
-from app.logging_config import logger
-from app.utils import UpdateResult
+from app.logging_config import get_logger
+from app.utils import UpdateResult, modifies, to_object_id, with_object_ids
+from app.pagination import Page, build_page, keyset_query
+from app.database.materialized_views import TeamTasksMaterializedView
+from app.database.versions import TEAMS_SCOPE, VersionCounters
+from app.membership import membership_changes, membership_versions
+
+logger = get_logger(__name__)
+
+# References stored as ObjectId so lookups can use the _id indexes.
+REFERENCE_FIELDS = ("member_ids", "project_manager")
+
+
+def _team_users(team: Optional[Dict]):
+    if not team:
+        return set(), set()
+    managers = {team["project_manager"]} if team.get("project_manager") else set()
+    return managers, set(team.get("member_ids") or [])
+
+
+def _object_ids(values, what: str) -> List[ObjectId]:
+    """
+    Distinct ObjectIds of the given IDs, in order.
+
+    Raises:
+        ValueError: If one of them is not a valid ObjectId.
+    """
+    ids = []
+    for value in values:
+        if not ObjectId.is_valid(str(value)):
+            raise ValueError(f"Invalid {what} ID: {value}")
+        ids.append(ObjectId(str(value)))
+    return list(dict.fromkeys(ids))
+
+
+def board_pipeline(lead_id, tasks_per_status: int) -> List[Dict]:
+    """
+    Aggregation over teams building a team lead's board in one round trip.
+
+    The lead's teams are folded into one document so that their members
+    and tasks are each fetched by a single $lookup: one $in over the union
+    of the member IDs on team_members and one $in over the team IDs on
+    tasks. The tasks are grouped by status on the server, keeping the count
+    and the `tasks_per_status` most recently updated of each status.
+    Needs MongoDB 5.2 ($lookup with localField and pipeline, $topN).
+    """
+    return [
+        {"$match": {"project_manager": lead_id}},
+        {"$project": {"name": 1, "member_ids": 1, "project_manager": 1}},
+        {"$sort": {"name": 1, "_id": 1}},
+        {
+            "$group": {
+                "_id": None,
+                "teams": {"$push": "$$ROOT"},
+                "team_ids": {"$push": "$_id"},
+                "member_ids": {"$push": {"$ifNull": ["$member_ids", []]}},
+            }
+        },
+        {
+            "$set": {
+                "member_ids": {
+                    "$reduce": {
+                        "input": "$member_ids",
+                        "initialValue": [],
+                        "in": {"$setUnion": ["$$value", "$$this"]},
+                    }
+                }
+            }
+        },
+        {
+            "$lookup": {
+                "from": "team_members",
+                "localField": "member_ids",
+                "foreignField": "_id",
+                "pipeline": [
+                    {"$project": {"name": 1, "email": 1, "role": 1}},
+                    {"$sort": {"name": 1, "_id": 1}},
+                ],
+                "as": "members",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "tasks",
+                "localField": "team_ids",
+                "foreignField": "team_id",
+                "pipeline": [
+                    {
+                        "$group": {
+                            "_id": "$status",
+                            "count": {"$sum": 1},
+                            "tasks": {
+                                "$topN": {
+                                    "n": tasks_per_status,
+                                    "sortBy": {"updated_at": -1, "_id": -1},
+                                    "output": {
+                                        "_id": "$_id",
+                                        "title": "$title",
+                                        "description": "$description",
+                                        "team_id": "$team_id",
+                                        "assigned_to": "$assigned_to",
+                                        "updated_at": "$updated_at",
+                                    },
+                                }
+                            },
+                        }
+                    }
+                ],
+                "as": "columns",
+            }
+        },
+        {"$project": {"_id": 0, "teams": 1, "members": 1, "columns": 1}},
+    ]
 
 
 class TeamRepository(AbstractRepository):
-    def __init__(self, db):
+    def __init__(
+        self,
+        db,
+        team_tasks: Optional[TeamTasksMaterializedView] = None,
+        versions: Optional[VersionCounters] = None,
+    ):
         self.collection = db["teams"]
         self.teams_view = db["teams_view"]
-        logger.info("TeamRepository initialized.")
+        self.members = db["team_members"]
+        # Shared with the other repositories when built by the container.
+        self.team_tasks = team_tasks or TeamTasksMaterializedView(db)
+        self.versions = versions or VersionCounters(db)
+        logger.debug("TeamRepository initialized.")
+
+    async def _membership_changed(
+        self, before: Optional[Dict], after: Optional[Dict]
+    ) -> None:
+        """
+        Bump the membership version of every user whose role in a team
+        differs between two versions of it (None for a missing team), so
+        their access token claims get refreshed.
+        """
+        managers_before, members_before = _team_users(before)
+        managers_after, members_after = _team_users(after)
+        affected = (managers_before ^ managers_after) | (members_before ^ members_after)
+        if not affected:
+            return
+        membership_changes.record(affected)
+        await self.members.update_many(
+            {"_id": {"$in": list(affected)}}, {"$inc": {"membership_version": 1}}
+        )
+        membership_versions.forget(affected)
 
     async def create(self, obj: Dict) -> str:
-        logger.info(f"Inserting new team: {obj}")
-        result = await self.collection.insert_one(obj)
+        logger.debug("Inserting new team: %s", obj)
+        document = with_object_ids(obj, REFERENCE_FIELDS)
+        result = await self.collection.insert_one(document)
         if not isinstance(result, InsertOneResult) or not result.inserted_id:
             logger.error("Failed to insert team")
             raise Exception("Failed to insert team")
+        await self._membership_changed(None, document)
+        await self.versions.bump([TEAMS_SCOPE])
         return str(result.inserted_id)
 
-    async def get(self, obj_id: str) -> Optional[Dict]:
+    async def get(
+        self, obj_id: str, projection: Optional[Dict] = None
+    ) -> Optional[Dict]:
         # Prefer reading from the teams collection for direct lookups.
         # Using the teams_view may be appropriate for rich joins, but tests
         # and many callers expect a simple collection lookup and may mock
         # the collection methods. Fall back to teams_view only if collection
         # lookup returns None (e.g., when a view is used in production).
-        team = await self.collection.find_one({"_id": ObjectId(obj_id)})
+        team = await self.collection.find_one({"_id": ObjectId(obj_id)}, projection)
         if team is None:
-            return await self.teams_view.find_one({"_id": ObjectId(obj_id)})
+            return await self.teams_view.find_one({"_id": ObjectId(obj_id)}, projection)
         return team
 
+    async def get_many(
+        self, obj_ids: List[str], projection: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Get the teams with the given IDs in one query.
+        """
+        cursor = self.collection.find(
+            {"_id": {"$in": [to_object_id(obj_id) for obj_id in obj_ids]}},
+            projection,
+        )
+        return await cursor.to_list(length=None)
+
     async def update(self, obj_id: str, obj_update: Dict) -> bool:
         result = await self.collection.update_one(
-            {"_id": ObjectId(obj_id)}, {"$set": obj_update}
+            {"_id": ObjectId(obj_id)},
+            {"$set": with_object_ids(obj_update, REFERENCE_FIELDS)},
         )
         if result.matched_count == 0:
-            logger.warning(f"No team found with ID: {obj_id}")
+            logger.warning("No team found with ID: %s", obj_id)
 
         if result.modified_count == 0:
-            logger.info(f"No changes made to team with ID: {obj_id}")
+            logger.info("No changes made to team with ID: %s", obj_id)
+        else:
+            await self.team_tasks.refresh_team(obj_id)
+            await self.versions.bump([TEAMS_SCOPE])
 
-        logger.info(f"Successfully updated team with ID: {obj_id}")
+        logger.info("Successfully updated team with ID: %s", obj_id)
         # Keep return type consistent with AbstractRepository: return a bool
         # indicating whether any document was modified.
         return result.modified_count > 0
 
-    async def delete(self, obj_id: str) -> bool:
-        result = await self.collection.delete_one({"_id": ObjectId(obj_id)})
-        if result.deleted_count == 0:
-            logger.warning(f"No team found with ID: {obj_id} to delete")
-            return False
-        logger.info(f"Deleted team with ID: {obj_id}")
-        if result.deleted_count > 1:
-            logger.warning(
-                f"Multiple teams deleted with ID: {obj_id}, expected only one"
+    async def update_and_get(self, obj_id: str, obj_update: Dict) -> UpdateResult:
+        """
+        Update a team and return it in one round trip; see
+        TaskRepository.update_and_get.
+        """
+        changes = with_object_ids(obj_update, REFERENCE_FIELDS)
+        if not changes:
+            team = await self.collection.find_one({"_id": ObjectId(obj_id)})
+        else:
+            # The previous document tells whether the team changed and whose
+            # membership did; the new one is the previous with the $set applied.
+            team = await self.collection.find_one_and_update(
+                {"_id": ObjectId(obj_id)},
+                {"$set": changes},
+                return_document=ReturnDocument.BEFORE,
             )
+            if team is not None and modifies(team, changes):
+                before, team = team, {**team, **changes}
+                await self.team_tasks.refresh_team(obj_id)
+                await self._membership_changed(before, team)
+                await self.versions.bump([TEAMS_SCOPE])
+                return UpdateResult(matched=True, modified=True, document=team)
+        if team is None:
+            logger.warning("No team found with ID: %s", obj_id)
         else:
-            logger.info(f"Successfully deleted team with ID: {obj_id}")
-        return result.deleted_count > 0
+            logger.info("No changes made to team with ID: %s", obj_id)
+        return UpdateResult(matched=team is not None, modified=False, document=team)
+
+    async def delete(self, obj_id: str) -> bool:
+        team = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(obj_id)}, {"project_manager": 1, "member_ids": 1}
+        )
+        if team is None:
+            logger.warning("No team found with ID: %s to delete", obj_id)
+            return False
+        logger.info("Deleted team with ID: %s", obj_id)
+        await self.team_tasks.refresh_team(obj_id)
+        await self._membership_changed(team, None)
+        await self.versions.bump([TEAMS_SCOPE])
+        return True
+
+    async def count(self) -> int:
+        """
+        Approximate number of teams, from the collection metadata.
+
+        Returns:
+            int: Document count.
+        """
+        return await self.collection.estimated_document_count()
 
     async def get_all(self) -> List[Dict]:
         # Prefer using the teams collection for listing all teams. If a
@@ -73,6 +269,51 @@ class TeamRepository(AbstractRepository):
             teams = await cursor.to_list(length=None)
         return teams
 
+    async def get_all_cursor(
+        self, batch_size: int, projection: Optional[Dict] = None
+    ) -> AsyncCursor:
+        """
+        Get a cursor over all teams, for streaming.
+
+        Args:
+            batch_size (int): Documents fetched per round trip.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            AsyncCursor: Cursor for the teams.
+        """
+        return self.collection.find(projection=projection, batch_size=batch_size)
+
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        projection: Optional[Dict] = None,
+    ) -> Page:
+        """
+        Get one page of teams in _id order.
+
+        Args:
+            limit (int): Page size.
+            after (str, optional): Cursor returned with the previous page.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            Page: The teams and the cursor of the next page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        query = keyset_query({}, after)
+        cursor = self.collection.find(query, projection).sort("_id", 1).limit(limit + 1)
+        teams = await cursor.to_list(length=None)
+        if not teams and after is None:
+            cursor = (
+                self.teams_view.find(query, projection).sort("_id", 1).limit(limit + 1)
+            )
+            teams = await cursor.to_list(length=None)
+        return build_page(teams, limit)
+
     # Legacy methods call new abstract methods
     async def create_team(self, team_data: Dict) -> str:
         return await self.create(team_data)
@@ -105,14 +346,18 @@ class TeamRepository(AbstractRepository):
             {"$addToSet": {"member_ids": ObjectId(member_id)}},
         )
         if result.matched_count == 0:
-            logger.warning(f"No team found with ID: {team_id} to add member")
+            logger.warning("No team found with ID: %s to add member", team_id)
             return False
         if result.modified_count == 0:
             logger.info(
-                f"Member with ID: {member_id} already exists in team with ID: {team_id}"
+                "Member with ID: %s already exists in team with ID: %s",
+                member_id,
+                team_id,
             )
             return False
-        logger.info(f"Added member with ID: {member_id} to team with ID: {team_id}")
+        logger.info("Added member with ID: %s to team with ID: %s", member_id, team_id)
+        await self._membership_changed(None, {"member_ids": [ObjectId(member_id)]})
+        await self.versions.bump([TEAMS_SCOPE])
         return result.modified_count > 0
 
     async def remove_team_member(self, team_id: str, member_id: str) -> bool:
@@ -130,16 +375,123 @@ class TeamRepository(AbstractRepository):
             {"_id": ObjectId(team_id)}, {"$pull": {"member_ids": ObjectId(member_id)}}
         )
         if result.matched_count == 0:
-            logger.warning(f"No team found with ID: {team_id} to remove member")
+            logger.warning("No team found with ID: %s to remove member", team_id)
             return False
         if result.modified_count == 0:
             logger.info(
-                f"Member with ID: {member_id} not found in team with ID: {team_id}"
+                "Member with ID: %s not found in team with ID: %s", member_id, team_id
             )
             return False
-        logger.info(f"Removed member with ID: {member_id} from team with ID: {team_id}")
+        logger.info(
+            "Removed member with ID: %s from team with ID: %s", member_id, team_id
+        )
+        await self._membership_changed({"member_ids": [ObjectId(member_id)]}, None)
+        await self.versions.bump([TEAMS_SCOPE])
         return result.modified_count > 0
 
+    async def add_team_members(
+        self,
+        team_id: str,
+        member_ids: List[str],
+        max_size: int,
+        project_manager: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """
+        Add several members to a team in one conditional update.
+
+        The size check runs on the server as part of the update filter, so
+        concurrent additions cannot push a team past `max_size`. Members
+        already in the team are not counted twice.
+
+        Args:
+            team_id (str): Team ID.
+            member_ids (List[str]): Member IDs to add.
+            max_size (int): Largest member count allowed after the update.
+            project_manager (str, optional): Only update the team if it is
+                managed by this user.
+
+        Returns:
+            Optional[dict]: The updated team, or None if the team does not
+            exist, is not managed by `project_manager` or the limit would be
+            exceeded.
+
+        Raises:
+            ValueError: If the team ID or a member ID is invalid.
+        """
+        [team_oid] = _object_ids([team_id], "team")
+        ids = _object_ids(member_ids, "member")
+        resulting_members = {"$setUnion": [{"$ifNull": ["$member_ids", []]}, ids]}
+        query = {
+            "_id": team_oid,
+            "$expr": {"$lte": [{"$size": resulting_members}, max_size]},
+        }
+        if project_manager is not None:
+            query["project_manager"] = to_object_id(project_manager)
+        # The team before the update tells which members are really new;
+        # $addToSet appends them in order, so the result follows from it.
+        before = await self.collection.find_one_and_update(
+            query,
+            {"$addToSet": {"member_ids": {"$each": ids}}},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is None:
+            logger.warning(
+                "Members not added to team with ID: %s (team missing, not "
+                "managed by %s or size limit of %d reached)",
+                team_id,
+                project_manager,
+                max_size,
+            )
+            return None
+        current = before.get("member_ids") or []
+        present = set(current)
+        added = [m for m in ids if m not in present]
+        if not added:
+            return before
+        team = {**before, "member_ids": [*current, *added]}
+        await self._membership_changed(before, team)
+        await self.versions.bump([TEAMS_SCOPE])
+        return team
+
+    async def remove_team_members(
+        self, team_id: str, member_ids: List[str]
+    ) -> Optional[Dict]:
+        """
+        Remove several members from a team in one update.
+
+        Args:
+            team_id (str): Team ID.
+            member_ids (List[str]): Member IDs to remove.
+
+        Returns:
+            Optional[dict]: The updated team, or None if it does not exist.
+
+        Raises:
+            ValueError: If the team ID or a member ID is invalid.
+        """
+        [team_oid] = _object_ids([team_id], "team")
+        ids = _object_ids(member_ids, "member")
+        # Only the members that were in the team lose access.
+        before = await self.collection.find_one_and_update(
+            {"_id": team_oid},
+            {"$pull": {"member_ids": {"$in": ids}}},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is None:
+            logger.warning("No team found with ID: %s to remove members", team_id)
+            return None
+        removed = set(ids)
+        team = {
+            **before,
+            "member_ids": [
+                m for m in before.get("member_ids") or [] if m not in removed
+            ],
+        }
+        if team["member_ids"] != (before.get("member_ids") or []):
+            await self._membership_changed(before, team)
+            await self.versions.bump([TEAMS_SCOPE])
+        return team
+
     async def get_team_members(self, team_id: str) -> dict:
         """
         Get all member ObjectIds for a team.
@@ -152,9 +504,9 @@ class TeamRepository(AbstractRepository):
         """
         team = await self.get(team_id)
         if not team:
-            logger.warning(f"No team found with ID: {team_id}")
+            logger.warning("No team found with ID: %s", team_id)
             return {}
-        logger.info(f"Retrieved members for team with ID: {team_id}")
+        logger.debug("Retrieved members for team with ID: %s", team_id)
         return team
 
     async def get_all_team_members(self) -> list:
@@ -171,9 +523,32 @@ class TeamRepository(AbstractRepository):
             member_ids.update(team.get("member_ids", []))
         return list(member_ids)
 
-    async def get_team_by_project_manager(self, lead_id: str) -> List[Dict]:
+    async def get_team_by_project_manager(
+        self, lead_id: str, projection: Optional[Dict] = None
+    ) -> List[Dict]:
         """
         Get all teams led by a specific team lead (project_manager).
         """
-        cursor = self.collection.find({"project_manager": ObjectId(lead_id)})
+        cursor = self.collection.find(
+            {"project_manager": to_object_id(lead_id)}, projection
+        )
         return await cursor.to_list(length=None)
+
+    async def get_board(self, lead_id: str, tasks_per_status: int) -> Dict:
+        """
+        Teams, members and tasks by status of a team lead, from the single
+        aggregation of `board_pipeline`.
+
+        Args:
+            lead_id (str): Team lead ID.
+            tasks_per_status (int): Tasks returned for each status.
+
+        Returns:
+            dict: `teams`, `members` and `columns` (one per status present);
+            all empty if the lead has no teams.
+        """
+        cursor = await self.collection.aggregate(
+            board_pipeline(to_object_id(lead_id), tasks_per_status)
+        )
+        boards = await cursor.to_list(length=1)
+        return boards[0] if boards else {"teams": [], "members": [], "columns": []}
@@ -2,9 +2,12 @@ from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import jwt
 from datetime import datetime, timedelta, timezone
+from typing import Dict, List
 from app.services.team_member_service import get_team_member_service, TeamMemberService
+from app.services.team_service import get_team_service, TeamService
 from app.models.team import Role
-from app.utils import verify_password
+from app.dependencies.auth import get_current_user
+from app.hashing import password_hasher
 import os
 
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecret")
@@ -13,20 +16,68 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 router = APIRouter()
 
+
+def create_access_token(member: Dict, managed_team_ids: List[str]) -> str:
+    """
+    Issue an access token carrying the member's role and team membership.
+
+    `teams` lists the teams the member manages, `member_of` the teams they
+    belong to and `mv` the membership version they were read at, so routes
+    can scope queries without looking the teams up.
+    """
+    now = datetime.now(timezone.utc)
+    to_encode = {
+        "sub": str(member["_id"]),
+        "role": member["role"],
+        "teams": managed_team_ids,
+        "member_of": [str(team_id) for team_id in member.get("teams") or []],
+        "mv": member.get("membership_version", 0),
+        "iat": now,
+        "exp": now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    }
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
 @router.post("/login")
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    team_member_service: TeamMemberService = Depends(get_team_member_service)
+    team_member_service: TeamMemberService = Depends(get_team_member_service),
+    team_service: TeamService = Depends(get_team_service),
 ):
     # For demo: username = email, password = role (not secure, just for RBAC demo)
     member = await team_member_service.get_team_member_by_email(form_data.username)
-    if not member or not verify_password(form_data.password, member.get("hashed_password")):
+    if not member or not await password_hasher.verify(
+        form_data.password, member.get("hashed_password")
+    ):
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = {
-        "sub": str(member["_id"]),
-        "role": member["role"],
-        "exp": datetime.now(timezone.utc) + access_token_expires,
-    }
-    token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    managed = await team_service.get_managed_teams(str(member["_id"]), {"_id": 1})
+    token = create_access_token(member, list(managed))
     return {"access_token": token, "token_type": "bearer"}
+
+
+@router.post("/refresh")
+async def refresh(
+    current_user: dict = Depends(get_current_user),
+    team_member_service: TeamMemberService = Depends(get_team_member_service),
+    team_service: TeamService = Depends(get_team_service),
+):
+    """
+    Revalidate the membership claims of the current token.
+
+    Reads only the member's membership version; when it still matches the
+    token, no new token is needed. Otherwise a token with the current teams
+    is issued.
+    """
+    member = await team_member_service.get_team_member_by_id(
+        current_user["user_id"], {"role": 1, "teams": 1, "membership_version": 1}
+    )
+    if not member:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if member.get("membership_version", 0) == current_user.get("mv"):
+        return {"membership_changed": False}
+    managed = await team_service.get_managed_teams(current_user["user_id"], {"_id": 1})
+    return {
+        "membership_changed": True,
+        "access_token": create_access_token(member, list(managed)),
+        "token_type": "bearer",
+    }
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from app.models.task import (
     CreateTaskSchema,
     TaskModel,
     AssignTaskSchema,
     ResponseTaskSchema,
     ResponseTeamTaskViewCollection,
+    ResponseTeamTaskViewSchema,
 )
 
 from app.models.team import (
@@ -18,15 +19,32 @@ from app.models.team import (
     ResponseTeamCollection,
     TeamSchema,
 )
+from app.models.dashboard import (
+    DEFAULT_DASHBOARD_LIMIT,
+    MAX_DASHBOARD_LIMIT,
+    DashboardSchema,
+)
 from app.services.task_service import TaskService, get_task_service
 from app.services.team_service import TeamService, get_team_service
 from app.services.team_member_service import TeamMemberService, get_team_member_service
-from app.logging_config import logger
+from app.services.dashboard_service import DashboardService, get_dashboard_service
+from app.logging_config import get_logger
 from app.dependencies.auth import require_roles
+from app.dependencies.etags import team_members_etag, teams_etag
+from app.dependencies.projection import response_projection
+from app.database.slow_queries import slow_query_log
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.streaming import (
+    NDJSON_RESPONSES,
+    STREAM_BATCH_SIZE,
+    ndjson_response,
+    wants_ndjson,
+)
 
-from typing import List
+from typing import Dict, List, Optional
 
 
+logger = get_logger(__name__)
 router = APIRouter(dependencies=[Depends(require_roles("project_manager"))])
 
 
@@ -34,24 +52,43 @@ router = APIRouter(dependencies=[Depends(require_roles("project_manager"))])
     "/tasks",
     response_model=ResponseTeamTaskViewCollection,
     response_model_by_alias=False,
+    responses=NDJSON_RESPONSES,
 )
-async def get_all_tasks(task_service: TaskService = Depends(get_task_service)):
-    logger.info("[Project Manager] Fetching all tasks.")
+async def get_all_tasks(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    projection: Optional[Dict] = Depends(response_projection),
+    task_service: TaskService = Depends(get_task_service),
+):
+    logger.debug("[Project Manager] Fetching all tasks.")
+    if wants_ndjson(request):
+        tasks = await task_service.get_all_tasks_cursor(
+            STREAM_BATCH_SIZE, projection
+        )
+        return ndjson_response(tasks, ResponseTeamTaskViewSchema)
     try:
-        tasks = await task_service.get_all_tasks()
-        return ResponseTeamTaskViewCollection(tasks=tasks)
+        page = await task_service.get_tasks_page(limit, cursor, projection)
+        return ResponseTeamTaskViewCollection(
+            tasks=page.items, next_cursor=page.next_cursor, has_more=page.has_more
+        )
     except Exception as e:
-        logger.error(f"Error fetching all tasks: {e}")
+        logger.error("Error fetching all tasks: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/task/{task_id}", response_model=TaskModel)
-async def get_task(task_id: str, task_service: TaskService = Depends(get_task_service)):
+async def get_task(
+    task_id: str,
+    projection: Optional[Dict] = Depends(response_projection),
+    task_service: TaskService = Depends(get_task_service),
+):
     """
     Retrieve a task by its ID.
 
     Args:
         task_id (str): The unique identifier of the task to retrieve.
+        projection (dict, optional): Fields of the response model to fetch.
         task_service (TaskService, optional): The service used to fetch the task.
             Defaults to a dependency injection of `get_task_service`.
 
@@ -62,7 +99,7 @@ async def get_task(task_id: str, task_service: TaskService = Depends(get_task_se
         HTTPException: If the task is not found (404) or if an error occurs during retrieval (400).
     """
     try:
-        task = await task_service.get_task(task_id)
+        task = await task_service.get_task(task_id, projection)
         if task is None:
             raise HTTPException(status_code=404, detail="Task not found")
         return task
@@ -96,13 +133,12 @@ async def create_team_member(
 async def add_team_members(
     team_id: str,
     members: AddTeamMembersSchema,
-    team_lead_id: str,
     team_service: TeamService = Depends(get_team_service),
 ):
     """
     Assign existing members to a team.
     """
-    updated_team = await team_service.add_team_members(team_id, members, team_lead_id)
+    updated_team = await team_service.add_team_members(team_id, members)
     if not updated_team:
         raise HTTPException(status_code=400, detail="Adding team members failed")
     return updated_team
@@ -147,13 +183,32 @@ async def get_team_members_by_team_id(
     "/team-members",
     response_model=ResponseTeamMembersCollection,
     response_model_by_alias=False,
+    responses=NDJSON_RESPONSES,
 )
 async def get_all_team_members(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    projection: Optional[Dict] = Depends(response_projection),
+    etag: str = Depends(team_members_etag),
     team_member_service: TeamMemberService = Depends(get_team_member_service),
 ):
-    members = await team_member_service.get_all_team_members()
+    """
+    Retrieve all team members, one page at a time, or stream them as NDJSON.
+    Pages carry an ETag; a matching If-None-Match is answered with 304.
+    """
+    if wants_ndjson(request):
+        members = await team_member_service.get_all_team_members_cursor(
+            STREAM_BATCH_SIZE, projection
+        )
+        return ndjson_response(members, ResponseTeamMemberSchema)
+    page = await team_member_service.get_team_members_page(
+        limit, cursor, projection
+    )
 
-    return ResponseTeamMembersCollection(members=members)
+    return ResponseTeamMembersCollection(
+        members=page.items, next_cursor=page.next_cursor, has_more=page.has_more
+    )
 
 
 @router.get(
@@ -162,12 +217,14 @@ async def get_all_team_members(
     response_model_by_alias=False,
 )
 async def get_all_team_members_by_role(
-    role: str, team_member_service: TeamMemberService = Depends(get_team_member_service)
+    role: str,
+    projection: Optional[Dict] = Depends(response_projection),
+    team_member_service: TeamMemberService = Depends(get_team_member_service),
 ):
     """
     Get all team members by their role.
     """
-    members = await team_member_service.get_team_members_by_role(role)
+    members = await team_member_service.get_team_members_by_role(role, projection)
     if not members:
         raise HTTPException(
             status_code=404, detail="No members found with the specified role"
@@ -176,14 +233,31 @@ async def get_all_team_members_by_role(
 
 
 @router.get(
-    "/teams", response_model=ResponseTeamCollection, response_model_by_alias=False
+    "/teams",
+    response_model=ResponseTeamCollection,
+    response_model_by_alias=False,
+    responses=NDJSON_RESPONSES,
 )
-async def get_all_teams(team_service: TeamService = Depends(get_team_service)):
+async def get_all_teams(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    projection: Optional[Dict] = Depends(response_projection),
+    etag: str = Depends(teams_etag),
+    team_service: TeamService = Depends(get_team_service),
+):
     """
-    Retrieve all teams.
+    Retrieve all teams, one page at a time, or stream every team as NDJSON
+    when requested with Accept: application/x-ndjson. Pages carry an ETag;
+    a matching If-None-Match is answered with 304.
     """
-    teams = await team_service.get_all_teams()
-    return ResponseTeamCollection(teams=teams)
+    if wants_ndjson(request):
+        teams = await team_service.get_all_teams_cursor(STREAM_BATCH_SIZE, projection)
+        return ndjson_response(teams, ResponseTeamSchema)
+    page = await team_service.get_teams_page(limit, cursor, projection)
+    return ResponseTeamCollection(
+        teams=page.items, next_cursor=page.next_cursor, has_more=page.has_more
+    )
 
 
 @router.post(
@@ -208,7 +282,7 @@ async def update_team(
     team: UpdateTeamSchema,
     team_service: TeamService = Depends(get_team_service),
 ):
-    logger.info(f"Updating team...{team}")
+    logger.debug("Updating team %s: %s", team_id, team)
     created_team = await team_service.update_team(team_id=team_id, team_update=team)
     if not created_team:
         raise HTTPException(status_code=400, detail="Team update failed")
@@ -243,3 +317,31 @@ async def assign_task(
         status_code=403,
         detail="Forbidden: Project managers cannot assign tasks. Use team-lead endpoints (/team-lead/assign-task/{task_id}) instead.",
     )
+
+
+@router.get(
+    "/dashboard", response_model=DashboardSchema, response_model_by_alias=False
+)
+async def get_dashboard(
+    limit: int = Query(DEFAULT_DASHBOARD_LIMIT, ge=1, le=MAX_DASHBOARD_LIMIT),
+    dashboard_service: DashboardService = Depends(get_dashboard_service),
+):
+    """
+    Counts and summaries for the dashboard: task totals, tasks per status,
+    the `limit` teams and members with the most tasks and the `limit` most
+    recently updated tasks, computed server side in one aggregation.
+    """
+    return await dashboard_service.get_dashboard(limit)
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(limit: int = Query(20, ge=1)):
+    """
+    Most recent MongoDB commands slower than SLOW_QUERY_THRESHOLD_MS, with
+    the repository method that issued them and a summary of their
+    explain("executionStats") plan (null while the explain is running).
+    """
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "queries": slow_query_log.entries(limit),
+    }
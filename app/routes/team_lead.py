@@ -1,11 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional
 
 from app.models.task import (
     CreateTaskSchema,
     TaskModel,
     UpdateTaskSchema,
     AssignTaskSchema,
+    BulkCreateTasksSchema,
+    BulkUpdateTasksSchema,
+    BulkAssignTasksSchema,
+    BulkTaskResult,
+    BulkTaskResponse,
 )
 from app.models.team import (
     CreateTeamSchema,
@@ -19,9 +25,26 @@ from app.models.team import (
 from app.services.task_service import TaskService, get_task_service
 from app.services.team_member_service import TeamMemberService, get_team_member_service
 from app.services.team_service import TeamService, get_team_service
-from app.logging_config import logger
-from app.dependencies.auth import require_roles, get_current_user
+from app.logging_config import get_logger
+from app.dependencies.auth import (
+    current_membership_version,
+    get_current_user,
+    get_managed_team_ids,
+    require_roles,
+)
+from app.dependencies.etags import team_tasks_etag
+from app.events import TaskEventHub, get_task_event_hub, sse_response
+from app.dependencies.projection import response_projection
+from app.models.board import (
+    DEFAULT_BOARD_TASKS_PER_STATUS,
+    MAX_BOARD_TASKS_PER_STATUS,
+    TeamLeadBoardSchema,
+)
+from app.metrics import TimedJSONResponse
+from app.streaming import SSE_RESPONSES
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
+logger = get_logger(__name__)
 router = APIRouter(dependencies=[Depends(require_roles("team_lead"))])
 
 
@@ -32,14 +55,14 @@ async def create_task(
     team_service: TeamService = Depends(get_team_service),
     current_user: dict = Depends(get_current_user)
 ):
-    logger.info(f"[Team Lead] Creating task: {task}")
+    logger.debug("[Team Lead] Creating task: %s", task)
     
     # Verify the user manages the team
     if task.team_id:
-        team = await team_service.get_team(str(task.team_id))
-        if str(team.get("project_manager")) != current_user["user_id"]:
-             raise HTTPException(status_code=403, detail="You do not have permission to create tasks for this team.")
-    
+        await team_service.ensure_team_managed_by(
+            str(task.team_id), current_user["user_id"]
+        )
+
     return await task_service.create_task(task)
 
 
@@ -53,50 +76,194 @@ async def assign_task(
     team_service: TeamService = Depends(get_team_service),
     current_user: dict = Depends(get_current_user)
 ):
-    # Fetch task to check team ownership
-    existing_task = await task_service.get_task(task_id)
-    team_id = existing_task.get("team_id")
-    
-    if not team_id:
-         raise HTTPException(status_code=400, detail="Task is not associated with any team.")
+    # Ownership and assignee membership are checked by the update filter
+    teams = await team_service.get_managed_teams(
+        current_user["user_id"], {"member_ids": 1}
+    )
+    return await task_service.assign_task(task_id, task_assign, teams)
+
 
-    # Check permission
-    team = await team_service.get_team(str(team_id))
+def _team_error(team: Optional[dict], current_user: dict) -> Optional[tuple]:
+    """
+    Status code and detail when the current user cannot manage tasks of a team.
+    """
+    if team is None:
+        return 404, "Team not found"
     if str(team.get("project_manager")) != current_user["user_id"]:
-        raise HTTPException(status_code=403, detail="You do not have permission to assign this task.")
+        return 403, "You do not have permission to manage tasks of this team."
+    return None
+
+
+def _rejected(index: int, task_id: Optional[str], error: tuple) -> BulkTaskResult:
+    status_code, detail = error
+    return BulkTaskResult(
+        index=index, task_id=task_id, status_code=status_code, detail=detail
+    )
+
+
+def _bulk_response(results: List[BulkTaskResult]) -> BulkTaskResponse:
+    results.sort(key=lambda result: result.index)
+    failed = sum(1 for result in results if result.status_code >= 400)
+    return BulkTaskResponse(
+        results=results, succeeded=len(results) - failed, failed=failed
+    )
+
+
+@router.post(
+    "/tasks/bulk", response_model=BulkTaskResponse, response_model_by_alias=False
+)
+async def create_tasks_bulk(
+    payload: BulkCreateTasksSchema,
+    task_service: TaskService = Depends(get_task_service),
+    team_service: TeamService = Depends(get_team_service),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Create many tasks in one request.
+
+    Ownership is checked once per distinct team and the accepted tasks are
+    inserted with a single unordered insert_many. Each task gets its own
+    result; rejected or failed tasks do not stop the others.
+    """
+    logger.info("[Team Lead] Creating %d tasks in bulk", len(payload.tasks))
+    teams = await team_service.get_teams_by_ids(
+        {str(task.team_id) for task in payload.tasks if task.team_id},
+        {"project_manager": 1},
+    )
+    results, accepted = [], {}
+    for index, task in enumerate(payload.tasks):
+        error = task.team_id and _team_error(teams.get(str(task.team_id)), current_user)
+        if error:
+            results.append(_rejected(index, None, error))
+        else:
+            accepted[index] = task
+    if accepted:
+        results.extend(await task_service.create_tasks(accepted))
+    return _bulk_response(results)
+
+
+@router.put(
+    "/tasks/bulk", response_model=BulkTaskResponse, response_model_by_alias=False
+)
+async def update_tasks_bulk(
+    payload: BulkUpdateTasksSchema,
+    task_service: TaskService = Depends(get_task_service),
+    team_service: TeamService = Depends(get_team_service),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Update many tasks in one request with a single unordered bulk_write.
+
+    The current user must manage the task's team and, when the update moves
+    the task, the target team as well. Each write is restricted to the team
+    the task was checked in, so a task moved meanwhile is rejected.
+    """
+    existing = await task_service.get_tasks_by_ids(
+        [str(item.task_id) for item in payload.tasks], {"team_id": 1}
+    )
+    team_ids = {
+        str(team_id)
+        for team_id in [t.get("team_id") for t in existing.values()]
+        + [item.team_id for item in payload.tasks]
+        if team_id
+    }
+    teams = await team_service.get_teams_by_ids(team_ids, {"project_manager": 1})
+
+    results, accepted, scopes = [], {}, {}
+    for index, item in enumerate(payload.tasks):
+        task = existing.get(str(item.task_id))
+        if task is None:
+            error = (404, "Task not found")
+        else:
+            errors = [
+                _team_error(teams.get(str(team_id)), current_user)
+                for team_id in (task.get("team_id"), item.team_id)
+                if team_id
+            ]
+            error = next((e for e in errors if e), None)
+        if error:
+            results.append(_rejected(index, item.task_id, error))
+        else:
+            accepted[index] = item
+            scopes[index] = [task.get("team_id")]
+    if accepted:
+        results.extend(await task_service.update_tasks(accepted, scopes))
+    return _bulk_response(results)
 
-    # Check assignee membership
-    assignee_id = str(task_assign.assigned_to)
-    member_ids = [str(m) for m in team.get("member_ids", [])]
-    if assignee_id not in member_ids:
-            raise HTTPException(status_code=400, detail="Assignee is not a member of the task's team.")
 
-    try:
-        updated_task = await task_service.update_task(task_id, task_assign)
-        return updated_task
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+@router.post(
+    "/assign-tasks", response_model=BulkTaskResponse, response_model_by_alias=False
+)
+async def assign_tasks_bulk(
+    payload: BulkAssignTasksSchema,
+    task_service: TaskService = Depends(get_task_service),
+    team_service: TeamService = Depends(get_team_service),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Assign many tasks in one request. Applies the same checks as
+    /assign-task/{task_id} to every item, loading each task and team once.
+    Each write is restricted to the team the task was checked in.
+    """
+    existing = await task_service.get_tasks_by_ids(
+        [str(item.task_id) for item in payload.assignments], {"team_id": 1}
+    )
+    teams = await team_service.get_teams_by_ids(
+        {str(t["team_id"]) for t in existing.values() if t.get("team_id")},
+        {"project_manager": 1, "member_ids": 1},
+    )
+
+    results, accepted, scopes = [], {}, {}
+    for index, item in enumerate(payload.assignments):
+        task = existing.get(str(item.task_id))
+        team = task and task.get("team_id") and teams.get(str(task["team_id"]))
+        if task is None:
+            error = (404, "Task not found")
+        elif not task.get("team_id"):
+            error = (400, "Task is not associated with any team.")
+        else:
+            error = _team_error(team or None, current_user)
+            member_ids = {str(m) for m in (team or {}).get("member_ids", [])}
+            if not error and str(item.assigned_to) not in member_ids:
+                error = (400, "Assignee is not a member of the task's team.")
+        if error:
+            results.append(_rejected(index, item.task_id, error))
+        else:
+            accepted[index] = item
+            scopes[index] = [task["team_id"]]
+    if accepted:
+        results.extend(await task_service.update_tasks(accepted, scopes))
+    return _bulk_response(results)
 
 
 @router.get("/tasks", response_model=List[TaskModel])
 async def get_assigned_tasks(
-    current_user: dict = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    projection: Optional[Dict] = Depends(response_projection),
+    team_ids: List[str] = Depends(get_managed_team_ids),
+    etag: str = Depends(team_tasks_etag),
     task_service: TaskService = Depends(get_task_service),
-    team_service: TeamService = Depends(get_team_service)
 ):
     """
-    Retrieve all tasks for teams led by the current user.
+    Retrieve tasks for teams led by the current user, one page at a time.
+    The body stays a plain list; the continuation cursor is returned in the
+    X-Next-Cursor header and X-Has-More tells whether another page exists.
+    The rows are rendered as stored, without response_model validation.
+    Pages carry an ETag; a matching If-None-Match is answered with 304.
     """
-    # Get teams managed by user
-    teams = await team_service.get_team_by_project_manager(current_user["user_id"])
-    if not teams:
+    # Teams managed by the user come from the token claims
+    if not team_ids:
         return []
-        
-    team_ids = [str(t["_id"]) for t in teams]
-    
+
     # Get tasks for these teams
-    tasks = await task_service.get_tasks_by_team_ids(team_ids)
-    return tasks
+    page = await task_service.get_tasks_page_by_team_ids(
+        team_ids, limit, cursor, projection
+    )
+    headers = {"X-Has-More": str(page.has_more).lower(), "ETag": etag}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return TimedJSONResponse(page.items, headers=headers)
 
 
 @router.put("/update-task/{task_id}", response_model=TaskModel)
@@ -107,15 +274,12 @@ async def update_task(
     team_service: TeamService = Depends(get_team_service),
     current_user: dict = Depends(get_current_user)
 ):
-    # Verify ownership
-    existing_task = await task_service.get_task(task_id)
-    team_id = existing_task.get("team_id")
-    if team_id:
-        team = await team_service.get_team(str(team_id))
-        if str(team.get("project_manager")) != current_user["user_id"]:
-            raise HTTPException(status_code=403, detail="You do not have permission to update this task.")
-
-    updated_task = await task_service.update_task(task_id, task_update)
+    # Ownership is checked by the update filter; tasks without a team stay
+    # open to any team lead.
+    teams = await team_service.get_managed_teams(current_user["user_id"], {"_id": 1})
+    updated_task = await task_service.update_task(
+        task_id, task_update, set(teams) | {None}
+    )
     if not updated_task:
         raise HTTPException(status_code=404, detail="Task not found")
     return updated_task
@@ -135,12 +299,10 @@ async def add_team_members(
     team_member_service: TeamMemberService = Depends(get_team_member_service),
     current_user: dict = Depends(get_current_user)
 ):
-    # Verify permission
-    team = await team_service.get_team(team_id)
-    if str(team.get("project_manager")) != current_user["user_id"]:
-        raise HTTPException(status_code=403, detail="You do not have permission to add members to this team.")
-
-    updated_team = await team_service.add_team_members(team_id, members)
+    # Ownership is checked by the update filter
+    updated_team = await team_service.add_team_members(
+        team_id, members, current_user["user_id"]
+    )
     if not updated_team:
         raise HTTPException(status_code=400, detail="Adding team members failed or team size limit exceeded")
     return updated_team
@@ -149,9 +311,12 @@ async def add_team_members(
 @router.get("/team-member/{team_member_id}", response_model=ResponseTeamMemberSchema)
 async def get_team_member_by_id(
     team_member_id: str,
+    projection: Optional[Dict] = Depends(response_projection),
     team_member_service: TeamMemberService = Depends(get_team_member_service),
 ):
-    member = await team_member_service.get_team_member_by_id(team_member_id)
+    member = await team_member_service.get_team_member_by_id(
+        team_member_id, projection
+    )
     return member
 
 
@@ -198,15 +363,61 @@ async def get_team_members(
 @router.get("/teams", response_model=ResponseTeamCollection)
 async def get_teams(
     current_user: dict = Depends(get_current_user),
+    projection: Optional[Dict] = Depends(response_projection),
     team_service: TeamService = Depends(get_team_service),
 ):
     """
     Retrieve teams managed by the current user.
     """
-    teams = await team_service.get_team_by_project_manager(current_user["user_id"])
+    teams = await team_service.get_team_by_project_manager(
+        current_user["user_id"], projection
+    )
     converted_teams = []
     # Convert dicts from mongo to objects expected by schema if necessary, 
     # but ResponseTeamCollection expects 'teams' list of ResponseTeamSchema
     # TeamService.get_team_by_project_manager returns list of dicts.
     # ResponseTeamSchema can create from attributes/dict if configured.
     return ResponseTeamCollection(teams=teams)
+
+
+@router.get("/board", response_model=TeamLeadBoardSchema)
+async def get_board(
+    tasks_per_status: int = Query(
+        DEFAULT_BOARD_TASKS_PER_STATUS, ge=1, le=MAX_BOARD_TASKS_PER_STATUS
+    ),
+    current_user: dict = Depends(get_current_user),
+    team_service: TeamService = Depends(get_team_service),
+):
+    """
+    Retrieve the board of the current user: the teams they lead, the
+    members of those teams and the teams' tasks in one column per status,
+    each with its task count and most recently updated tasks. Served by a
+    single aggregation instead of one request per team.
+    """
+    return await team_service.get_board(current_user["user_id"], tasks_per_status)
+
+
+@router.get("/events", response_class=StreamingResponse, responses=SSE_RESPONSES)
+async def stream_task_events(
+    current_user: dict = Depends(get_current_user),
+    team_ids: List[str] = Depends(get_managed_team_ids),
+    team_member_service: TeamMemberService = Depends(get_team_member_service),
+    hub: TaskEventHub = Depends(get_task_event_hub),
+):
+    """
+    Push changes to the tasks of the teams led by the current user as
+    Server-Sent Events (`task`, `remove` and `reset`, see app/events.py),
+    instead of polling /tasks. The teams are those of the user when the
+    stream is opened; the stream ends with a `reset` once they change, and
+    the client reconnects to get the new ones.
+    """
+    user_id = current_user["user_id"]
+    version = await current_membership_version(user_id, team_member_service)
+
+    async def teams_unchanged() -> bool:
+        current = await current_membership_version(user_id, team_member_service)
+        return current == version
+
+    return sse_response(
+        hub, hub.subscribe(team_ids=team_ids), still_valid=teams_unchanged
+    )
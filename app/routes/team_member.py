@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional
 from app.models.task import TaskModel, UpdateTaskSchema
 from app.models.team import (
     CreateTeamMemberSchema,
@@ -8,18 +9,40 @@ from app.models.team import (
 )
 from app.services.task_service import TaskService, get_task_service
 from app.services.team_member_service import TeamMemberService, get_team_member_service
-from app.logging_config import logger
-from app.dependencies.auth import require_roles
+from app.logging_config import get_logger
+from app.dependencies.auth import get_current_user, require_roles
+from app.dependencies.projection import response_projection
+from app.events import TaskEventHub, get_task_event_hub, sse_response
+from app.metrics import TimedJSONResponse
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.streaming import SSE_RESPONSES
 
+logger = get_logger(__name__)
 router = APIRouter(dependencies=[Depends(require_roles("developer"))])
 
 
 @router.get("/tasks/", response_model=List[TaskModel])
 async def get_tasks(
-    assigned_to: str, task_service: TaskService = Depends(get_task_service)
+    assigned_to: str,
+    projection: Optional[Dict] = Depends(response_projection),
+    task_service: TaskService = Depends(get_task_service),
+):
+    # assigned_to should be passed as ObjectId string. The rows are rendered
+    # as stored, without response_model validation.
+    tasks = await task_service.get_tasks_by_member(assigned_to, projection)
+    return TimedJSONResponse(tasks)
+
+
+@router.get("/events", response_class=StreamingResponse, responses=SSE_RESPONSES)
+async def stream_task_events(
+    current_user: dict = Depends(get_current_user),
+    hub: TaskEventHub = Depends(get_task_event_hub),
 ):
-    # assigned_to should be passed as ObjectId string
-    return await task_service.get_tasks_by_member(assigned_to)
+    """
+    Push changes to the tasks assigned to the current user as Server-Sent
+    Events (`task`, `remove` and `reset`, see app/events.py).
+    """
+    return sse_response(hub, hub.subscribe(assigned_to=current_user["user_id"]))
 
 
 @router.put("/tasks/{task_id}", response_model=TaskModel)
@@ -43,7 +66,7 @@ async def create_team_member(
     member: CreateTeamMemberSchema,
     team_member_service: TeamMemberService = Depends(get_team_member_service),
 ):
-    logger.info(f"[Team Member] Creating team member: {member}")
+    logger.debug("[Team Member] Creating team member: %s", member.email)
     created_member = await team_member_service.create_team_member(member)
     if not created_member:
         logger.error("Team member creation failed in route.")
@@ -57,16 +80,22 @@ async def create_team_member(
     response_model_by_alias=False,
 )
 async def get_all_team_members(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    projection: Optional[Dict] = Depends(response_projection),
     team_member_service: TeamMemberService = Depends(get_team_member_service),
 ):
-    members = await team_member_service.get_all_team_members()
-    return ResponseTeamMembersCollection(members=members)
+    page = await team_member_service.get_team_members_page(limit, cursor, projection)
+    return ResponseTeamMembersCollection(
+        members=page.items, next_cursor=page.next_cursor, has_more=page.has_more
+    )
 
 
 @router.get("/team-member/{team_member_id}", response_model=ResponseTeamMemberSchema)
 async def get_team_member_by_id(
     team_member_id: str,
+    projection: Optional[Dict] = Depends(response_projection),
     team_member_service: TeamMemberService = Depends(get_team_member_service),
 ):
-    member = await team_member_service.get_team_member_by_id(team_member_id)
+    member = await team_member_service.get_team_member_by_id(team_member_id, projection)
     return member
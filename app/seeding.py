@@ -1,83 +1,345 @@
-from pymongo import MongoClient
-from faker import Faker
-from bson import ObjectId
+"""
+Synthetic data generator for development and load testing.
+
+    python -m app.seeding --members 100000 --tasks 10000000 --seed 7 --drop
+
+Documents are written in the shape the repositories store them (ObjectId
+references, TaskStatus values, membership versions), so the views, the
+materialized team_tasks rows and the API work on the generated data as is.
+The same seed always produces the same data.
+"""
+
+import argparse
+import asyncio
 import random
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional
+
+from bson import ObjectId
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.database.materialized_views import TeamTasksMaterializedView
+from app.database.migrations import MIGRATIONS, mark_applied
+from app.database.versions import (
+    TASKS_SCOPE,
+    TEAM_MEMBERS_SCOPE,
+    TEAMS_SCOPE,
+    VersionCounters,
+)
+from app.database.views import create_indexes, create_views
+from app.logging_config import logger
+from app.models.task import TaskStatus
+from app.services.team_service import MAX_TEAM_SIZE
 from app.utils import get_password_hash
+from config.database import close_mongo_connection, get_database
+
+# Fixed reference time so generated dates do not depend on when the
+# generator runs.
+REFERENCE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+HISTORY_DAYS = 365
+
+ROLE_WEIGHTS = {"developer": 80, "team_lead": 15, "project_manager": 5}
+STATUS_WEIGHTS = {
+    TaskStatus.COMPLETED: 45,
+    TaskStatus.IN_PROGRESS: 20,
+    TaskStatus.PENDING: 15,
+    TaskStatus.ASSIGNED: 12,
+    TaskStatus.UN_ASSIGNED: 8,
+}
+# Most teams are full or nearly full, a few are small.
+TEAM_SIZE_WEIGHTS = {size: size * size for size in range(1, MAX_TEAM_SIZE + 1)}
+# Exponent of the Zipf distribution of tasks over teams: a few teams hold
+# most of the tasks, as in real workloads.
+TEAM_ACTIVITY_SKEW = 1.1
+
+# fmt: off
+FIRST_NAMES = [
+    "Ava", "Ben", "Chloe", "Dev", "Elena", "Farid", "Grace", "Hiro", "Isla",
+    "Jonas", "Kira", "Liam", "Maya", "Noah", "Olga", "Priya", "Quinn", "Rosa",
+    "Sami", "Tara", "Uma", "Victor", "Wen", "Xavi", "Yara", "Zane",
+]
+LAST_NAMES = [
+    "Adams", "Bose", "Costa", "Diaz", "Evans", "Fischer", "Garcia", "Haddad",
+    "Ito", "Jensen", "Kumar", "Lopez", "Moreau", "Nakamura", "Okafor", "Patel",
+    "Rossi", "Silva", "Tanaka", "Urban", "Varga", "Weber", "Young", "Zhou",
+]
+TEAM_WORDS = [
+    "Amber", "Cobalt", "Crimson", "Indigo", "Jade", "Onyx", "Saffron", "Teal",
+    "Falcon", "Harbor", "Nimbus", "Orbit", "Pioneer", "Summit", "Vector",
+]
+TASK_VERBS = [
+    "Add", "Fix", "Refactor", "Document", "Test", "Review", "Migrate", "Profile",
+    "Design", "Deploy",
+]
+TASK_OBJECTS = [
+    "login flow", "task board", "search API", "billing report", "audit log",
+    "team dashboard", "export job", "cache layer", "notification service",
+    "onboarding wizard", "permissions model", "CI pipeline",
+]
+# fmt: on
+
+# Leading byte of generated ObjectIds, one per collection.
+_ID_KINDS = {"team_members": 1, "teams": 2, "tasks": 3}
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    """
+    Scale and shape of the generated data.
+    """
+
+    members: int = 50
+    teams: Optional[int] = None
+    tasks: int = 200
+    seed: int = 42
+    batch_size: int = 5000
+    concurrency: int = 4
+    password: str = "password123"
+
+    @property
+    def team_count(self) -> int:
+        if self.teams is not None:
+            return self.teams
+        return max(1, self.members // 4)
+
+
+def _object_id(kind: str, n: int) -> ObjectId:
+    """
+    Deterministic ObjectId, increasing with `n` so _id order matches
+    generation order.
+    """
+    timestamp = int(REFERENCE_TIME.timestamp()) - HISTORY_DAYS * 86400
+    return ObjectId(struct.pack(">IBxxxI", timestamp, _ID_KINDS[kind], n))
+
+
+def _weighted(rng: random.Random, weights: Dict, k: int) -> List:
+    return rng.choices(list(weights), weights=list(weights.values()), k=k)
+
+
+def build_members(
+    rng: random.Random, config: SeedConfig, hashed_password: str
+) -> List[Dict]:
+    """
+    Generate team member documents. `teams` is filled by build_teams.
+    """
+    roles = _weighted(rng, ROLE_WEIGHTS, config.members)
+    members = []
+    for n, role in enumerate(roles):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        members.append(
+            {
+                "_id": _object_id("team_members", n),
+                "name": f"{first} {last}",
+                "email": f"{first}.{last}.{n}@example.com".lower(),
+                "role": role,
+                "hashed_password": hashed_password,
+                "teams": [],
+                "membership_version": 0,
+            }
+        )
+    return members
+
+
+def build_teams(
+    rng: random.Random, config: SeedConfig, members: List[Dict]
+) -> List[Dict]:
+    """
+    Generate teams managed by team leads and staffed with developers, and
+    record each membership on the member documents.
+    """
+    by_role: Dict[str, List[Dict]] = {role: [] for role in ROLE_WEIGHTS}
+    for member in members:
+        by_role[member["role"]].append(member)
+    leads = by_role["team_lead"] or members
+    developers = by_role["developer"] or members
+
+    sizes = _weighted(rng, TEAM_SIZE_WEIGHTS, config.team_count)
+    # Walk a shuffled pool so every developer joins a team before anyone
+    # joins a second one.
+    pool = developers[:]
+    rng.shuffle(pool)
+    position = 0
+
+    teams = []
+    for n, size in enumerate(sizes):
+        lead = leads[n % len(leads)]
+        team_members = []
+        for _ in range(min(size, len(pool))):
+            if position == len(pool):
+                rng.shuffle(pool)
+                position = 0
+            candidate = pool[position]
+            position += 1
+            if candidate not in team_members:
+                team_members.append(candidate)
+        team_id = _object_id("teams", n)
+        for member in team_members:
+            member["teams"].append(team_id)
+        teams.append(
+            {
+                "_id": team_id,
+                "name": f"{rng.choice(TEAM_WORDS)} {rng.choice(TEAM_WORDS)} {n}",
+                "project_manager": lead["_id"],
+                "member_ids": [member["_id"] for member in team_members],
+            }
+        )
+    return teams
+
+
+def iter_task_batches(
+    rng: random.Random, config: SeedConfig, teams: List[Dict]
+) -> Iterator[List[Dict]]:
+    """
+    Generate task documents in batches of `config.batch_size`, spread over
+    the teams following a Zipf distribution.
+    """
+    team_weights = list(
+        accumulate(1 / (rank + 1) ** TEAM_ACTIVITY_SKEW for rank in range(len(teams)))
+    )
+    ranked_teams = teams[:]
+    rng.shuffle(ranked_teams)
+    history = HISTORY_DAYS * 86400
+
+    for start in range(0, config.tasks, config.batch_size):
+        count = min(config.batch_size, config.tasks - start)
+        batch_teams = rng.choices(ranked_teams, cum_weights=team_weights, k=count)
+        statuses = _weighted(rng, STATUS_WEIGHTS, count)
+        batch = []
+        for offset, (team, status) in enumerate(zip(batch_teams, statuses)):
+            n = start + offset
+            created_at = REFERENCE_TIME - timedelta(seconds=rng.randrange(history))
+            age = int((REFERENCE_TIME - created_at).total_seconds())
+            updated_at = created_at + timedelta(seconds=rng.randrange(age + 1))
+            assignee = None
+            if status != TaskStatus.UN_ASSIGNED and team["member_ids"]:
+                assignee = rng.choice(team["member_ids"])
+            batch.append(
+                {
+                    "_id": _object_id("tasks", n),
+                    "title": f"{rng.choice(TASK_VERBS)} {rng.choice(TASK_OBJECTS)}",
+                    "description": f"Generated task {n} for {team['name']}.",
+                    "status": status.value,
+                    "assigned_to": assignee,
+                    "team_id": team["_id"],
+                    "created_by": team["project_manager"],
+                    "created_at": created_at,
+                    "updated_at": updated_at,
+                }
+            )
+        yield batch
+
+
+async def _insert_batches(collection, batches, concurrency: int) -> int:
+    semaphore = asyncio.Semaphore(concurrency)
+    pending = set()
+    inserted = 0
+
+    async def insert(batch):
+        async with semaphore:
+            await collection.insert_many(batch, ordered=False)
+        return len(batch)
+
+    for batch in batches:
+        # Bound the generated-but-unwritten batches held in memory.
+        if len(pending) >= concurrency:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            inserted += sum(task.result() for task in done)
+            logger.info("%s: %s documents inserted", collection.name, inserted)
+        pending.add(asyncio.ensure_future(insert(batch)))
+    if pending:
+        done, _ = await asyncio.wait(pending)
+        inserted += sum(task.result() for task in done)
+    return inserted
+
+
+def _chunks(documents: List[Dict], size: int) -> Iterator[List[Dict]]:
+    for start in range(0, len(documents), size):
+        yield documents[start : start + size]
+
+
+async def seed(db: AsyncDatabase, config: SeedConfig, drop: bool = False) -> Dict:
+    """
+    Generate and insert members, teams and tasks.
+
+    Args:
+        db (AsyncDatabase): Target database.
+        config (SeedConfig): Scale, seed and batching.
+        drop (bool): Empty the collections first.
+
+    Returns:
+        dict: Number of documents inserted per collection.
+    """
+    rng = random.Random(config.seed)
+    if drop:
+        for name in ("team_members", "teams", "tasks", "team_tasks"):
+            await db[name].delete_many({})
+
+    # One hash for every generated member: hashing is deliberately slow.
+    members = build_members(rng, config, get_password_hash(config.password))
+    teams = build_teams(rng, config, members)
+    counts = {
+        "team_members": await _insert_batches(
+            db["team_members"], _chunks(members, config.batch_size), config.concurrency
+        ),
+        "teams": await _insert_batches(
+            db["teams"], _chunks(teams, config.batch_size), config.concurrency
+        ),
+        "tasks": await _insert_batches(
+            db["tasks"], iter_task_batches(rng, config, teams), config.concurrency
+        ),
+    }
+    # Cached list responses of the previous data must not be served again.
+    await VersionCounters(db).bump([TEAMS_SCOPE, TEAM_MEMBERS_SCOPE, TASKS_SCOPE])
+
+    # References are generated as ObjectId already.
+    await mark_applied(db, MIGRATIONS)
+    return counts
+
+
+async def _main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic data.")
+    parser.add_argument("--members", type=int, default=SeedConfig.members)
+    parser.add_argument("--teams", type=int, default=None)
+    parser.add_argument("--tasks", type=int, default=SeedConfig.tasks)
+    parser.add_argument("--seed", type=int, default=SeedConfig.seed)
+    parser.add_argument("--batch-size", type=int, default=SeedConfig.batch_size)
+    parser.add_argument("--concurrency", type=int, default=SeedConfig.concurrency)
+    parser.add_argument(
+        "--drop", action="store_true", help="Empty the collections first."
+    )
+    parser.add_argument(
+        "--skip-rebuild",
+        action="store_true",
+        help="Do not rebuild the materialized team_tasks rows.",
+    )
+    args = parser.parse_args(argv)
+    config = SeedConfig(
+        members=args.members,
+        teams=args.teams,
+        tasks=args.tasks,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+    )
+
+    db = get_database()
+    try:
+        counts = await seed(db, config, drop=args.drop)
+        logger.info("Seeded %s", counts)
+        # Indexes are built after the load, which is faster than
+        # maintaining them during it.
+        await create_views(db)
+        await create_indexes(db)
+        if not args.skip_rebuild:
+            await TeamTasksMaterializedView(db).rebuild()
+    finally:
+        await close_mongo_connection()
+
 
-fake = Faker()
-client = MongoClient("mongodb://localhost:27017/")
-db = client["task_management_dev"]
-
-# Clear collections
-db.users.delete_many({})
-db.teams.delete_many({})
-db.tasks.delete_many({})
-
-roles = ["project_manager", "team_lead", "developer"]
-team_names = [f"{fake.color_name()} Team" for _ in range(10)]
-
-# Step 1: Generate Users
-user_ids = []
-users = []
-for _ in range(50):  # 50 users
-    role = random.choice(roles)
-    user_id = ObjectId()
-    user_ids.append(user_id)
-    users.append({
-        "_id": user_id,
-        "name": fake.name(),
-        "email": fake.email(),
-        "role": role,
-        "hashed_password": get_password_hash("password123"),
-        "teams": []  # to be filled later
-    })
-db.team_members.insert_many(users)
-
-# Step 2: Generate Teams with Members
-team_ids = []
-teams = []
-for name in team_names:
-    team_id = ObjectId()
-    team_ids.append(team_id)
-    members = random.sample(user_ids, k=random.randint(5, 10))
-    pm_id = random.choice(members)
-
-    teams.append({
-        "_id": team_id,
-        "name": name,
-        "project_manager": pm_id,
-        "members": [
-            { "user_id": m_id, "role": random.choice(roles) }
-            for m_id in members
-        ]
-    })
-
-    # Add team ID to each member's `teams` field
-    for m_id in members:
-        db.team_members.update_one({ "_id": m_id }, { "$addToSet": { "teams": str(team_id) } })
-
-db.teams.insert_many(teams)
-
-# Step 3: Generate Tasks
-tasks = []
-for _ in range(200):
-    team_id = random.choice(team_ids)
-    team = db.teams.find_one({ "_id": team_id })
-    member_ids = [m["user_id"] for m in team["members"]]
-    created_by = random.choice(member_ids)
-    assigned_to = random.choice(member_ids)
-
-    tasks.append({
-        "_id": ObjectId(),
-        "title": fake.sentence(nb_words=6),
-        "description": fake.paragraph(),
-        "team_id": str(team_id),  # stored as string to demonstrate type conversion later
-        "assigned_to": assigned_to,
-        "created_by": created_by,
-        "status": random.choice(["open", "in_progress", "completed"]),
-        "created_at": fake.date_time_this_year(),
-        "updated_at": fake.date_time_this_year()
-    })
-
-db.tasks.insert_many(tasks)
-print("✔️ Seeded users, teams, and tasks successfully!")
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(_main())
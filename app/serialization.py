@@ -0,0 +1,70 @@
+"""
+JSON serialization of responses.
+
+Responses are rendered with orjson. List endpoints over collections the
+application writes itself can also skip Pydantic entirely: those documents
+were validated when they were stored, so `trusted_rows` only picks the
+response model's fields out of each document and `dumps` encodes the
+ObjectIds and datetimes left in them, instead of building a model per row
+and having FastAPI validate the list again against the response_model.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple, Type
+
+import orjson
+from bson import ObjectId
+from pydantic import BaseModel
+
+# Datetimes read from MongoDB are naive UTC; write them with a +00:00 offset
+# like the models' serializers do.
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as JSON, writing ObjectIds as strings.
+    """
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+@lru_cache(maxsize=None)
+def _row_keys(model: Type[BaseModel], by_alias: bool) -> Tuple[Tuple[str, str], ...]:
+    """
+    (response key, document key) pairs of a model's fields, in field order.
+    Documents are stored by alias (e.g. `_id`).
+    """
+    return tuple(
+        ((field.alias or name) if by_alias else name, field.alias or name)
+        for name, field in model.model_fields.items()
+    )
+
+
+def trusted_rows(
+    model: Type[BaseModel], documents: Iterable[Dict], by_alias: bool = True
+) -> List[Dict]:
+    """
+    Shape stored documents as rows of a response model without validating
+    them.
+
+    Only the model's fields are kept, missing ones as None. Values are left
+    as stored, so this is for models whose fields hold plain JSON values,
+    ObjectIds or datetimes, and for documents this application wrote.
+
+    Args:
+        model (type[BaseModel]): Response model of the rows.
+        documents (Iterable[dict]): Documents read from MongoDB.
+        by_alias (bool): Key the rows by field alias, as FastAPI does by
+            default, rather than by field name.
+
+    Returns:
+        list[dict]: Rows ready for `dumps`.
+    """
+    keys = _row_keys(model, by_alias)
+    return [{out: document.get(key) for out, key in keys} for document in documents]
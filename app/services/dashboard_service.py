@@ -0,0 +1,90 @@
+import asyncio
+from typing import Dict, Optional
+
+from fastapi import Depends
+
+from app.database.materialized_views import TeamTasksMaterializedView
+from app.database.versions import VersionCounters
+from app.dependencies.services import get_services
+from app.logging_config import get_logger
+from app.models.dashboard import DashboardSchema, DashboardTotals
+from app.models.task import TaskStatus
+from app.repositories.task_repository import TaskRepository
+from app.repositories.team_member_repository import TeamMemberRepository
+from app.repositories.team_repository import TeamRepository
+
+logger = get_logger(__name__)
+
+
+def _count(facet: list) -> int:
+    return facet[0]["count"] if facet else 0
+
+
+class DashboardService:
+    def __init__(
+        self,
+        task_repository: TaskRepository,
+        team_repository: TeamRepository,
+        team_member_repository: TeamMemberRepository,
+        team_tasks: Optional[TeamTasksMaterializedView] = None,
+        versions: Optional[VersionCounters] = None,
+    ):
+        self.task_repository = task_repository
+        self.team_repository = team_repository
+        self.team_member_repository = team_member_repository
+        # The instances the repositories write through.
+        self.team_tasks = team_tasks or task_repository.team_tasks
+        self.versions = versions or task_repository.versions
+        logger.debug("DashboardService initialized.")
+
+    async def get_dashboard(self, limit: int) -> DashboardSchema:
+        """
+        Build the project manager dashboard.
+
+        The task statistics come from one aggregation over tasks; the team
+        and member totals are read from collection metadata at the same time.
+
+        Args:
+            limit (int): Number of top teams, top members and recent tasks.
+
+        Returns:
+            DashboardSchema: Totals, the task count per status, the busiest
+            teams and members, and the most recently updated tasks.
+        """
+        stats, teams, members = await asyncio.gather(
+            self.task_repository.get_dashboard(limit),
+            self.team_repository.count(),
+            self.team_member_repository.count(),
+        )
+        # Every status is listed, with 0 when no task has it.
+        tasks_by_status: Dict[str, int] = dict.fromkeys(
+            (status.value for status in TaskStatus), 0
+        )
+        for row in stats["by_status"]:
+            if row["_id"] is not None:
+                tasks_by_status[row["_id"]] = row["count"]
+        return DashboardSchema(
+            totals=DashboardTotals(
+                tasks=_count(stats["total"]),
+                teams=teams,
+                members=members,
+                unassigned_tasks=_count(stats["unassigned"]),
+            ),
+            tasks_by_status=tasks_by_status,
+            top_teams=stats["top_teams"],
+            top_members=stats["top_members"],
+            recent_tasks=stats["recent_tasks"],
+        )
+
+
+def get_dashboard_service(services=Depends(get_services)) -> DashboardService:
+    """
+    Dependency provider for DashboardService.
+
+    Args:
+        services (ServiceContainer): The application's service container.
+
+    Returns:
+        DashboardService: The application-scoped service instance.
+    """
+    return services.dashboard_service
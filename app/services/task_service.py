@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
-from typing import Dict, List, Union
-from pymongo.asynchronous.database import AsyncDatabase
+from collections.abc import Collection
+from typing import Dict, List, Optional, Union
 from fastapi import Depends, HTTPException
 from app.repositories.task_repository import TaskRepository
 from app.models.task import (
@@ -8,16 +8,21 @@ from app.models.task import (
     CreateTaskSchema,
     UpdateTaskSchema,
     AssignTaskSchema,
+    BulkTaskResult,
 )
-from config.database import get_database
-from app.logging_config import logger
-import asyncio
+from app.dependencies.services import get_services
+from app.logging_config import get_logger
+from app.pagination import Page
+from app.serialization import trusted_rows
+from pymongo.asynchronous.cursor import AsyncCursor
+
+logger = get_logger(__name__)
 
 
 class TaskService:
     def __init__(self, task_repository):
         self.task_repository = task_repository
-        logger.info("TaskService initialized.")
+        logger.debug("TaskService initialized.")
 
     async def create_task(self, task_create: CreateTaskSchema) -> Dict:
         """
@@ -32,30 +37,143 @@ class TaskService:
         Raises:
             HTTPException: If creation fails.
         """
-        task_dict = task_create.model_dump(exclude_unset=True)
-        task_dict["created_at"] = task_dict.get(
-            "created_at", datetime.now(timezone.utc)
-        )
-        task_dict["updated_at"] = task_dict.get(
-            "updated_at", datetime.now(timezone.utc)
-        )
-        task = TaskModel(**task_dict)
+        task = self._new_task(task_create)
         task_document = task.model_dump(by_alias=True)
-        logger.info(f"Creating task: {task_dict}")
+        logger.debug("Creating task: %s", task_document)
         result = await self.task_repository.create(task_document)
         if result is not None:
-            logger.info(f"Task created successfully: {task_document}")
+            logger.info("Task created successfully: %s", task.task_id)
             return task.model_dump(by_alias=True)
         else:
             logger.error("Task creation failed")
             raise HTTPException(status_code=400, detail="Task creation failed")
 
-    async def get_task(self, task_id: str) -> Dict:
+    @staticmethod
+    def _new_task(task_create: CreateTaskSchema) -> TaskModel:
+        task_dict = task_create.model_dump(exclude_unset=True)
+        task_dict["created_at"] = task_dict.get(
+            "created_at", datetime.now(timezone.utc)
+        )
+        task_dict["updated_at"] = task_dict.get(
+            "updated_at", datetime.now(timezone.utc)
+        )
+        return TaskModel(**task_dict)
+
+    async def create_tasks(
+        self, tasks: Dict[int, CreateTaskSchema]
+    ) -> List[BulkTaskResult]:
+        """
+        Create many tasks with a single unordered insert.
+
+        Args:
+            tasks (Dict[int, CreateTaskSchema]): Tasks keyed by their index
+                in the bulk request.
+
+        Returns:
+            List[BulkTaskResult]: One result per task; a failed insert does
+            not stop the others.
+        """
+        indexes = list(tasks)
+        documents = [
+            self._new_task(tasks[index]).model_dump(by_alias=True) for index in indexes
+        ]
+        logger.info("Creating %d tasks", len(documents))
+        errors = await self.task_repository.create_many(documents)
+        return [
+            BulkTaskResult(
+                index=index,
+                task_id=document["_id"],
+                status_code=400 if position in errors else 200,
+                detail=errors.get(position),
+            )
+            for position, (index, document) in enumerate(zip(indexes, documents))
+        ]
+
+    async def update_tasks(
+        self,
+        updates: Dict[int, Union[UpdateTaskSchema, AssignTaskSchema]],
+        scopes: Optional[Dict[int, Collection]] = None,
+    ) -> List[BulkTaskResult]:
+        """
+        Update many tasks with a single unordered bulk write.
+
+        Args:
+            updates (Dict[int, UpdateTaskSchema]): Updates keyed by their index
+                in the bulk request; each carries the `task_id` it applies to.
+            scopes (Dict[int, Collection], optional): Teams each update's task
+                must still be in, by index, as checked by the caller. The
+                check is part of the write, so a task moved in between is
+                reported instead of updated.
+
+        Returns:
+            List[BulkTaskResult]: One result per update.
+        """
+        scopes = scopes or {}
+        results = []
+        writes = []
+        for index, task_update in updates.items():
+            document = task_update.model_dump(exclude_unset=True, exclude={"task_id"})
+            if document:
+                writes.append((index, str(task_update.task_id), document))
+            else:
+                results.append(
+                    BulkTaskResult(
+                        index=index,
+                        task_id=task_update.task_id,
+                        status_code=400,
+                        detail="No changes provided",
+                    )
+                )
+        if writes:
+            logger.info("Updating %d tasks", len(writes))
+            outcome = await self.task_repository.update_many(
+                [
+                    (task_id, document, scopes.get(index))
+                    for index, task_id, document in writes
+                ]
+            )
+            for position, (index, task_id, _) in enumerate(writes):
+                status_code, detail = 200, None
+                if position in outcome.errors:
+                    status_code, detail = 400, outcome.errors[position]
+                elif position in outcome.missing:
+                    status_code, detail = 404, "Task not found"
+                elif position in outcome.out_of_scope:
+                    status_code = 403
+                    detail = "You do not have permission to manage tasks of this team."
+                results.append(
+                    BulkTaskResult(
+                        index=index,
+                        task_id=task_id,
+                        status_code=status_code,
+                        detail=detail,
+                    )
+                )
+        return results
+
+    async def get_tasks_by_ids(
+        self, task_ids: List[str], projection: Optional[Dict] = None
+    ) -> Dict[str, Dict]:
+        """
+        Get several tasks in one query.
+
+        Args:
+            task_ids (List[str]): Task IDs.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            Dict[str, dict]: The tasks found, keyed by their ID as string.
+        """
+        tasks = await self.task_repository.get_many(task_ids, projection)
+        return {str(task["_id"]): task for task in tasks}
+
+    async def get_task(self, task_id: str, projection: Optional[Dict] = None) -> Dict:
         """
         Get a task by ID.
 
         Args:
             task_id (str): Task ID.
+            projection (dict, optional): Fields to return; all when omitted.
 
         Returns:
             dict: Task details.
@@ -63,14 +181,17 @@ class TaskService:
         Raises:
             HTTPException: If not found.
         """
-        task = await self.task_repository.get(task_id)
+        task = await self.task_repository.get(task_id, projection)
         if task:
             return task
         else:
             raise HTTPException(status_code=404, detail="Task not found")
 
     async def update_task(
-        self, task_id: str, task_update: Union[UpdateTaskSchema, AssignTaskSchema]
+        self,
+        task_id: str,
+        task_update: Union[UpdateTaskSchema, AssignTaskSchema],
+        team_ids: Optional[Collection[Optional[str]]] = None,
     ) -> Dict:
         """
         Update a task by ID.
@@ -78,22 +199,90 @@ class TaskService:
         Args:
             task_id (str): Task ID.
             task_update (UpdateTaskSchema): Fields to update.
+            team_ids (Collection[str], optional): Teams the caller may change
+                tasks of, None standing for tasks without a team. The task
+                and, when moved, its new team must be among them.
 
         Returns:
-            dict: Updated task.
+            dict: Updated task, unchanged if the update was a no-op.
 
         Raises:
-            HTTPException: If not found or no changes.
+            HTTPException: If not found (404) or outside of `team_ids` (403).
         """
         document = task_update.model_dump(exclude_unset=True)
-        updated = await self.task_repository.update(task_id, document)
-        if updated:
-            updated_task = await self.task_repository.get(task_id)
-            return updated_task
-        else:
+        if "team_id" in document and not _in_teams(document["team_id"], team_ids):
+            raise HTTPException(
+                status_code=403,
+                detail="You do not have permission to move tasks to this team.",
+            )
+        task = await self._update_and_get(task_id, document, team_ids)
+        if not _in_teams(task.get("team_id"), team_ids):
+            raise HTTPException(
+                status_code=403,
+                detail="You do not have permission to update this task.",
+            )
+        return task
+
+    async def assign_task(
+        self, task_id: str, task_assign: AssignTaskSchema, teams: Dict[str, Dict]
+    ) -> Dict:
+        """
+        Assign a task to a member of its team, within the caller's teams.
+
+        The write is restricted to tasks of the given teams that have the
+        assignee as a member, so authorization and update are one atomic
+        call. The task is only re-read to explain a rejected write.
+
+        Args:
+            task_id (str): Task ID.
+            task_assign (AssignTaskSchema): Assignee and optional status.
+            teams (Dict[str, dict]): Teams managed by the caller, keyed by ID,
+                with their member_ids.
+
+        Returns:
+            dict: Updated task.
+
+        Raises:
+            HTTPException: If the task is not found (404), has no team or the
+                assignee is not in its team (400), or the caller does not
+                manage its team (403).
+        """
+        assignee = str(task_assign.assigned_to)
+        eligible = {
+            team_id
+            for team_id, team in teams.items()
+            if assignee in {str(m) for m in team.get("member_ids", [])}
+        }
+        document = task_assign.model_dump(exclude_unset=True)
+        task = await self._update_and_get(task_id, document, eligible)
+        team_id = task.get("team_id")
+        if not team_id:
+            raise HTTPException(
+                status_code=400, detail="Task is not associated with any team."
+            )
+        if str(team_id) not in teams:
             raise HTTPException(
-                status_code=404, detail="Task not found or no changes made"
+                status_code=403,
+                detail="You do not have permission to assign this task.",
             )
+        if str(team_id) not in eligible:
+            raise HTTPException(
+                status_code=400, detail="Assignee is not a member of the task's team."
+            )
+        return task
+
+    async def _update_and_get(
+        self,
+        task_id: str,
+        document: Dict,
+        team_ids: Optional[Collection[Optional[str]]] = None,
+    ) -> Dict:
+        result = await self.task_repository.update_and_get(task_id, document, team_ids)
+        if not result.matched:
+            raise HTTPException(status_code=404, detail="Task not found")
+        if not result.modified:
+            logger.info("No changes made to task %s", task_id)
+        return result.document
 
     async def delete_task(self, task_id: str) -> Dict:
         """
@@ -129,33 +318,102 @@ class TaskService:
             raise HTTPException(status_code=404, detail="No tasks found")
         return tasks
 
-    async def get_tasks_by_member(self, assigned_to: str) -> List[Dict]:
+    async def get_tasks_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        projection: Optional[Dict] = None,
+    ) -> Page:
+        """
+        Get one page of tasks.
+
+        Args:
+            limit (int): Page size.
+            cursor (str, optional): Cursor returned with the previous page.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            Page: Tasks and the cursor of the next page.
+
+        Raises:
+            HTTPException: If the cursor is invalid or there are no tasks.
+        """
+        try:
+            page = await self.task_repository.get_page(limit, cursor, projection)
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=str(ve))
+        if not page.items and cursor is None:
+            raise HTTPException(status_code=404, detail="No tasks found")
+        return page
+
+    async def get_all_tasks_cursor(
+        self, batch_size: int, projection: Optional[Dict] = None
+    ) -> AsyncCursor:
+        """
+        Get a cursor over all tasks for streaming responses.
+
+        Args:
+            batch_size (int): Rows fetched per round trip.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            AsyncCursor: Cursor for the team task rows.
+        """
+        return await self.task_repository.get_all_cursor(batch_size, projection)
+
+    async def get_tasks_by_member(
+        self, assigned_to: str, projection: Optional[Dict] = None
+    ) -> List[Dict]:
         """
         Get all tasks assigned to a member.
 
         Args:
             assigned_to (str): Member ObjectId as string.
+            projection (dict, optional): Fields to return.
 
         Returns:
-            list[dict]: Tasks assigned to the member.
+            list[dict]: Tasks assigned to the member, as unvalidated TaskModel
+                rows (see app.serialization.trusted_rows).
 
         Raises:
             HTTPException: If none found.
         """
-        tasks = await self.task_repository.get_tasks_by_member(assigned_to)
+        tasks = await self.task_repository.get_tasks_by_member(assigned_to, projection)
         if not tasks:
             raise HTTPException(
                 status_code=404, detail="No tasks found for this member"
             )
-        return [TaskModel(**task).model_dump(by_alias=True) for task in tasks]
+        return trusted_rows(TaskModel, tasks)
 
     async def get_tasks_by_team_ids(self, team_ids: List[str]) -> List[Dict]:
         """
-        Get tasks for a list of team IDs.
+        Get tasks for a list of team IDs, as unvalidated TaskModel rows.
         """
         tasks = await self.task_repository.get_tasks_by_team_ids(team_ids)
-        # return tasks
-        return [TaskModel(**task).model_dump(by_alias=True) for task in tasks]
+        return trusted_rows(TaskModel, tasks)
+
+    async def get_tasks_page_by_team_ids(
+        self,
+        team_ids: List[str],
+        limit: int,
+        cursor: Optional[str] = None,
+        projection: Optional[Dict] = None,
+    ) -> Page:
+        """
+        Get one page of tasks for a list of team IDs. The items are
+        unvalidated TaskModel rows.
+
+        Raises:
+            HTTPException: If the cursor is invalid.
+        """
+        try:
+            page = await self.task_repository.get_page_by_team_ids(
+                team_ids, limit, cursor, projection
+            )
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=str(ve))
+        page.items = trusted_rows(TaskModel, page.items)
+        return page
 
     async def update_task_status(
         self, task_id: str, task_update: UpdateTaskSchema
@@ -168,31 +426,29 @@ class TaskService:
             task_update (UpdateTaskSchema): Status update.
 
         Returns:
-            dict: Updated task.
+            dict: Updated task, unchanged if the update was a no-op.
 
         Raises:
-            HTTPException: If not found or no changes.
+            HTTPException: If not found.
         """
         document = task_update.model_dump(exclude_unset=True)
-        updated = await self.task_repository.update(task_id, document)
-        if updated:
-            updated_task = await self.task_repository.get(task_id)
-            return updated_task
-        else:
-            raise HTTPException(
-                status_code=404, detail="Task not found or no changes made"
-            )
+        return await self._update_and_get(task_id, document)
+
+
+def _in_teams(team_id, team_ids: Optional[Collection[Optional[str]]]) -> bool:
+    if team_ids is None:
+        return True
+    return (str(team_id) if team_id else None) in team_ids
 
 
-def get_task_service(db: AsyncDatabase = Depends(get_database)):
+def get_task_service(services=Depends(get_services)) -> TaskService:
     """
     Dependency provider for TaskService.
 
     Args:
-        db (AsyncDatabase): Async database instance.
+        services (ServiceContainer): The application's service container.
 
     Returns:
-        TaskService: Service instance.
+        TaskService: The application-scoped service instance.
     """
-    task_repository = TaskRepository(db)
-    return TaskService(task_repository)
+    return services.task_service
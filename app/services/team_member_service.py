@@ -10,18 +10,22 @@ from app.models.team import (
     ResponseTeamMemberSchema,
     ResponseTeamMembersCollection,
 )
-from config.database import get_database
-from app.logging_config import logger
-from app.utils import get_password_hash
+from app.dependencies.services import get_services
+from app.logging_config import get_logger
+from app.hashing import password_hasher
+from app.pagination import Page
+from pymongo.asynchronous.cursor import AsyncCursor
 
-from pymongo.asynchronous.database import AsyncDatabase
 from fastapi import HTTPException
 
 
+logger = get_logger(__name__)
+
+
 class TeamMemberService:
     def __init__(self, team_member_repository: TeamMemberRepository):
         self.team_member_repository = team_member_repository
-        logger.info("TeamMemberService initialized.")
+        logger.debug("TeamMemberService initialized.")
 
     async def create_team_member(
         self, team_member_data: CreateTeamMemberSchema
@@ -44,22 +48,26 @@ class TeamMemberService:
 
         team_member_data = team_member_data.model_dump(exclude_unset=True)
         password = team_member_data.pop("password")
-        team_member_data["hashed_password"] = get_password_hash(password)
+        team_member_data["hashed_password"] = await password_hasher.hash(password)
         
         team_member = TeamMemberModel(**team_member_data)
         document = team_member.model_dump(by_alias=True)
 
-        logger.info(f"Creating team member: {team_member_data}")
+        logger.debug("Creating team member: %s", document["email"])
         result = await self.team_member_repository.create_team_member(document)
 
         if not result:
             logger.error("Team member creation failed")
             raise HTTPException(status_code=400, detail="Team member creation failed")
-        logger.info(f"Team member created successfully: {document}")
+        logger.info("Team member created successfully: %s", result)
         return document
 
-    async def get_team_member_by_id(self, team_member_id: str) -> Optional[dict]:
-        member = await self.team_member_repository.get_team_member_by_id(team_member_id)
+    async def get_team_member_by_id(
+        self, team_member_id: str, projection: Optional[Dict] = None
+    ) -> Optional[dict]:
+        member = await self.team_member_repository.get_team_member_by_id(
+            team_member_id, projection
+        )
         return member
 
     async def get_all_team_members(self) -> Optional[List[dict]]:
@@ -78,6 +86,53 @@ class TeamMemberService:
         members = [member_dict for member_dict in result]
         return members
 
+    async def get_team_members_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        projection: Optional[Dict] = None,
+    ) -> Page:
+        """
+        Get one page of team members.
+
+        Args:
+            limit (int): Page size.
+            cursor (str, optional): Cursor returned with the previous page.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            Page: Members and the cursor of the next page.
+
+        Raises:
+            HTTPException: If the cursor is invalid or there are no members.
+        """
+        try:
+            page = await self.team_member_repository.get_page(
+                limit, cursor, projection
+            )
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=str(ve))
+        if not page.items and cursor is None:
+            raise HTTPException(status_code=404, detail="No team members found")
+        return page
+
+    async def get_all_team_members_cursor(
+        self, batch_size: int, projection: Optional[Dict] = None
+    ) -> AsyncCursor:
+        """
+        Get a cursor over all team members for streaming responses.
+
+        Args:
+            batch_size (int): Documents fetched per round trip.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            AsyncCursor: Cursor for the team members.
+        """
+        return await self.team_member_repository.get_all_cursor(
+            batch_size, projection
+        )
+
     async def update_team_member(self, team_member_id: str, update_data: Dict) -> bool:
         """
         Update a team member.
@@ -127,17 +182,22 @@ class TeamMemberService:
         """
         return await self.team_member_repository.get_team_member_by_email(email)
 
-    async def get_team_members_by_role(self, role: str) -> List[dict]:
+    async def get_team_members_by_role(
+        self, role: str, projection: Optional[Dict] = None
+    ) -> List[dict]:
         """
         Get team members by role.
 
         Args:
             role (str): Role to filter by.
+            projection (dict, optional): Fields to return.
 
         Returns:
             List[dict]: Team members with the specified role.
         """
-        members = await self.team_member_repository.get_team_members_by_role(role)
+        members = await self.team_member_repository.get_team_members_by_role(
+            role, projection
+        )
         if not members:
             raise HTTPException(
                 status_code=404, detail="No team members found with the specified role"
@@ -145,15 +205,14 @@ class TeamMemberService:
         return members
 
 
-def get_team_member_service(db: AsyncDatabase = Depends(get_database)):
+def get_team_member_service(services=Depends(get_services)) -> TeamMemberService:
     """
     Dependency provider for TeamMemberService.
 
     Args:
-        db (AsyncDatabase): Async database instance.
+        services (ServiceContainer): The application's service container.
 
     Returns:
-        TeamMemberService: Service instance.
+        TeamMemberService: The application-scoped service instance.
     """
-    team_member_repository = TeamMemberRepository(db)
-    return TeamMemberService(team_member_repository)
+    return services.team_member_service
@@ -1,17 +1,25 @@
-from pymongo.asynchronous.database import AsyncDatabase
 from fastapi import Depends, HTTPException
-from config.database import get_database
+from app.dependencies.services import get_services
 from app.models.team import (
     TeamModel,
     CreateTeamSchema,
     ResponseTeamSchema,
     UpdateTeamSchema,
 )
+from app.models.board import BoardColumn, TeamLeadBoardSchema
+from app.models.task import TaskStatus
 from app.repositories.team_repository import TeamRepository
 from typing import List, Optional, Dict
-from app.logging_config import logger
+from app.logging_config import get_logger
+from app.pagination import Page
+from pymongo.asynchronous.cursor import AsyncCursor
 from bson import ObjectId
 
+logger = get_logger(__name__)
+
+# Largest number of members a team may have.
+MAX_TEAM_SIZE = 5
+
 
 class TeamService:
     # This code defines a TeamService class that provides methods for managing teams in a task management application.
@@ -20,11 +28,11 @@ class TeamService:
     # The service also includes methods to retrieve teams by lead and update team members.
     # The TeamService class is designed to be used in a FastAPI application, allowing for easy integration with web endpoints.
     # The service uses Pydantic schemas for data validation and serialization, ensuring that the data conforms to the expected structure.
-    # The service is initialized with a TeamRepository instance, which can be provided or created using the get_database function.
+    # The service is initialized with a TeamRepository instance; the application-wide instance is built by ServiceContainer (app/container.py).
 
     def __init__(self, team_repository: TeamRepository = None):
         self.team_repository = team_repository
-        logger.info("TeamService initialized.")
+        logger.debug("TeamService initialized.")
 
     async def create_team(self, team_create: CreateTeamSchema) -> Dict:
         try:
@@ -34,16 +42,16 @@ class TeamService:
             result = await self.team_repository.create_team(team_document)
 
             if result is not None:
-                logger.info(f"Team created successfully: {team_document}")
+                logger.info("Team created successfully: %s", result)
                 return team_document
             else:
                 logger.error("Team creation failed: No result returned")
                 raise HTTPException(status_code=400, detail="Team creation failed")
         except ValueError as ve:
-            logger.error(f"Validation error: {str(ve)}")
+            logger.error("Validation error: %s", ve)
             raise HTTPException(status_code=422, detail=str(ve))
         except Exception as e:
-            logger.error(f"Unexpected error creating team: {str(e)}")
+            logger.error("Unexpected error creating team: %s", e)
             raise HTTPException(status_code=500, detail="Internal server error")
 
     async def get_team(self, team_id: str) -> Dict:
@@ -65,6 +73,60 @@ class TeamService:
         else:
             raise HTTPException(status_code=404, detail="Team not found")
 
+    async def get_teams_by_ids(
+        self, team_ids: List[str], projection: Optional[Dict] = None
+    ) -> Dict[str, Dict]:
+        """
+        Retrieve several teams in one query.
+
+        Args:
+            team_ids (List[str]): Team IDs.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            Dict[str, dict]: The teams found, keyed by their ID as string.
+        """
+        if not team_ids:
+            return {}
+        teams = await self.team_repository.get_many(list(team_ids), projection)
+        return {str(team["_id"]): team for team in teams}
+
+    async def get_managed_teams(
+        self, project_manager_id: str, projection: Optional[Dict] = None
+    ) -> Dict[str, Dict]:
+        """
+        Retrieve the teams managed by a user in one query, for scoping writes.
+
+        Args:
+            project_manager_id (str): Managing user ID.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            Dict[str, dict]: The teams, keyed by their ID as string; empty if
+            the user manages none.
+        """
+        teams = await self.team_repository.get_team_by_project_manager(
+            project_manager_id, projection
+        )
+        return {str(team["_id"]): team for team in teams}
+
+    async def ensure_team_managed_by(self, team_id: str, project_manager_id: str):
+        """
+        Check that a team exists and is managed by the given user.
+
+        Raises:
+            HTTPException: If the team is not found (404) or managed by
+                someone else (403).
+        """
+        team = await self.team_repository.get(team_id, {"project_manager": 1})
+        if team is None:
+            raise HTTPException(status_code=404, detail="Team not found")
+        if str(team.get("project_manager")) != project_manager_id:
+            raise HTTPException(
+                status_code=403,
+                detail="You do not have permission to manage tasks of this team.",
+            )
+
     async def get_all_teams(self) -> List[Dict]:
         """
         Retrieve all teams.
@@ -75,6 +137,46 @@ class TeamService:
         teams = await self.team_repository.get_all_teams()
         return teams
 
+    async def get_teams_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        projection: Optional[Dict] = None,
+    ) -> Page:
+        """
+        Retrieve one page of teams.
+
+        Args:
+            limit (int): Page size.
+            cursor (str, optional): Cursor returned with the previous page.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            Page: Teams and the cursor of the next page.
+
+        Raises:
+            HTTPException: If the cursor is invalid.
+        """
+        try:
+            return await self.team_repository.get_page(limit, cursor, projection)
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=str(ve))
+
+    async def get_all_teams_cursor(
+        self, batch_size: int, projection: Optional[Dict] = None
+    ) -> AsyncCursor:
+        """
+        Get a cursor over all teams for streaming responses.
+
+        Args:
+            batch_size (int): Documents fetched per round trip.
+            projection (dict, optional): Fields to return.
+
+        Returns:
+            AsyncCursor: Cursor for the teams.
+        """
+        return await self.team_repository.get_all_cursor(batch_size, projection)
+
     async def update_team(self, team_id: str, team_update: UpdateTeamSchema) -> Dict:
         """
         Update a team's details only if changes are detected.
@@ -84,10 +186,10 @@ class TeamService:
             team_update (UpdateTeamSchema): Fields to update.
 
         Returns:
-            dict: Updated team.
+            dict: Updated team, unchanged if no changes were detected.
 
         Raises:
-            HTTPException: If not found or update fails.
+            HTTPException: If not found or the project manager ID is invalid.
         """
         document = team_update.model_dump(exclude_unset=True)
         # Convert project_manager to ObjectId if present and is a string
@@ -97,21 +199,16 @@ class TeamService:
             try:
                 document["project_manager"] = ObjectId(document["project_manager"])
             except Exception as e:
-                logger.error(f"Invalid project_manager ObjectId: {e}")
+                logger.error("Invalid project_manager ObjectId: %s", e)
                 raise HTTPException(
                     status_code=422, detail="Invalid project_manager ID"
                 )
-        logger.info(f"Updating team ID {team_id} with data: {document}")
-        updated = await self.team_repository.update_team(team_id, document)
-        logger.info(f"Update result for team ID {team_id}: {updated}")
-        if updated:
-            updated_team = await self.get_team(team_id)
-            logger.info(f"Updated team details: {updated_team}")
-            return updated_team
-        else:
-            raise HTTPException(
-                status_code=404, detail="Team not found or update failed"
-            )
+        logger.debug("Updating team ID %s with data: %s", team_id, document)
+        result = await self.team_repository.update_and_get(team_id, document)
+        logger.info("Update result for team ID %s: %s", team_id, result.modified)
+        if not result.matched:
+            raise HTTPException(status_code=404, detail="Team not found")
+        return result.document
 
     async def delete_team(self, team_id: str) -> bool:
         """
@@ -255,12 +352,15 @@ class TeamService:
                 status_code=404, detail="Team or member not found or update failed"
             )
 
-    async def get_team_by_project_manager(self, project_manager_id: str) -> List[Dict]:
+    async def get_team_by_project_manager(
+        self, project_manager_id: str, projection: Optional[Dict] = None
+    ) -> List[Dict]:
         """
         Get all teams led by a specific team lead.
 
         Args:
             project_manager_id (str): Team lead ID.
+            projection (dict, optional): Fields to return.
 
         Returns:
             List[dict]: Teams led by the lead.
@@ -268,7 +368,9 @@ class TeamService:
         Raises:
             HTTPException: If none found.
         """
-        teams = await self.team_repository.get_team_by_project_manager(project_manager_id)
+        teams = await self.team_repository.get_team_by_project_manager(
+            project_manager_id, projection
+        )
         if teams:
             return teams
         else:
@@ -276,37 +378,122 @@ class TeamService:
                 status_code=404, detail="No teams found for the specified project manager"
             )
 
+    async def get_board(
+        self, lead_id: str, tasks_per_status: int
+    ) -> TeamLeadBoardSchema:
+        """
+        Get the board of a team lead: their teams, the members of those
+        teams and the teams' tasks by status, read in one aggregation.
+
+        Args:
+            lead_id (str): Team lead ID.
+            tasks_per_status (int): Most recently updated tasks listed per
+                status.
+
+        Returns:
+            TeamLeadBoardSchema: One column per task status, in workflow
+            order, including empty ones, then a column with no status for
+            tasks without one, if any. A lead without teams gets an empty
+            board.
+        """
+        board = await self.team_repository.get_board(lead_id, tasks_per_status)
+        columns = {column["_id"]: column for column in board["columns"]}
+        statuses = [status.value for status in TaskStatus]
+        # Tasks without a status are grouped under None.
+        if None in columns:
+            statuses.append(None)
+        return TeamLeadBoardSchema(
+            teams=board["teams"],
+            members=board["members"],
+            columns=[
+                BoardColumn(
+                    status=status,
+                    count=columns.get(status, {}).get("count", 0),
+                    tasks=columns.get(status, {}).get("tasks", []),
+                )
+                for status in statuses
+            ],
+        )
+
     async def add_team_members(
-        self, team_id: str, add_members_schema
+        self, team_id: str, add_members_schema, project_manager_id: Optional[str] = None
     ) -> dict:
         """
         Add members to a team by their ObjectIds, enforcing size limits.
+
+        Args:
+            team_id (str): Team ID.
+            add_members_schema (AddTeamMembersSchema): Members to add.
+            project_manager_id (str, optional): Only allow the update if the
+                team is managed by this user.
+
+        Returns:
+            dict: The updated team.
+
+        Raises:
+            HTTPException: If an ID is invalid (400), the team is not found
+                (404), is not managed by `project_manager_id` (403) or the
+                size limit would be exceeded (400).
         """
-        team = await self.get_team(team_id)
-        current_members = team.get("member_ids", [])
-        new_members = len(add_members_schema.member_ids)
-        if len(current_members) + new_members > 5:
-             # This limit could be moved to config
-             raise HTTPException(status_code=400, detail="Team size limit of 5 exceeded.")
+        try:
+            updated_team = await self.team_repository.add_team_members(
+                team_id,
+                add_members_schema.member_ids,
+                MAX_TEAM_SIZE,
+                project_manager_id,
+            )
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=str(ve))
+        if updated_team:
+            return updated_team
+        team = await self.team_repository.get(team_id, {"project_manager": 1})
+        if team is None:
+            raise HTTPException(status_code=404, detail="Team not found")
+        if project_manager_id is not None and (
+            str(team.get("project_manager")) != project_manager_id
+        ):
+            raise HTTPException(
+                status_code=403,
+                detail="You do not have permission to add members to this team.",
+            )
+        raise HTTPException(
+            status_code=400, detail=f"Team size limit of {MAX_TEAM_SIZE} exceeded."
+        )
 
-        for member_id in add_members_schema.member_ids:
-            # Check if member already exists to avoid double counting if not using $addToSet in a way that handles it gracefully for size check (but we checked size before)
-            # The repository uses $addToSet so duplicates won't be added, but we should be careful.
-            await self.team_repository.add_team_member(team_id, member_id)
-        
-        updated_team = await self.team_repository.get_team_by_id(team_id)
-        return updated_team
+    async def remove_team_members(self, team_id: str, remove_members_schema) -> dict:
+        """
+        Remove members from a team by their ObjectIds.
+
+        Args:
+            team_id (str): Team ID.
+            remove_members_schema (AddTeamMembersSchema): Members to remove.
+
+        Returns:
+            dict: The updated team.
+
+        Raises:
+            HTTPException: If an ID is invalid (400) or the team is not found
+                (404).
+        """
+        try:
+            updated_team = await self.team_repository.remove_team_members(
+                team_id, remove_members_schema.member_ids
+            )
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=str(ve))
+        if updated_team:
+            return updated_team
+        raise HTTPException(status_code=404, detail="Team not found")
 
 
-def get_team_service(db: AsyncDatabase = Depends(get_database)):
+def get_team_service(services=Depends(get_services)) -> TeamService:
     """
     Dependency provider for TeamService.
 
     Args:
-        db (AsyncDatabase): Async database instance.
+        services (ServiceContainer): The application's service container.
 
     Returns:
-        TeamService: Service instance.
+        TeamService: The application-scoped service instance.
     """
-    team_repository = TeamRepository(db)
-    return TeamService(team_repository)
+    return services.team_service
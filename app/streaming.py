@@ -0,0 +1,71 @@
+from typing import AsyncIterator, Type
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pymongo.asynchronous.cursor import AsyncCursor
+
+from app.serialization import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+# Documents fetched from MongoDB per getMore while streaming.
+STREAM_BATCH_SIZE = 500
+
+# OpenAPI entry for routes that can stream their rows as NDJSON.
+NDJSON_RESPONSES = {
+    200: {
+        "content": {NDJSON_MEDIA_TYPE: {}},
+        "description": f"One JSON row per line when Accept is {NDJSON_MEDIA_TYPE}.",
+    }
+}
+
+# OpenAPI entry for routes streaming Server-Sent Events.
+SSE_RESPONSES = {
+    200: {
+        "content": {SSE_MEDIA_TYPE: {}},
+        "description": "Server-Sent Events, sent as they happen.",
+    }
+}
+
+
+def wants_ndjson(request: Request) -> bool:
+    """
+    Check whether the client asked for a streamed NDJSON response.
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def ndjson_rows(
+    cursor: AsyncCursor, schema: Type[BaseModel]
+) -> AsyncIterator[bytes]:
+    """
+    Serialize cursor rows one at a time through a response schema.
+
+    Only the declared schema fields are written. The response awaits each
+    chunk being sent before the next row is pulled from the cursor, so
+    memory stays bounded by one cursor batch whatever the client speed.
+    """
+    fields = set(schema.model_fields)
+    try:
+        async for document in cursor:
+            row = schema.model_validate(document)
+            yield row.model_dump_json(include=fields).encode() + b"\n"
+    finally:
+        # Kill the server-side cursor if the client went away mid-stream.
+        if cursor.alive:
+            await cursor.close()
+
+
+def ndjson_response(cursor: AsyncCursor, schema: Type[BaseModel]) -> StreamingResponse:
+    """
+    Stream cursor rows as an application/x-ndjson response.
+    """
+    return StreamingResponse(ndjson_rows(cursor, schema), media_type=NDJSON_MEDIA_TYPE)
+
+
+def sse_event(event: str, data) -> bytes:
+    """
+    Encode one Server-Sent Event with a JSON payload on a single data line.
+    """
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
@@ -1,5 +1,7 @@
 from passlib.context import CryptContext
-from dataclasses import dataclass
+from dataclasses import dataclass, field as dataclass_field
+from typing import Dict, Iterable, Optional, Set
+from bson import ObjectId
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
@@ -9,7 +11,62 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def to_object_id(value):
+    """
+    Convert a reference (or list of references) to the canonical ObjectId
+    type. Values that are not valid ObjectIds are returned unchanged.
+    """
+    if isinstance(value, list):
+        return [to_object_id(item) for item in value]
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    return value
+
+def with_object_ids(document: Dict, fields: Iterable[str]) -> Dict:
+    """
+    Copy of a document with the given reference fields converted to ObjectId.
+    """
+    converted = dict(document)
+    for field in fields:
+        if converted.get(field) is not None:
+            converted[field] = to_object_id(converted[field])
+    return converted
+
+def differs_from(changes: Dict) -> Dict:
+    """
+    Filter matching documents that a $set of `changes` would modify.
+    """
+    return {"$or": [{field: {"$ne": value}} for field, value in changes.items()]}
+
+def differs_expression(changes: Dict) -> Dict:
+    """
+    differs_from as an aggregation expression, for update pipelines; a
+    missing field counts as null, as in the filter.
+    """
+    return {
+        "$or": [
+            {"$ne": [{"$ifNull": [f"${field}", None]}, {"$literal": value}]}
+            for field, value in changes.items()
+        ]
+    }
+
+def modifies(document: Dict, changes: Dict) -> bool:
+    """
+    Whether a $set of `changes` modified `document`, as it was before.
+    """
+    return any(document.get(field) != value for field, value in changes.items())
+
 @dataclass
 class UpdateResult:
     matched: bool
-    modified: bool
\ No newline at end of file
+    modified: bool
+    document: Optional[Dict] = None
+
+@dataclass
+class BulkUpdateResult:
+    # Error message by position of each failed update.
+    errors: Dict[int, str] = dataclass_field(default_factory=dict)
+    # Positions of updates whose task does not exist, or is not in the
+    # teams the update was restricted to.
+    missing: Set[int] = dataclass_field(default_factory=set)
+    out_of_scope: Set[int] = dataclass_field(default_factory=set)
@@ -0,0 +1,5 @@
+"""
+End-to-end HTTP benchmarks for the role-based routes.
+
+Run with `python -m benchmarks.run --help`; see the README for details.
+"""
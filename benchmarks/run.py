@@ -0,0 +1,237 @@
+"""
+End-to-end HTTP benchmark of the role-based routes.
+
+    python -m benchmarks.run --seed-data --members 2000 --tasks 100000
+    python -m benchmarks.run --duration 60 --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json
+
+Boots the app under uvicorn against a local mongod (unless --base-url points
+at a running server), optionally seeds a dataset with app.seeding, logs in
+users of every role and drives the weighted role mix from
+benchmarks.scenarios with concurrent clients. Prints request counts,
+throughput and p50/p95/p99 latency per route; exits with status 1 when
+--compare finds a regression against a saved baseline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.database.materialized_views import TeamTasksMaterializedView
+from app.database.views import create_indexes, create_views
+from app.seeding import SeedConfig, seed
+from benchmarks.scenarios import Actor, Scenario, default_scenarios, load_actors
+from benchmarks.stats import Recorder, find_regressions, format_summary
+from config.database import close_mongo_connection, get_database
+
+DEFAULT_DB_NAME = "task_management_bench"
+SERVER_START_TIMEOUT_SECONDS = 60
+
+
+def _start_server(host: str, port: int, workers: int) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", host, "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    return subprocess.Popen(command, env=os.environ.copy())
+
+
+async def _wait_until_ready(client: httpx.AsyncClient, server: subprocess.Popen):
+    deadline = time.monotonic() + SERVER_START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with status {server.returncode}")
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("Server did not start in time")
+
+
+async def _login(client: httpx.AsyncClient, actors: List[Actor], password: str):
+    for actor in actors:
+        response = await client.post(
+            "/auth/login", data={"username": actor.email, "password": password}
+        )
+        response.raise_for_status()
+        actor.token = response.json()["access_token"]
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    scenarios: List[Scenario],
+    actors: Dict[str, List[Actor]],
+    rng: random.Random,
+    warmup_until: float,
+    stop_at: float,
+    recorder: Recorder,
+) -> None:
+    cum_weights = list(accumulate(s.weight for s in scenarios))
+    while True:
+        scenario = rng.choices(scenarios, cum_weights=cum_weights)[0]
+        actor = rng.choice(actors[scenario.role])
+        method, url, kwargs = scenario.build(actor, rng)
+        headers = actor.headers if scenario.authenticated else None
+        started = time.perf_counter()
+        if started >= stop_at:
+            return
+        try:
+            response = await client.request(method, url, headers=headers, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        if started >= warmup_until:
+            recorder.record(scenario.name, time.perf_counter() - started, ok)
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Dict]:
+    """
+    Seed (optionally), start the server, run the role mix and summarize it.
+
+    Returns:
+        dict: Per-route summary, as returned by Recorder.summary.
+    """
+    # Read by both this process and the server subprocess.
+    os.environ["DB_NAME"] = args.db_name
+    db = get_database()
+    try:
+        if args.seed_data:
+            config = SeedConfig(
+                members=args.members, tasks=args.tasks, seed=args.seed
+            )
+            counts = await seed(db, config, drop=True)
+            await create_views(db)
+            await create_indexes(db)
+            await TeamTasksMaterializedView(db).rebuild()
+            print(f"Seeded {counts}")
+        actors = await load_actors(db, args.users_per_role)
+    finally:
+        await close_mongo_connection()
+
+    scenarios = [
+        s for s in default_scenarios(args.password)
+        if actors.get(s.role) and (s.name != "dev_status_update" or args.writes)
+    ]
+    if not scenarios:
+        raise RuntimeError("No seeded users to act as; run with --seed-data")
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = _start_server(args.host, args.port, args.workers)
+        base_url = f"http://{args.host}:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(
+            base_url=base_url, limits=limits, timeout=30
+        ) as client:
+            if server is not None:
+                await _wait_until_ready(client, server)
+            await _login(
+                client, [a for role in actors.values() for a in role], args.password
+            )
+
+            recorder = Recorder()
+            now = time.perf_counter()
+            warmup_until = now + args.warmup
+            stop_at = warmup_until + args.duration
+            rng = random.Random(args.seed)
+            await asyncio.gather(
+                *(
+                    _worker(
+                        client,
+                        scenarios,
+                        actors,
+                        random.Random(rng.random()),
+                        warmup_until,
+                        stop_at,
+                        recorder,
+                    )
+                    for _ in range(args.concurrency)
+                )
+            )
+            return recorder.summary(args.duration)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the role-based routes.")
+    parser.add_argument("--base-url", help="Benchmark a running server instead.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--db-name", default=DEFAULT_DB_NAME)
+    parser.add_argument(
+        "--seed-data", action="store_true", help="Drop and seed the database first."
+    )
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--users-per-role", type=int, default=20)
+    parser.add_argument(
+        "--no-writes",
+        dest="writes",
+        action="store_false",
+        help="Leave out the developer status updates.",
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=float, default=5, help="seconds")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH", help="Baseline to compare to.")
+    parser.add_argument(
+        "--latency-tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative p95/p99 increase over the baseline.",
+    )
+    parser.add_argument(
+        "--throughput-tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative throughput decrease from the baseline.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    summary = asyncio.run(run_benchmark(args))
+    print(format_summary(summary))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump({"routes": summary}, baseline_file, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)["routes"]
+        regressions = find_regressions(
+            summary, baseline, args.latency_tolerance, args.throughput_tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Role mix driven by the benchmark.
+
+Each scenario is one request made on behalf of a user with the scenario's
+role. Weights approximate production traffic: developers polling and
+updating their tasks dominate, team leads check their board, project
+managers browse the organization and a few users log in.
+"""
+import random
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.models.task import TaskStatus
+from app.utils import to_object_id
+
+Request = Tuple[str, str, Dict]
+
+
+@dataclass
+class Actor:
+    """
+    A seeded user the benchmark acts as.
+    """
+
+    user_id: str
+    email: str
+    role: str
+    task_ids: List[str] = field(default_factory=list)
+    token: str = ""
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    role: str
+    weight: int
+    build: Callable[[Actor, random.Random], Request]
+    authenticated: bool = True
+
+
+def _pm_tasks(actor: Actor, rng: random.Random) -> Request:
+    return "GET", "/project-manager/tasks", {"params": {"limit": 50}}
+
+
+def _pm_teams(actor: Actor, rng: random.Random) -> Request:
+    return "GET", "/project-manager/teams", {"params": {"limit": 50}}
+
+
+def _pm_team_members(actor: Actor, rng: random.Random) -> Request:
+    return "GET", "/project-manager/team-members", {"params": {"limit": 50}}
+
+
+def _tl_board(actor: Actor, rng: random.Random) -> Request:
+    return "GET", "/team-lead/board", {}
+
+
+def _tl_tasks(actor: Actor, rng: random.Random) -> Request:
+    return "GET", "/team-lead/tasks", {"params": {"limit": 50}}
+
+
+def _tl_teams(actor: Actor, rng: random.Random) -> Request:
+    return "GET", "/team-lead/teams", {}
+
+
+def _dev_tasks(actor: Actor, rng: random.Random) -> Request:
+    return "GET", "/team-member/tasks/", {"params": {"assigned_to": actor.user_id}}
+
+
+def _dev_status_update(actor: Actor, rng: random.Random) -> Request:
+    status = rng.choice([TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED])
+    task_id = rng.choice(actor.task_ids)
+    return "PUT", f"/team-member/tasks/{task_id}", {"json": {"status": status.value}}
+
+
+def _login(password: str) -> Callable[[Actor, random.Random], Request]:
+    def build(actor: Actor, rng: random.Random) -> Request:
+        form = {"username": actor.email, "password": password}
+        return "POST", "/auth/login", {"data": form}
+
+    return build
+
+
+def default_scenarios(password: str) -> List[Scenario]:
+    return [
+        Scenario("pm_tasks", "project_manager", 8, _pm_tasks),
+        Scenario("pm_teams", "project_manager", 4, _pm_teams),
+        Scenario("pm_team_members", "project_manager", 3, _pm_team_members),
+        Scenario("tl_board", "team_lead", 12, _tl_board),
+        Scenario("tl_tasks", "team_lead", 8, _tl_tasks),
+        Scenario("tl_teams", "team_lead", 5, _tl_teams),
+        Scenario("dev_tasks", "developer", 35, _dev_tasks),
+        Scenario("dev_status_update", "developer", 23, _dev_status_update),
+        Scenario("login", "developer", 2, _login(password), authenticated=False),
+    ]
+
+
+async def load_actors(
+    db: AsyncDatabase, per_role: int, tasks_per_developer: int = 20
+) -> Dict[str, List[Actor]]:
+    """
+    Pick the users the benchmark acts as from the seeded members.
+
+    Developers are only picked when they have tasks assigned, so status
+    updates always target one of their own tasks.
+
+    Args:
+        db (AsyncDatabase): The seeded database.
+        per_role (int): Number of users per role.
+        tasks_per_developer (int): Task ids kept per developer.
+
+    Returns:
+        dict: Actors by role.
+    """
+    actors: Dict[str, List[Actor]] = {}
+    for role in ("project_manager", "team_lead", "developer"):
+        cursor = db["team_members"].find(
+            {"role": role}, {"email": 1, "role": 1}
+        ).limit(per_role * 4 if role == "developer" else per_role)
+        actors[role] = [
+            Actor(user_id=str(doc["_id"]), email=doc["email"], role=role)
+            async for doc in cursor
+        ]
+
+    developers = []
+    for actor in actors["developer"]:
+        cursor = db["tasks"].find(
+            {"assigned_to": to_object_id(actor.user_id)},
+            {"_id": 1},
+        ).limit(tasks_per_developer)
+        actor.task_ids = [str(doc["_id"]) async for doc in cursor]
+        if actor.task_ids:
+            developers.append(actor)
+        if len(developers) == per_role:
+            break
+    actors["developer"] = developers
+    return actors
@@ -0,0 +1,96 @@
+"""
+Per-row cost of serializing task list responses.
+
+    python -m benchmarks.serialization --rows 500 --repeat 200
+
+Compares the path task lists used to take (a TaskModel built and dumped per
+row in the service, the list validated again against response_model by
+FastAPI and rendered with json.dumps) with the trusted path of
+app.serialization, on documents generated by app.seeding.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from pydantic import TypeAdapter
+
+from app.models.task import TaskModel
+from app.seeding import SeedConfig, build_members, build_teams, iter_task_batches
+from app.serialization import dumps, trusted_rows
+
+_task_list = TypeAdapter(List[TaskModel])
+
+
+def task_documents(count: int, seed: int = 42) -> List[Dict]:
+    """
+    Task documents as the driver returns them: naive UTC datetimes and the
+    extra fields stored alongside the TaskModel ones.
+    """
+    config = SeedConfig(members=max(count // 4, 4), tasks=count, seed=seed)
+    rng = random.Random(seed)
+    teams = build_teams(rng, config, build_members(rng, config, "hash"))
+    documents = [
+        document
+        for batch in iter_task_batches(rng, config, teams)
+        for document in batch
+    ]
+    for document in documents:
+        for field in ("created_at", "updated_at"):
+            document[field] = document[field].replace(tzinfo=None)
+    return documents
+
+
+def validated(documents: List[Dict]) -> bytes:
+    rows = [TaskModel(**document).model_dump(by_alias=True) for document in documents]
+    content = _task_list.dump_python(
+        _task_list.validate_python(rows), mode="json", by_alias=True
+    )
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def trusted(documents: List[Dict]) -> bytes:
+    return dumps(trusted_rows(TaskModel, documents))
+
+
+def per_row_micros(
+    serialize: Callable[[List[Dict]], bytes], documents: List[Dict], repeat: int
+) -> float:
+    """
+    Best-of-`repeat` time to serialize the documents, in microseconds per row.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        serialize(documents)
+        best = min(best, time.perf_counter() - started)
+    return best / len(documents) * 1_000_000
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark task list serialization.")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    documents = task_documents(args.rows, args.seed)
+    if json.loads(validated(documents)) != json.loads(trusted(documents)):
+        print("Trusted rows differ from the validated response", file=sys.stderr)
+        return 1
+    before = per_row_micros(validated, documents, args.repeat)
+    after = per_row_micros(trusted, documents, args.repeat)
+    print(f"validated  {before:8.2f} us/row")
+    print(f"trusted    {after:8.2f} us/row  ({before / after:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import math
+from collections import defaultdict
+from typing import Dict, List, Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile of `values`.
+
+    Args:
+        values (Sequence[float]): Samples, sorted in ascending order.
+        q (float): Percentile between 0 and 100.
+
+    Returns:
+        float: The sample at that rank, or 0.0 when there are no samples.
+    """
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class Recorder:
+    """
+    Collects request latencies and failures per route.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        self.latencies[route].append(seconds)
+        if not ok:
+            self.errors[route] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict]:
+        """
+        Summarize the recorded requests.
+
+        Args:
+            elapsed (float): Duration of the measured run, in seconds.
+
+        Returns:
+            dict: Per-route request and error counts, throughput (requests per
+                second) and p50/p95/p99 latency in milliseconds, plus an
+                "all" entry covering every route.
+        """
+        routes = dict(self.latencies)
+        routes["all"] = [s for samples in self.latencies.values() for s in samples]
+        summary = {}
+        for route, samples in sorted(routes.items()):
+            samples = sorted(samples)
+            errors = sum(self.errors.values()) if route == "all" else self.errors[route]
+            summary[route] = {
+                "requests": len(samples),
+                "errors": errors,
+                "rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+                "p50_ms": round(percentile(samples, 50) * 1000, 2),
+                "p95_ms": round(percentile(samples, 95) * 1000, 2),
+                "p99_ms": round(percentile(samples, 99) * 1000, 2),
+            }
+        return summary
+
+
+def find_regressions(
+    current: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    latency_tolerance: float = 0.2,
+    throughput_tolerance: float = 0.2,
+) -> List[str]:
+    """
+    Compare a run against a saved baseline.
+
+    A route regresses when its p95 or p99 latency grows by more than
+    `latency_tolerance`, its throughput drops by more than
+    `throughput_tolerance`, or it fails requests the baseline did not.
+
+    Args:
+        current (dict): Summary of the run, as returned by Recorder.summary.
+        baseline (dict): Summary of the baseline run.
+        latency_tolerance (float): Allowed relative latency increase.
+        throughput_tolerance (float): Allowed relative throughput decrease.
+
+    Returns:
+        list: One message per regression; empty when the run is within limits.
+    """
+    regressions = []
+    for route, expected in sorted(baseline.items()):
+        actual = current.get(route)
+        if actual is None:
+            regressions.append(f"{route}: missing from this run")
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            limit = expected[metric] * (1 + latency_tolerance)
+            if actual[metric] > limit:
+                regressions.append(
+                    f"{route}: {metric} {actual[metric]} > {limit:.2f} "
+                    f"(baseline {expected[metric]})"
+                )
+        floor = expected["rps"] * (1 - throughput_tolerance)
+        if actual["rps"] < floor:
+            regressions.append(
+                f"{route}: rps {actual['rps']} < {floor:.2f} "
+                f"(baseline {expected['rps']})"
+            )
+        if actual["errors"] and not expected["errors"]:
+            regressions.append(f"{route}: {actual['errors']} failed requests")
+    return regressions
+
+
+def format_summary(summary: Dict[str, Dict]) -> str:
+    """
+    Render a summary as a fixed-width table.
+    """
+    header = (
+        f"{'route':<24}{'requests':>10}{'errors':>8}{'rps':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    for route, row in summary.items():
+        lines.append(
+            f"{route:<24}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+        )
+    return "\n".join(lines)
@@ -1,26 +1,225 @@
-from pymongo import AsyncMongoClient
-from pymongo.asynchronous.database import AsyncDatabase
-from dotenv import load_dotenv
 import os
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional, Sequence
+
+from dotenv import load_dotenv
+from pymongo import AsyncMongoClient, monitoring
+from pymongo.asynchronous.database import AsyncDatabase
 
 load_dotenv()
 
+
+def _optional_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """
+    Connection and pool settings for the shared MongoDB client.
+    """
+
+    env: str = "dev"
+    db_url: str = "mongodb://localhost:27017"
+    db_name: str = "task_management_dev"
+    max_pool_size: int = 100
+    min_pool_size: int = 0
+    wait_queue_timeout_ms: Optional[int] = None
+    server_selection_timeout_ms: int = 30000
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        """
+        Build settings from environment variables.
+
+        Returns:
+            DatabaseSettings: The settings for the current environment.
+        """
+        env = os.getenv("ENV", "dev")
+        db_name = os.getenv("DB_NAME", "task_management_dev")
+        if env == "test":
+            db_name = "task_management_test"
+        elif env == "prod":
+            db_name = "task_management"
+
+        return cls(
+            env=env,
+            db_url=os.getenv("DB_URL", "mongodb://localhost:27017"),
+            db_name=db_name,
+            max_pool_size=int(os.getenv("DB_MAX_POOL_SIZE", "100")),
+            min_pool_size=int(os.getenv("DB_MIN_POOL_SIZE", "0")),
+            wait_queue_timeout_ms=_optional_int("DB_WAIT_QUEUE_TIMEOUT_MS"),
+            server_selection_timeout_ms=int(
+                os.getenv("DB_SERVER_SELECTION_TIMEOUT_MS", "30000")
+            ),
+        )
+
+    def client_options(self) -> Dict:
+        """
+        Keyword arguments for AsyncMongoClient derived from these settings.
+        """
+        options = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+        }
+        if self.wait_queue_timeout_ms is not None:
+            options["waitQueueTimeoutMS"] = self.wait_queue_timeout_ms
+        return options
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener keeping running counters per server address.
+    """
+
+    _COUNTERS = (
+        "open",
+        "in_use",
+        "waiting",
+        "created",
+        "closed",
+        "checked_out",
+        "check_out_failed",
+        "cleared",
+    )
+
+    def __init__(self):
+        self._lock = Lock()
+        self._pools: Dict[str, Dict[str, int]] = {}
+
+    def _bump(self, address, **deltas: int) -> None:
+        key = f"{address[0]}:{address[1]}"
+        with self._lock:
+            pool = self._pools.setdefault(key, dict.fromkeys(self._COUNTERS, 0))
+            for name, delta in deltas.items():
+                pool[name] += delta
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return a copy of the counters for every known pool.
+        """
+        with self._lock:
+            return {address: dict(pool) for address, pool in self._pools.items()}
+
+    def pool_created(self, event):
+        self._bump(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._bump(event.address, cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._bump(event.address, open=1, created=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._bump(event.address, open=-1, closed=1)
+
+    def connection_check_out_started(self, event):
+        self._bump(event.address, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self._bump(event.address, waiting=-1, check_out_failed=1)
+
+    def connection_checked_out(self, event):
+        self._bump(event.address, waiting=-1, in_use=1, checked_out=1)
+
+    def connection_checked_in(self, event):
+        self._bump(event.address, in_use=-1)
+
+
+_settings: Optional[DatabaseSettings] = None
+_client: Optional[AsyncMongoClient] = None
+_pool_stats = PoolStatsListener()
+
+
+def get_settings() -> DatabaseSettings:
+    """
+    Get the process-wide database settings, loading them on first use.
+    """
+    global _settings
+    if _settings is None:
+        _settings = DatabaseSettings.from_env()
+    return _settings
+
+
+def connect_to_mongo(
+    settings: Optional[DatabaseSettings] = None,
+    event_listeners: Sequence = (),
+) -> AsyncMongoClient:
+    """
+    Create the shared AsyncMongoClient. Called once from the app lifespan.
+
+    Args:
+        settings (DatabaseSettings, optional): Overrides the environment settings.
+        event_listeners (Sequence, optional): Monitoring listeners registered
+            in addition to the pool statistics listener.
+
+    Returns:
+        AsyncMongoClient: The shared client.
+    """
+    global _settings, _client
+    if settings is not None:
+        _settings = settings
+    if _client is None:
+        _client = AsyncMongoClient(
+            get_settings().db_url,
+            event_listeners=[_pool_stats, *event_listeners],
+            **get_settings().client_options(),
+        )
+    return _client
+
+
+async def close_mongo_connection() -> None:
+    """
+    Close the shared client and release its pooled connections.
+    """
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def get_client() -> AsyncMongoClient:
+    """
+    Get the shared client, creating it lazily outside of the app lifespan
+    (scripts, one-off commands).
+    """
+    return _client if _client is not None else connect_to_mongo()
+
+
 def get_database() -> AsyncDatabase:
     """
     Get the MongoDB database instance based on environment.
 
     Returns:
-        AsyncDatabase: The database instance.
+        AsyncDatabase: The database instance backed by the shared client.
     """
-    # Load environment variables
-    env = os.getenv("ENV", "dev")
-    db_url = os.getenv("DB_URL", "mongodb://localhost:27017")
-    db_name = os.getenv("DB_NAME", "task_management_dev")
+    return get_client()[get_settings().db_name]
 
-    if env == "test":
-        db_name = "task_management_test"
-    elif env == "prod":
-        db_name = "task_management"
 
-    client = AsyncMongoClient(db_url)
-    return client[db_name]
\ No newline at end of file
+def get_pool_stats() -> Dict:
+    """
+    Get connection pool counters along with the configured pool limits.
+
+    Returns:
+        dict: Pool settings and per-server counters.
+    """
+    settings = get_settings()
+    return {
+        "max_pool_size": settings.max_pool_size,
+        "min_pool_size": settings.min_pool_size,
+        "wait_queue_timeout_ms": settings.wait_queue_timeout_ms,
+        "connected": _client is not None,
+        "pools": _pool_stats.snapshot(),
+    }
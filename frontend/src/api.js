@@ -71,6 +71,7 @@ export const updateTaskTL = (taskId, data) => apiClient.put(`/team-lead/update-t
 export const trackTasksTL = () => apiClient.get('/team-lead/track-tasks');
 export const createTeamTL = (data) => apiClient.post('/team-lead/create-team', data);
 export const getTeamsTL = () => apiClient.get('/team-lead/teams');
+export const getBoardTL = (tasksPerStatus = 20) => apiClient.get('/team-lead/board', { params: { tasks_per_status: tasksPerStatus } });
 export const addTeamMembersTL = (data) => apiClient.post('/team-lead/add-team-members', data);
 export const createTeamMemberTL = (data) => apiClient.post('/team-lead/team-member', data);
 export const getTeamMembersTL = () => apiClient.get('/team-lead/team-members');
@@ -89,6 +90,7 @@ export const getTeamMemberByIdTM = (id) => apiClient.get(`/team-member/team-memb
 // General / Shared (Project Manager also uses these via legacy wrappers, or we can unify)
 export const fetchTasks = () => apiClient.get('/project-manager/tasks').then(res => res.data);
 export const fetchTeams = () => apiClient.get('/project-manager/teams').then(res => res.data);
+export const fetchDashboard = (limit = 5) => apiClient.get('/project-manager/dashboard', { params: { limit } }).then(res => res.data);
 export const createTeam = (team) => apiClient.post('/project-manager/create-team', team).then(res => res.data);
 export const fetchAllTeamMembers = () => apiClient.get('/project-manager/team-members').then(res => res.data);
 export const fetchTeamMembers = (teamId) => apiClient.get(`/project-manager/team-members/${teamId}`).then(res => res.data);
@@ -102,3 +104,49 @@ export const deleteUser = (userId) => apiClient.delete(`/project-manager/users/$
 
 export const updateTask = (taskId, task) => apiClient.put(`/project-manager/tasks/${taskId}`, task).then(res => res.data);
 export const deleteTask = (taskId) => apiClient.delete(`/project-manager/tasks/${taskId}`).then(res => res.data);
+
+// Task change events (Server-Sent Events). EventSource cannot send the
+// Authorization header, so the stream is read with fetch. `onEvent` gets
+// (event, data) for `task`, `remove` and `reset`; returns a function that
+// closes the stream. The server ends the stream when the user's teams
+// change, so it is reopened, like EventSource does.
+const subscribeTaskEvents = (path, onEvent) => {
+  const controller = new AbortController();
+  const read = async () => {
+    const response = await fetch(`${API_BASE}${path}`, {
+      headers: { Authorization: `Bearer ${localStorage.getItem('access_token')}` },
+      signal: controller.signal,
+    });
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += value;
+      const messages = buffer.split('\n\n');
+      buffer = messages.pop();
+      for (const message of messages) {
+        const fields = Object.fromEntries(
+          message.split('\n').filter((line) => line && !line.startsWith(':'))
+            .map((line) => [line.slice(0, line.indexOf(':')), line.slice(line.indexOf(':') + 1).trim()])
+        );
+        if (fields.event) onEvent(fields.event, JSON.parse(fields.data));
+      }
+    }
+  };
+  const run = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        await read();
+      } catch (error) {
+        if (error.name === 'AbortError') return;
+        onEvent('reset', {});
+      }
+      await new Promise((resolve) => setTimeout(resolve, 5000));
+    }
+  };
+  run();
+  return () => controller.abort();
+};
+export const subscribeTaskEventsTL = (onEvent) => subscribeTaskEvents('/team-lead/events', onEvent);
+export const subscribeTaskEventsTM = (onEvent) => subscribeTaskEvents('/team-member/events', onEvent);
@@ -1,5 +1,5 @@
 import { createSlice, createAsyncThunk } from '@reduxjs/toolkit';
-import { fetchTeams, fetchTasks, fetchAllTeamMembers, createTeam, updateTeam, deleteTeam } from './api';
+import { fetchDashboard, fetchTeams, fetchTasks, fetchAllTeamMembers, createTeam, updateTeam, deleteTeam } from './api';
 
 // Thunks for team operations
 export const createTeamThunk = createAsyncThunk(
@@ -7,7 +7,7 @@ export const createTeamThunk = createAsyncThunk(
     async ({ team }, thunkAPI) => {
         try {
             const res = await createTeam(team);
-            thunkAPI.dispatch(fetchDashboardData());
+            thunkAPI.dispatch(fetchManagementData());
             return res;
         } catch (error) {
             return thunkAPI.rejectWithValue('Failed to create team');
@@ -21,7 +21,7 @@ export const editTeamThunk = createAsyncThunk(
         try {
             console.log('Editing team:', teamId, team);
             const res = await updateTeam(teamId, team);
-            thunkAPI.dispatch(fetchDashboardData());
+            thunkAPI.dispatch(fetchManagementData());
             return res;
         } catch (error) {
             return thunkAPI.rejectWithValue('Failed to update team');
@@ -34,7 +34,7 @@ export const deleteTeamThunk = createAsyncThunk(
     async ({ teamId }, thunkAPI) => {
         try {
             const res = await deleteTeam(teamId);
-            thunkAPI.dispatch(fetchDashboardData());
+            thunkAPI.dispatch(fetchManagementData());
             return res;
         } catch (error) {
             return thunkAPI.rejectWithValue('Failed to delete team');
@@ -52,7 +52,7 @@ export const createMemberThunk = createAsyncThunk(
             // Import correctly or assume from header
             const { createTeamMember } = await import('./api');
             const res = await createTeamMember(member);
-            thunkAPI.dispatch(fetchDashboardData());
+            thunkAPI.dispatch(fetchManagementData());
             return res;
         } catch (error) {
             return thunkAPI.rejectWithValue('Failed to create member');
@@ -66,7 +66,7 @@ export const updateMemberThunk = createAsyncThunk(
         try {
             const { updateTeamMember } = await import('./api');
             const res = await updateTeamMember(userId, member);
-            thunkAPI.dispatch(fetchDashboardData());
+            thunkAPI.dispatch(fetchManagementData());
             return res;
         } catch (error) {
             return thunkAPI.rejectWithValue('Failed to update member');
@@ -80,7 +80,7 @@ export const deleteMemberThunk = createAsyncThunk(
         try {
             const { deleteUser } = await import('./api');
             const res = await deleteUser(userId);
-            thunkAPI.dispatch(fetchDashboardData());
+            thunkAPI.dispatch(fetchManagementData());
             return res;
         } catch (error) {
             return thunkAPI.rejectWithValue('Failed to delete member');
@@ -88,8 +88,22 @@ export const deleteMemberThunk = createAsyncThunk(
     }
 );
 
+// Counts and top lists computed by the server; its size does not grow with
+// the number of tasks, teams or members.
 export const fetchDashboardData = createAsyncThunk(
     'dashboard/fetchDashboardData',
+    async (_, thunkAPI) => {
+        try {
+            return await fetchDashboard();
+        } catch (error) {
+            return thunkAPI.rejectWithValue('Failed to fetch dashboard data');
+        }
+    }
+);
+
+// Full lists of teams, tasks and members, for the pages managing them.
+export const fetchManagementData = createAsyncThunk(
+    'dashboard/fetchManagementData',
     async (_, thunkAPI) => {
         try {
             const [teamsRes, tasksRes, membersRes] = await Promise.all([
@@ -103,7 +117,7 @@ export const fetchDashboardData = createAsyncThunk(
                 members: membersRes.members || [],
             };
         } catch (error) {
-            return thunkAPI.rejectWithValue('Failed to fetch dashboard data');
+            return thunkAPI.rejectWithValue('Failed to fetch teams, tasks and members');
         }
     }
 );
@@ -112,62 +126,21 @@ export const fetchTLDashboardData = createAsyncThunk(
     'dashboard/fetchTLDashboardData',
     async (_, thunkAPI) => {
         try {
-            // we need to dynamically import or rely on existing imports. 
-            // I'll assume they are imported. I need to update imports at top of file separately if not.
-            // Wait, replace_file_content is single block.
-            // I should have updated imports in a separate call or included them here?
-            // "Updated imports at top of file separately" - I haven't done that yet.
-            // I will assume I can update imports in a next step or use dynamic import here?
-            // Dynamic import is safer for this tool.
-
-            const { getTeamsTL, getTasksTL, getTeamMembersTL } = await import('./api');
-
-            const [teamsRes, tasksRes, membersRes] = await Promise.all([
-                getTeamsTL(), // returns axios response
-                getTasksTL(), // returns axios response, data is array or object?
-                getTeamMembersTL(), // returns axios response
-            ]);
-
-            // Checking api.js:
-            // getTeamsTL -> apiClient.get('/team-lead/teams') -> returns response
-            // Backend /teams returns ResponseTeamCollection -> { teams: [...] }
-            // So teamsRes.data.teams
-
-            // getTasksTL -> apiClient.get('/team-lead/tasks') -> returns response
-            // Backend /tasks returns List[TaskModel] -> [...]
-            // So tasksRes.data is the array.
-
-            // getTeamMembersTL -> apiClient.get('/team-lead/team-members') -> returns response
-            // Backend /team-members returns ResponseTeamMembersCollection -> { members: [...] } (Check team_lead.py?)
-            // team_lead.py does NOT have /team-members (get all). It has /team-members/{team_id}.
-            // Wait.
-            // team_lead.py: 
-            // @router.get("/team-members/{team_id}") ...
-            // @router.get("/team-member/{team_member_id}") ...
-            // It does NOT have a "get all team members" for team lead.
-            // So getTeamMembersTL in api.js:
-            // export const getTeamMembersTL = () => apiClient.get('/team-lead/team-members');
-            // This endpoint likely DOES NOT EXIST on backend for Team Lead if I didn't verify it.
-            // Let's check team_lead.py again.
-
-            // team_lead.py has NO `/team-members` (no arg). 
-            // It has `/team-members/{team_id}`.
-            // So `getTeamMembersTL` will 404.
-
-            // For now, let's just fetch teams and tasks. Members can be fetched per team if needed.
-            // Or I can add a endpoint to get all members of all managed teams.
-            // But getting teams is the priority.
-
-            const teams = teamsRes.data.teams || [];
-            const tasks = tasksRes.data || [];
-            // tasks is list, not object with tasks property?
-            // team_lead.py: @router.get("/tasks", response_model=List[TaskModel])
-            // Yes, list.
-
+            const { getBoardTL } = await import('./api');
+            // One request returns the lead's teams, their members and their
+            // tasks grouped by status. Each column holds the most recently
+            // updated tasks only; `count` is the status's full total.
+            const { data } = await getBoardTL();
+            const columns = (data.columns || []).map((column) => ({
+                status: column.status,
+                count: column.count,
+                tasks: column.tasks.map((task) => ({ ...task, status: column.status })),
+            }));
             return {
-                teams: teams,
-                tasks: tasks,
-                members: [], // Placeholder or fetch members for each team?
+                teams: data.teams || [],
+                tasks: columns.flatMap((column) => column.tasks),
+                columns,
+                members: data.members || [],
             };
         } catch (error) {
             console.error(error);
@@ -182,6 +155,8 @@ const dashboardSlice = createSlice({
         teams: [],
         tasks: [],
         members: [],
+        summary: null,
+        columns: [],
         loading: false,
         error: '',
     },
@@ -193,12 +168,24 @@ const dashboardSlice = createSlice({
                 state.error = '';
             })
             .addCase(fetchDashboardData.fulfilled, (state, action) => {
+                state.loading = false;
+                state.summary = action.payload;
+            })
+            .addCase(fetchDashboardData.rejected, (state, action) => {
+                state.loading = false;
+                state.error = action.payload || 'Error';
+            })
+            .addCase(fetchManagementData.pending, (state) => {
+                state.loading = true;
+                state.error = '';
+            })
+            .addCase(fetchManagementData.fulfilled, (state, action) => {
                 state.loading = false;
                 state.teams = action.payload.teams;
                 state.tasks = action.payload.tasks;
                 state.members = action.payload.members;
             })
-            .addCase(fetchDashboardData.rejected, (state, action) => {
+            .addCase(fetchManagementData.rejected, (state, action) => {
                 state.loading = false;
                 state.error = action.payload || 'Error';
             })
@@ -252,6 +239,7 @@ const dashboardSlice = createSlice({
                 state.loading = false;
                 state.teams = action.payload.teams;
                 state.tasks = action.payload.tasks;
+                state.columns = action.payload.columns;
                 state.members = action.payload.members;
             })
             .addCase(fetchTLDashboardData.rejected, (state, action) => {
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { Card, Elevation, FormGroup, InputGroup, Button, Callout, Spinner } from '@blueprintjs/core';
 import { useDispatch, useSelector } from 'react-redux';
-import { fetchDashboardData, createTeamThunk, editTeamThunk, deleteTeamThunk } from '../dashboardSlice';
+import { fetchManagementData, createTeamThunk, editTeamThunk, deleteTeamThunk } from '../dashboardSlice';
 
 const ProjectManagerTeamsPage = () => {
   const dispatch = useDispatch();
@@ -13,7 +13,7 @@ const ProjectManagerTeamsPage = () => {
   const [editTeamId, setEditTeamId] = useState(null);
 
   useEffect(() => {
-    dispatch(fetchDashboardData());
+    dispatch(fetchManagementData());
   }, [dispatch]);
 
   // Project managers can be filtered from members
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { Card, Elevation, FormGroup, InputGroup, Button, Callout, Spinner } from '@blueprintjs/core';
 import { useDispatch, useSelector } from 'react-redux';
-import { fetchDashboardData, createMemberThunk, updateMemberThunk, deleteMemberThunk } from '../dashboardSlice';
+import { fetchManagementData, createMemberThunk, updateMemberThunk, deleteMemberThunk } from '../dashboardSlice';
 
 const ProjectManagerUsersPage = () => {
   const dispatch = useDispatch();
@@ -15,7 +15,7 @@ const ProjectManagerUsersPage = () => {
 
 
   useEffect(() => {
-    dispatch(fetchDashboardData());
+    dispatch(fetchManagementData());
   }, [dispatch]);
 
   const handleSubmit = (e) => {
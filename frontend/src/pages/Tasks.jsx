@@ -1,6 +1,6 @@
 import React, { useEffect } from 'react';
 import { useDispatch, useSelector } from 'react-redux';
-import { fetchDashboardData } from '../dashboardSlice';
+import { fetchManagementData } from '../dashboardSlice';
 
 function Tasks() {
   const dispatch = useDispatch();
@@ -9,7 +9,7 @@ function Tasks() {
   useEffect(() => {
 
     if (token) {
-      dispatch(fetchDashboardData(token));
+      dispatch(fetchManagementData(token));
     }
   }, [dispatch]);
 
@@ -1,11 +1,11 @@
 import React, { useEffect } from 'react';
-import { Card, Elevation, Button, Callout, Spinner } from '@blueprintjs/core';
+import { Card, Elevation, Button, Callout, Spinner, Tag } from '@blueprintjs/core';
 import { useDispatch, useSelector } from 'react-redux';
 import { fetchTLDashboardData } from '../dashboardSlice';
 
 const TeamLeadTeamsPage = () => {
   const dispatch = useDispatch();
-  const { teams, loading, error } = useSelector(state => state.dashboard);
+  const { teams, columns, loading, error } = useSelector(state => state.dashboard);
   const token = useSelector((state) => state.user.access_token);
   useEffect(() => {
     dispatch(fetchTLDashboardData());
@@ -17,14 +17,32 @@ const TeamLeadTeamsPage = () => {
         <h2 style={{ textAlign: 'center', marginBottom: 24 }}>Manage Teams</h2>
         {error && <Callout intent="danger" style={{ marginBottom: 16 }}>{error}</Callout>}
         {loading ? <Spinner /> : (
-          <ul style={{ listStyle: 'none', padding: 0 }}>
-            {teams.map(team => (
-              <li key={team.id || team._id} style={{ display: 'flex', alignItems: 'center', justifyContent: 'space-between', padding: '8px 0', borderBottom: '1px solid #eee' }}>
-                <span>{team.name}</span>
-                <Button intent="text" />
-              </li>
+          <>
+            <ul style={{ listStyle: 'none', padding: 0 }}>
+              {teams.map(team => (
+                <li key={team.id || team._id} style={{ display: 'flex', alignItems: 'center', justifyContent: 'space-between', padding: '8px 0', borderBottom: '1px solid #eee' }}>
+                  <span>{team.name}</span>
+                  <Button intent="text" />
+                </li>
+              ))}
+            </ul>
+            {columns.map(column => (
+              <div key={column.status || 'none'} style={{ marginTop: 16 }}>
+                <h4 style={{ marginBottom: 8 }}>
+                  {column.status || 'no status'} <Tag minimal round>{column.count}</Tag>
+                </h4>
+                <ul style={{ listStyle: 'none', padding: 0, margin: 0 }}>
+                  {column.tasks.map(task => (
+                    <li key={task.task_id} style={{ padding: '4px 0' }}>{task.title}</li>
+                  ))}
+                </ul>
+                {/* The board only carries the latest tasks of each status. */}
+                {column.count > column.tasks.length && (
+                  <Tag minimal intent="primary">+{column.count - column.tasks.length} more</Tag>
+                )}
+              </div>
             ))}
-          </ul>
+          </>
         )}
       </Card>
     </div>
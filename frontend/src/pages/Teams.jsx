@@ -1,6 +1,6 @@
 import React, { useEffect } from 'react';
 import { useDispatch, useSelector } from 'react-redux';
-import { fetchDashboardData } from '../dashboardSlice';
+import { fetchManagementData } from '../dashboardSlice';
 
 function Teams() {
   const dispatch = useDispatch();
@@ -8,7 +8,7 @@ function Teams() {
   const token = useSelector((state) => state.user.access_token);
   useEffect(() => {
     if (token) {
-      dispatch(fetchDashboardData(token));
+      dispatch(fetchManagementData(token));
     }
   }, [dispatch]);
 
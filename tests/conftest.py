@@ -1,6 +1,11 @@
+import os
+# Hash passwords on the test thread instead of spawning worker processes.
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
 import pytest
 from mongomock_motor import AsyncMongoMockClient 
-from config.database import get_database
+from app.container import ServiceContainer
+from app.dependencies.services import get_services
 from app.dependencies.auth import require_roles,get_current_user
 from app.main import app
 from fastapi.testclient import TestClient
@@ -41,6 +46,20 @@ def override_get_current_user(mock_user:dict):
         return {"user_id": mock_user['id'], "role": mock_user['role']}
     return _override_get_current_user
 
+@pytest.fixture(autouse=True, scope="session")
+def mongomock_bulk_write_compat():
+    """pymongo>=4.11 passes `sort` to bulk update ops, which mongomock rejects."""
+    from mongomock.collection import BulkOperationBuilder
+
+    add_update = BulkOperationBuilder.add_update
+
+    def _add_update(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+
+    BulkOperationBuilder.add_update = _add_update
+    yield
+    BulkOperationBuilder.add_update = add_update
+
 @pytest.fixture(autouse=True)
 def get_mongo_db():
     return AsyncMongoMockClient()['task_management_dev']
@@ -52,6 +71,12 @@ async def mock_mongo():
     yield db
     client.close()
 
+async def mock_services():
+    # A freshly seeded database per request, as the application container
+    # would serve from the shared client.
+    async for db in mock_mongo():
+        yield ServiceContainer(db)
+
 async def setup_mock_db(db):
    
     # Insert mock data
@@ -89,14 +114,21 @@ async def setup_mock_db(db):
         "team_id": mock_team_id
     })
     
-    # Create a mock implementation of the team_tasks_view
-    # Since mongomock_motor doesn't fully support MongoDB views
-    await db['team_tasks_view'].insert_one({
+    # Create a mock implementation of the materialized team_tasks_view
+    # Since mongomock_motor doesn't support MongoDB views or $merge
+    await db['team_tasks'].insert_one({
         "_id": mock_task_id,
         "title": "Test Task Title",
         "status": "pending",
         "team_name": "Test Team",
-        "team_member": "Test Member"
+        "team_member": "Test Member",
+        "team_id": mock_team_id,
+        "assigned_to": mock_member_id,
+        "refreshed_at": datetime.now(timezone.utc)
+    })
+    await db['materialized_views'].insert_one({
+        "_id": "team_tasks",
+        "refreshed_at": datetime.now(timezone.utc)
     })
 
 # --- Role-Specific Client Fixtures ---
@@ -105,7 +137,7 @@ def project_manager_client():
     """Provides a TestClient instance with a Project Manager role."""
     # Temporarily override the dependency for this fixture's scope
     app.dependency_overrides[get_current_user] = override_get_current_user(MOCK_PROJECT_MANAGER_USER)
-    app.dependency_overrides[get_database] = mock_mongo
+    app.dependency_overrides[get_services] = mock_services
     with TestClient(app) as client:
         yield client
     # Clean up the dependency override after the tests in this module finish
@@ -116,7 +148,7 @@ def team_lead_client():
     """Provides a TestClient instance with a Team Lead role."""
   
     app.dependency_overrides[get_current_user] = override_get_current_user(MOCK_TEAM_LEAD_USER) 
-    app.dependency_overrides[get_database] = mock_mongo
+    app.dependency_overrides[get_services] = mock_services
     with TestClient(app) as client:
         yield client
     app.dependency_overrides = {}
@@ -126,7 +158,7 @@ def developer_client():
     """Provides a TestClient instance with a Developer role."""
     #app.dependency_overrides[require_roles] = override_require_roles(MOCK_DEVELOPER_USER)
     app.dependency_overrides[get_current_user] = override_get_current_user(MOCK_DEVELOPER_USER) 
-    app.dependency_overrides[get_database] = mock_mongo
+    app.dependency_overrides[get_services] = mock_services
     with TestClient(app) as client:
         yield client
     app.dependency_overrides = {}
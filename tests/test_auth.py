@@ -0,0 +1,117 @@
+import time
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import HTTPException
+from jose import jwt
+from app.dependencies import auth
+from app.dependencies.auth import TokenCache, get_current_user, get_managed_team_ids
+from bson import ObjectId
+from app.membership import membership_changes, membership_versions
+from app.routes.auth import create_access_token
+
+
+def make_token(exp_offset=60, **claims):
+    payload = {"sub": "1", "role": "team_lead", "exp": int(time.time()) + exp_offset}
+    payload.update(claims)
+    return jwt.encode(payload, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    auth.token_cache.clear()
+    membership_versions.clear()
+    yield
+    auth.token_cache.clear()
+    membership_versions.clear()
+
+
+def member_service(membership_version=0):
+    team_member_service = AsyncMock()
+    team_member_service.get_team_member_by_id.return_value = {
+        "membership_version": membership_version
+    }
+    return team_member_service
+
+
+def test_second_lookup_skips_decode(monkeypatch):
+    token = make_token()
+    user = get_current_user(token)
+    assert (user["user_id"], user["role"]) == ("1", "team_lead")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("token decoded twice")
+
+    monkeypatch.setattr(auth.jwt, "decode", fail)
+    assert get_current_user(token)["user_id"] == "1"
+    assert auth.token_cache.stats()["hits"] == 1
+    assert auth.token_cache.stats()["misses"] == 1
+
+
+def test_invalid_token_is_not_cached():
+    with pytest.raises(HTTPException):
+        get_current_user("not-a-token")
+    assert auth.token_cache.stats()["size"] == 0
+
+
+def test_entries_expire_at_exp():
+    cache = TokenCache(4)
+    cache.put("token", {"user_id": "1"}, time.time() - 1)
+    assert cache.get("token") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TokenCache(2)
+    expires_at = time.time() + 60
+    cache.put("a", {"user_id": "a"}, expires_at)
+    cache.put("b", {"user_id": "b"}, expires_at)
+    cache.get("a")
+    cache.put("c", {"user_id": "c"}, expires_at)
+    assert cache.get("b") is None
+    assert cache.get("a") == {"user_id": "a"}
+
+
+@pytest.mark.asyncio
+async def test_managed_teams_come_from_token_claims():
+    token = create_access_token(
+        {"_id": str(ObjectId()), "role": "team_lead"}, ["t1", "t2"]
+    )
+    team_service = AsyncMock()
+    team_member_service = member_service()
+
+    user = get_current_user(token)
+    team_ids = await get_managed_team_ids(user, team_service, team_member_service)
+    await get_managed_team_ids(user, team_service, team_member_service)
+
+    assert team_ids == ["t1", "t2"]
+    team_service.get_managed_teams.assert_not_awaited()
+    # The stored version is cached between requests.
+    team_member_service.get_team_member_by_id.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_membership_change_by_another_process_falls_back_to_lookup():
+    token = create_access_token({"_id": str(ObjectId()), "role": "team_lead"}, ["t1"])
+    team_service = AsyncMock()
+    team_service.get_managed_teams.return_value = {"t3": {}}
+
+    team_ids = await get_managed_team_ids(
+        get_current_user(token), team_service, member_service(membership_version=1)
+    )
+
+    assert team_ids == ["t3"]
+
+
+@pytest.mark.asyncio
+async def test_membership_change_falls_back_to_lookup():
+    token = create_access_token({"_id": "1", "role": "team_lead"}, ["t1"])
+    user = get_current_user(token)
+    team_service = AsyncMock()
+    team_service.get_managed_teams.return_value = {"t1": {}, "t3": {}}
+
+    membership_changes.record(["1"])
+    try:
+        team_ids = await get_managed_team_ids(user, team_service, member_service())
+    finally:
+        membership_changes.clear()
+
+    assert team_ids == ["t1", "t3"]
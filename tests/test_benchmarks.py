@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from app.seeding import SeedConfig, seed
+from benchmarks.scenarios import default_scenarios, load_actors
+from benchmarks.stats import Recorder, find_regressions, percentile
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([0.5], 99) == 0.5
+    assert percentile([], 95) == 0.0
+
+
+def test_recorder_summary_per_route_and_overall():
+    recorder = Recorder()
+    for ms in range(1, 11):
+        recorder.record("tl_board", ms / 1000, ok=True)
+    recorder.record("login", 0.2, ok=False)
+
+    summary = recorder.summary(elapsed=2.0)
+
+    assert summary["tl_board"]["requests"] == 10
+    assert summary["tl_board"]["rps"] == 5.0
+    assert summary["tl_board"]["p50_ms"] == 5.0
+    assert summary["tl_board"]["p99_ms"] == 10.0
+    assert summary["login"]["errors"] == 1
+    assert summary["all"]["requests"] == 11
+    assert summary["all"]["errors"] == 1
+
+
+def test_find_regressions_applies_tolerances():
+    baseline = {
+        "tl_board": {"rps": 100.0, "errors": 0, "p95_ms": 10.0, "p99_ms": 20.0},
+        "login": {"rps": 5.0, "errors": 0, "p95_ms": 80.0, "p99_ms": 90.0},
+    }
+    within = {
+        "tl_board": {"rps": 85.0, "errors": 0, "p95_ms": 11.9, "p99_ms": 23.0},
+        "login": {"rps": 5.0, "errors": 0, "p95_ms": 80.0, "p99_ms": 90.0},
+    }
+    assert find_regressions(within, baseline) == []
+
+    slower = {
+        "tl_board": {"rps": 70.0, "errors": 3, "p95_ms": 12.5, "p99_ms": 20.0},
+    }
+    regressions = find_regressions(slower, baseline)
+    assert len(regressions) == 4
+    assert regressions[0] == "login: missing from this run"
+    assert any("p95_ms" in message for message in regressions)
+    assert any("rps" in message for message in regressions)
+    assert any("failed requests" in message for message in regressions)
+
+
+@pytest.mark.asyncio
+async def test_load_actors_picks_developers_with_tasks(get_mongo_db):
+    await seed(get_mongo_db, SeedConfig(members=40, tasks=200, seed=3))
+
+    actors = await load_actors(get_mongo_db, per_role=2)
+
+    assert {a.role for a in actors["team_lead"]} == {"team_lead"}
+    assert len(actors["developer"]) == 2
+    scenarios = {s.name: s for s in default_scenarios("password123")}
+    for actor in actors["developer"]:
+        assert actor.task_ids
+        method, url, kwargs = scenarios["dev_status_update"].build(
+            actor, random.Random(0)
+        )
+        assert method == "PUT"
+        assert url.rsplit("/", 1)[1] in actor.task_ids
+        assert kwargs["json"]["status"] in ("in_progress", "completed")
@@ -0,0 +1,126 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from bson import ObjectId
+
+from app.main import app
+from app.repositories.team_repository import TeamRepository, board_pipeline
+from app.services.team_service import TeamService, get_team_service
+
+LEAD_ID = ObjectId()
+TEAM_ID = ObjectId()
+MEMBER_ID = ObjectId()
+TASK_ID = ObjectId()
+
+BOARD = {
+    "teams": [
+        {
+            "_id": TEAM_ID,
+            "name": "Core",
+            "member_ids": [MEMBER_ID],
+            "project_manager": LEAD_ID,
+        }
+    ],
+    "members": [
+        {
+            "_id": MEMBER_ID,
+            "name": "Ann",
+            "email": "ann@example.com",
+            "role": "developer",
+        }
+    ],
+    "columns": [
+        {
+            "_id": "in_progress",
+            "count": 7,
+            "tasks": [
+                {
+                    "_id": TASK_ID,
+                    "title": "Ship it",
+                    "team_id": TEAM_ID,
+                    "assigned_to": MEMBER_ID,
+                    "updated_at": datetime(2025, 1, 3),
+                }
+            ],
+        }
+    ],
+}
+
+
+@pytest.fixture
+def team_service():
+    repository = AsyncMock(get_board=AsyncMock(return_value=BOARD))
+    return TeamService(repository)
+
+
+def test_pipeline_fetches_members_and_tasks_with_one_lookup_each():
+    pipeline = board_pipeline(LEAD_ID, 10)
+
+    assert pipeline[0] == {"$match": {"project_manager": LEAD_ID}}
+    lookups = {s["$lookup"]["from"]: s["$lookup"] for s in pipeline if "$lookup" in s}
+    # Both joins run once, on the IDs folded from every team of the lead.
+    assert lookups["team_members"]["localField"] == "member_ids"
+    assert lookups["tasks"]["localField"] == "team_ids"
+    [group] = lookups["tasks"]["pipeline"]
+    assert group["$group"]["tasks"]["$topN"]["n"] == 10
+
+
+@pytest.mark.asyncio
+async def test_lead_without_teams_gets_an_empty_board(get_mongo_db):
+    repository = TeamRepository(get_mongo_db)
+    repository.collection.aggregate = AsyncMock(
+        return_value=AsyncMock(to_list=AsyncMock(return_value=[]))
+    )
+
+    board = await TeamService(repository).get_board(str(LEAD_ID), 20)
+
+    assert board.teams == [] and board.members == []
+    assert [column.count for column in board.columns] == [0] * 5
+
+
+@pytest.mark.asyncio
+async def test_board_lists_every_status_in_workflow_order(team_service):
+    board = await team_service.get_board(str(LEAD_ID), 20)
+
+    team_service.team_repository.get_board.assert_awaited_once_with(str(LEAD_ID), 20)
+    assert [column.status for column in board.columns] == [
+        "unassigned",
+        "assigned",
+        "pending",
+        "in_progress",
+        "completed",
+    ]
+    in_progress = board.columns[3]
+    assert in_progress.count == 7
+    assert in_progress.tasks[0].task_id == str(TASK_ID)
+
+
+@pytest.mark.asyncio
+async def test_board_lists_tasks_without_status_last():
+    board = {
+        **BOARD,
+        "columns": [{"_id": None, "count": 1, "tasks": [{"_id": TASK_ID}]}],
+    }
+    repository = AsyncMock(get_board=AsyncMock(return_value=board))
+
+    board = await TeamService(repository).get_board(str(LEAD_ID), 20)
+
+    assert len(board.columns) == 6
+    assert board.columns[-1].status is None
+    assert board.columns[-1].count == 1
+
+
+def test_board_endpoint(team_lead_client, team_service):
+    app.dependency_overrides[get_team_service] = lambda: team_service
+
+    response = team_lead_client.get("/team-lead/board?tasks_per_status=5")
+    too_many = team_lead_client.get("/team-lead/board?tasks_per_status=1000")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["teams"][0]["_id"] == str(TEAM_ID)
+    assert body["members"][0]["name"] == "Ann"
+    assert body["columns"][3]["tasks"][0]["_id"] == str(TASK_ID)
+    team_service.team_repository.get_board.assert_awaited_once_with("2", 5)
+    assert too_many.status_code == 422
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+from app.container import ServiceContainer
+from app.dependencies.services import get_services
+from app.services.task_service import get_task_service
+from app.services.team_member_service import get_team_member_service
+from app.services.team_service import get_team_service
+
+
+def test_container_wires_services_to_shared_repositories(get_mongo_db):
+    services = ServiceContainer(get_mongo_db)
+
+    assert services.task_service.task_repository is services.task_repository
+    assert services.team_service.team_repository is services.team_repository
+    assert (
+        services.team_member_service.team_member_repository
+        is services.team_member_repository
+    )
+
+
+def test_container_shares_one_view_and_one_set_of_counters(get_mongo_db):
+    services = ServiceContainer(get_mongo_db)
+
+    for holder in (
+        services.task_repository,
+        services.team_repository,
+        services.team_member_repository,
+        services.dashboard_service,
+    ):
+        assert holder.team_tasks is services.team_tasks
+        assert holder.versions is services.versions
+
+
+def test_providers_return_the_application_instances(get_mongo_db):
+    services = ServiceContainer(get_mongo_db)
+    state = SimpleNamespace(services=services)
+    request = SimpleNamespace(app=SimpleNamespace(state=state))
+
+    resolved = get_services(request)
+
+    assert resolved is services
+    assert get_task_service(resolved) is services.task_service
+    assert get_team_service(resolved) is services.team_service
+    assert get_team_member_service(resolved) is services.team_member_service
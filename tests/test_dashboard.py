@@ -0,0 +1,116 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import mongomock
+import pytest
+from bson import ObjectId
+
+from app.main import app
+from app.repositories.task_repository import dashboard_pipeline
+from app.services.dashboard_service import DashboardService, get_dashboard_service
+
+TEAM_ID = ObjectId()
+MEMBER_ID = ObjectId()
+TASK_ID = ObjectId()
+
+STATS = {
+    "total": [{"count": 3}],
+    "by_status": [{"_id": "pending", "count": 2}, {"_id": "completed", "count": 1}],
+    "unassigned": [],
+    "top_teams": [{"_id": TEAM_ID, "name": "Core", "tasks": 3, "completed": 1}],
+    "top_members": [{"_id": MEMBER_ID, "name": "Ann", "tasks": 3, "completed": 1}],
+    "recent_tasks": [
+        {
+            "_id": TASK_ID,
+            "title": "Ship it",
+            "status": "pending",
+            "team_id": TEAM_ID,
+            "assigned_to": MEMBER_ID,
+            "updated_at": datetime(2025, 1, 3),
+        }
+    ],
+}
+
+
+@pytest.fixture
+def dashboard_service():
+    return DashboardService(
+        AsyncMock(get_dashboard=AsyncMock(return_value=STATS)),
+        AsyncMock(count=AsyncMock(return_value=2)),
+        AsyncMock(count=AsyncMock(return_value=7)),
+    )
+
+
+def test_pipeline_computes_every_facet_in_one_pass():
+    db = mongomock.MongoClient()["task_management_dev"]
+    other_team = ObjectId()
+    db.teams.insert_many([{"_id": TEAM_ID, "name": "Core"}, {"_id": other_team}])
+    db.team_members.insert_one({"_id": MEMBER_ID, "name": "Ann"})
+    db.tasks.insert_many(
+        [
+            {
+                "status": "completed",
+                "team_id": TEAM_ID,
+                "assigned_to": MEMBER_ID,
+                "updated_at": datetime(2025, 1, 1),
+            },
+            {
+                "status": "pending",
+                "team_id": TEAM_ID,
+                "assigned_to": MEMBER_ID,
+                "updated_at": datetime(2025, 1, 3),
+            },
+            {
+                "status": "unassigned",
+                "team_id": other_team,
+                "assigned_to": None,
+                "updated_at": datetime(2025, 1, 2),
+            },
+        ]
+    )
+
+    [stats] = db.tasks.aggregate(dashboard_pipeline(1))
+
+    assert stats["total"] == [{"count": 3}]
+    assert stats["unassigned"] == [{"count": 1}]
+    assert stats["top_teams"] == [
+        {"_id": TEAM_ID, "name": "Core", "tasks": 2, "completed": 1}
+    ]
+    assert stats["top_members"][0]["name"] == "Ann"
+    assert [task["status"] for task in stats["recent_tasks"]] == ["pending"]
+
+
+@pytest.mark.asyncio
+async def test_dashboard_lists_every_status(dashboard_service):
+    dashboard = await dashboard_service.get_dashboard(5)
+
+    dashboard_service.task_repository.get_dashboard.assert_awaited_once_with(5)
+    assert dashboard.totals.model_dump() == {
+        "tasks": 3,
+        "teams": 2,
+        "members": 7,
+        "unassigned_tasks": 0,
+    }
+    assert dashboard.tasks_by_status == {
+        "unassigned": 0,
+        "assigned": 0,
+        "pending": 2,
+        "in_progress": 0,
+        "completed": 1,
+    }
+
+
+def test_dashboard_endpoint(project_manager_client, dashboard_service):
+    app.dependency_overrides[get_dashboard_service] = lambda: dashboard_service
+
+    response = project_manager_client.get("/project-manager/dashboard?limit=5")
+    too_many = project_manager_client.get("/project-manager/dashboard?limit=500")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["top_teams"] == [
+        {"team_id": str(TEAM_ID), "name": "Core", "tasks": 3, "completed": 1}
+    ]
+    assert body["recent_tasks"][0]["task_id"] == str(TASK_ID)
+    assert body["recent_tasks"][0]["updated_at"].startswith("2025-01-03T00:00:00")
+    assert too_many.status_code == 422
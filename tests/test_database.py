@@ -0,0 +1,18 @@
+import pytest
+from config.database import DatabaseSettings
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("ENV", "prod")
+    monkeypatch.setenv("DB_MAX_POOL_SIZE", "50")
+    monkeypatch.setenv("DB_WAIT_QUEUE_TIMEOUT_MS", "2000")
+    settings = DatabaseSettings.from_env()
+    assert settings.db_name == "task_management"
+    assert settings.max_pool_size == 50
+    assert settings.wait_queue_timeout_ms == 2000
+
+
+def test_client_options_skip_unset_wait_queue_timeout():
+    options = DatabaseSettings(max_pool_size=10).client_options()
+    assert options["maxPoolSize"] == 10
+    assert "waitQueueTimeoutMS" not in options
@@ -1,3 +1,4 @@
+import json
 import pytest
  
 
@@ -23,3 +24,55 @@ async def test_create_team_member(project_manager_client):
     response = project_manager_client.post("/project-manager/team-member", json=data)
     assert response.status_code == 200
     assert response.json()["name"] == "John"
+
+@pytest.mark.asyncio
+async def test_get_teams_page(project_manager_client):
+    response = project_manager_client.get("/project-manager/teams?limit=1")
+    assert response.status_code == 200
+    assert len(response.json()["teams"]) == 1
+    assert response.json()["has_more"] is False
+
+@pytest.mark.asyncio
+async def test_get_teams_invalid_cursor(project_manager_client):
+    response = project_manager_client.get("/project-manager/teams?cursor=bad")
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_stream_tasks_as_ndjson(project_manager_client):
+    response = project_manager_client.get(
+        "/project-manager/tasks", headers={"Accept": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows[0]["title"] == "Test Task Title"
+    assert "team_id" not in rows[0]
+
+@pytest.mark.asyncio
+async def test_stream_team_members_skips_undeclared_fields(project_manager_client):
+    response = project_manager_client.get(
+        "/project-manager/team-members", headers={"Accept": "application/x-ndjson"}
+    )
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows[0]["name"] == "Test Member"
+    assert "hashed_password" not in rows[0]
+
+@pytest.mark.asyncio
+async def test_get_team_members_fetches_response_fields_only(project_manager_client):
+    response = project_manager_client.get("/project-manager/team-members")
+    assert response.status_code == 200
+    member = response.json()["members"][0]
+    assert member["name"] == "Test Member"
+    assert "hashed_password" not in member
+
+@pytest.mark.asyncio
+async def test_bulk_create_tasks_reports_each_item(team_lead_client):
+    data = {"tasks": [
+        {"title": "No Team"},
+        {"title": "Unknown Team", "team_id": "64b7f0c2a1b2c3d4e5f60718"},
+    ]}
+    response = team_lead_client.post("/team-lead/tasks/bulk", json=data)
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["status_code"] for r in body["results"]] == [200, 404]
+    assert body["succeeded"] == 1 and body["failed"] == 1
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app.container import ServiceContainer
+from app.database.versions import (
+    TASKS_SCOPE,
+    TEAMS_SCOPE,
+    VersionCounters,
+    team_tasks_scope,
+)
+from app.dependencies.auth import get_managed_team_ids
+from app.dependencies.etags import etag_matches
+from app.dependencies.services import get_services
+from app.main import app
+
+TEAM_ID = ObjectId()
+
+
+@pytest.fixture
+def services():
+    """
+    One container on one database for the whole test, so that writes are
+    seen by the following requests.
+    """
+    container = ServiceContainer(AsyncMongoMockClient()["etags"])
+    app.dependency_overrides[get_services] = lambda: container
+    yield container
+
+
+@pytest.mark.asyncio
+async def test_version_counters_bump_and_get():
+    versions = VersionCounters(AsyncMongoMockClient()["etags"])
+    assert await versions.get([TEAMS_SCOPE]) == {TEAMS_SCOPE: None}
+
+    await versions.bump([TEAMS_SCOPE, TEAMS_SCOPE])
+    [(epoch, first)] = (await versions.get([TEAMS_SCOPE])).values()
+    await versions.bump([TEAMS_SCOPE])
+    [(same_epoch, second)] = (await versions.get([TEAMS_SCOPE])).values()
+
+    assert (first, second) == (1, 2)
+    assert same_epoch == epoch
+
+
+@pytest.mark.asyncio
+async def test_task_writes_bump_team_scope_or_global_scope():
+    container = ServiceContainer(AsyncMongoMockClient()["etags"])
+    scopes = [TASKS_SCOPE, team_tasks_scope(TEAM_ID)]
+
+    await container.task_repository.create({"title": "A", "team_id": str(TEAM_ID)})
+    after_create = await container.versions.get(scopes)
+    assert after_create[TASKS_SCOPE] is None
+    assert after_create[team_tasks_scope(TEAM_ID)][1] == 1
+
+    result = await container.task_repository.create({"title": "B"})
+    await container.task_repository.delete(str(result.inserted_id))
+    after_delete = await container.versions.get(scopes)
+    assert after_delete[TASKS_SCOPE][1] == 1
+    assert after_delete[team_tasks_scope(TEAM_ID)][1] == 1
+
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"a"')
+
+
+def test_teams_answered_with_304_until_a_team_changes(project_manager_client, services):
+    first = project_manager_client.get("/project-manager/teams")
+    etag = first.headers["ETag"]
+
+    cached = project_manager_client.get(
+        "/project-manager/teams", headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    other_page = project_manager_client.get(
+        "/project-manager/teams?limit=1", headers={"If-None-Match": etag}
+    )
+    assert other_page.status_code == 200
+
+    project_manager_client.post(
+        "/project-manager/create-team", json={"name": "New team"}
+    )
+    changed = project_manager_client.get(
+        "/project-manager/teams", headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert [team["name"] for team in changed.json()["teams"]] == ["New team"]
+
+
+def test_team_lead_tasks_etag_follows_the_teams_tasks(team_lead_client, services):
+    app.dependency_overrides[get_managed_team_ids] = lambda: [str(TEAM_ID)]
+    etag = team_lead_client.get("/team-lead/tasks").headers["ETag"]
+
+    def get_tasks():
+        return team_lead_client.get("/team-lead/tasks", headers={"If-None-Match": etag})
+
+    assert get_tasks().status_code == 304
+
+    create = services.task_repository.create
+    asyncio.run(create({"title": "Elsewhere", "team_id": str(ObjectId())}))
+    assert get_tasks().status_code == 304
+
+    asyncio.run(create({"title": "Ours", "team_id": str(TEAM_ID)}))
+    changed = get_tasks()
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert [task["title"] for task in changed.json()] == ["Ours"]
@@ -0,0 +1,251 @@
+import asyncio
+import os
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import PyMongoError
+
+from app import events
+from app.events import Subscription, TaskEventHub, sse_events, task_change
+from app.repositories.task_repository import TaskRepository
+
+TEAM_ID = ObjectId()
+MEMBER_ID = ObjectId()
+
+
+def change(
+    operation="update", team_id=TEAM_ID, updated=(), task_id=None, before=None, **task
+):
+    event = {
+        "operationType": operation,
+        "documentKey": {"_id": task_id or ObjectId()},
+        "updateDescription": {"updatedFields": dict.fromkeys(updated, 1)},
+    }
+    if before is not None:
+        event["fullDocumentBeforeChange"] = before
+    if operation != "delete":
+        event["fullDocument"] = {"team_id": team_id, "assigned_to": MEMBER_ID, **task}
+    return event
+
+
+class FakeChangeStream:
+    """
+    Async change stream yielding the events put in `queue`, or raising the
+    exceptions put there.
+    """
+
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self.queue.get()
+        if isinstance(event, Exception):
+            raise event
+        return event
+
+
+def fake_repository(queue: asyncio.Queue):
+    repository = MagicMock()
+
+    async def watch(fields, previous_fields=()):
+        return FakeChangeStream(queue)
+
+    repository.watch = MagicMock(side_effect=watch)
+    repository.enable_pre_images = AsyncMock(return_value=True)
+    return repository
+
+
+def test_task_change_scopes_and_moves():
+    updated = task_change(change(updated=["status"], status="completed"))
+    assert updated.team_id == str(TEAM_ID)
+    assert updated.assigned_to == str(MEMBER_ID)
+    assert updated.task["status"] == "completed"
+    assert not updated.moved
+
+    assert task_change(change(updated=["team_id"])).moved
+    deleted = task_change(change("delete"))
+    assert deleted.task is None and deleted.moved
+
+
+@pytest.mark.asyncio
+async def test_update_event_carries_advanced_updated_at(get_mongo_db):
+    repository = TaskRepository(get_mongo_db)
+    repository.team_tasks.refresh_tasks = AsyncMock()
+    # Read back naive, in UTC, as with the default codec options.
+    created = datetime(2025, 1, 1)
+    task_id = ObjectId()
+    await repository.collection.insert_one(
+        {"_id": task_id, "team_id": TEAM_ID, "status": "pending", "updated_at": created}
+    )
+
+    await repository.update_and_get(str(task_id), {"status": "completed"})
+    # The event as the change stream delivers it after this update.
+    document = await repository.collection.find_one({"_id": task_id})
+    updated = task_change(
+        change(task_id=task_id, updated=["status", "updated_at"], **document)
+    )
+
+    assert updated.task["status"] == "completed"
+    assert updated.task["updated_at"] > created
+
+
+@pytest.mark.asyncio
+async def test_subscription_coalesces_filters_and_removes():
+    subscription = Subscription(10, team_ids=[str(TEAM_ID)])
+    task_id = ObjectId()
+    subscription.push(task_change(change(task_id=task_id, status="pending")))
+    subscription.push(task_change(change(task_id=task_id, status="completed")))
+    subscription.push(task_change(change(team_id=ObjectId())))
+    assert await subscription.next_events(1) == [
+        ("task", {**task_change(change(task_id=task_id)).task, "status": "completed"}),
+    ]
+
+    # Moved away after being sent, and known from the pre-image only.
+    subscription.push(
+        task_change(change(task_id=task_id, team_id=ObjectId(), updated=["team_id"]))
+    )
+    listed = task_change(change("delete", before={"team_id": TEAM_ID}))
+    subscription.push(listed)
+    assert await subscription.next_events(1) == [
+        ("remove", {"task_id": str(task_id)}),
+        ("remove", {"task_id": listed.task_id}),
+    ]
+    assert await subscription.next_events(0.01) == []
+
+
+@pytest.mark.asyncio
+async def test_removals_are_not_sent_outside_the_scope():
+    other_team = Subscription(10, team_ids=[str(ObjectId())])
+    other_member = Subscription(10, assigned_to=str(ObjectId()))
+    task_id = ObjectId()
+    for moved_or_deleted in (
+        change(task_id=task_id, team_id=ObjectId(), updated=["team_id", "assigned_to"]),
+        change("delete", task_id=task_id, before={"team_id": TEAM_ID}),
+        change("delete"),
+    ):
+        other_team.push(task_change(moved_or_deleted))
+        other_member.push(task_change(moved_or_deleted))
+
+    assert await other_team.next_events(0.01) == []
+    assert await other_member.next_events(0.01) == []
+
+
+@pytest.mark.asyncio
+async def test_subscription_resets_when_too_far_behind():
+    subscription = Subscription(2, assigned_to=str(MEMBER_ID))
+    for _ in range(3):
+        subscription.push(task_change(change()))
+    assert subscription.pending == 0
+    assert await subscription.next_events(1) == [("reset", {})]
+
+    subscription.push(task_change(change()))
+    [(event, _)] = await subscription.next_events(1)
+    assert event == "task"
+
+
+@pytest.mark.asyncio
+async def test_hub_shares_one_change_stream(monkeypatch):
+    monkeypatch.setattr(events, "CHANGE_STREAM_RETRY_SECONDS", 0)
+    queue = asyncio.Queue()
+    repository = fake_repository(queue)
+    hub = TaskEventHub(repository)
+    lead = hub.subscribe(team_ids=[str(TEAM_ID)])
+    developer = hub.subscribe(assigned_to=str(MEMBER_ID))
+
+    await queue.put(change(status="completed"))
+    [(event, data)] = await lead.next_events(1)
+    assert (event, data["status"]) == ("task", "completed")
+    assert [e for e, _ in await developer.next_events(1)] == ["task"]
+    assert repository.watch.call_count == 1
+
+    # A failed stream is reopened and the clients told to reload.
+    await queue.put(PyMongoError("connection lost"))
+    assert await lead.next_events(1) == [("reset", {})]
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert repository.watch.call_count == 2
+    assert hub.stats()["stream_failures"] == 1
+
+    # So is a consumer failing on an unexpected event.
+    await queue.put({"operationType": "update"})
+    assert await lead.next_events(1) == [("reset", {})]
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert repository.watch.call_count == 3
+    repository.enable_pre_images.assert_awaited_once()
+
+    hub.unsubscribe(lead)
+    assert hub.stats()["streaming"] == 1
+    hub.unsubscribe(developer)
+    assert hub.stats() == {
+        "subscriptions": 0,
+        "pending_events": 0,
+        "changes": 1,
+        "stream_failures": 2,
+        "streaming": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_sse_events_writes_batches_and_unsubscribes():
+    hub = TaskEventHub(fake_repository(asyncio.Queue()))
+    subscription = hub.subscribe(assigned_to=str(MEMBER_ID))
+    stream = sse_events(hub, subscription, heartbeat=0.01)
+
+    assert await stream.__anext__() == b"retry: 5000\n\n"
+    assert await stream.__anext__() == b": keep-alive\n\n"
+    subscription.reset()
+    assert await stream.__anext__() == b"event: reset\ndata: {}\n\n"
+
+    await stream.aclose()
+    assert hub.stats()["subscriptions"] == 0
+
+
+@pytest.mark.skipif(
+    not os.getenv("MONGO_REPLICA_SET_URL"),
+    reason="needs a replica set, e.g. a local single-node one",
+)
+@pytest.mark.asyncio
+async def test_change_stream_against_replica_set():
+    from pymongo import AsyncMongoClient
+
+    from app.repositories.task_repository import TaskRepository
+
+    client = AsyncMongoClient(os.environ["MONGO_REPLICA_SET_URL"])
+    try:
+        repository = TaskRepository(client["task_events_test"])
+        hub = TaskEventHub(repository)
+        subscription = hub.subscribe(team_ids=[str(TEAM_ID)])
+        # Let the change stream open before writing.
+        await asyncio.sleep(1)
+        await repository.create({"title": "Live", "team_id": str(TEAM_ID)})
+        [(event, data)] = await subscription.next_events(10)
+        assert (event, data["title"]) == ("task", "Live")
+        await hub.close()
+    finally:
+        await client.drop_database("task_events_test")
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_sse_events_end_when_the_scope_changes():
+    hub = TaskEventHub(fake_repository(asyncio.Queue()))
+    subscription = hub.subscribe(team_ids=[str(TEAM_ID)])
+    still_valid = AsyncMock(return_value=False)
+    stream = sse_events(hub, subscription, heartbeat=0.01, still_valid=still_valid)
+
+    chunks = [chunk async for chunk in stream]
+
+    assert chunks == [b"retry: 5000\n\n", b"event: reset\ndata: {}\n\n"]
+    assert hub.stats()["subscriptions"] == 0
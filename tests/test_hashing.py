@@ -0,0 +1,23 @@
+import pytest
+from app.hashing import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_in_worker_process():
+    hasher = PasswordHasher(workers=1, max_concurrency=2)
+    try:
+        hashed = await hasher.hash("secret")
+        assert await hasher.verify("secret", hashed)
+        assert not await hasher.verify("wrong", hashed)
+    finally:
+        hasher.shutdown()
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["running"] == 0 and stats["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_inline_mode_without_workers():
+    hasher = PasswordHasher(workers=0, max_concurrency=1)
+    hashed = await hasher.hash("secret")
+    assert await hasher.verify("secret", hashed)
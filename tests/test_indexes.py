@@ -0,0 +1,44 @@
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.database.views import (
+    INDEX_DEFINITIONS,
+    check_server_version,
+    create_indexes,
+    verify_indexes,
+)
+
+
+@pytest.mark.asyncio
+async def test_create_indexes_is_idempotent(get_mongo_db):
+    await create_indexes(get_mongo_db)
+    await create_indexes(get_mongo_db)
+    report = await verify_indexes(get_mongo_db)
+    assert report == {}
+
+
+@pytest.mark.asyncio
+async def test_verify_indexes_reports_drift(get_mongo_db):
+    await get_mongo_db["team_members"].create_index("email", name="email_unique")
+    await get_mongo_db["tasks"].create_index("title", name="title")
+    report = await verify_indexes(get_mongo_db)
+    assert report["team_members"]["mismatched"] == ["email_unique"]
+    assert report["tasks"]["unexpected"] == ["title"]
+    assert len(report["teams"]["missing"]) == len(INDEX_DEFINITIONS["teams"])
+
+
+@pytest.mark.asyncio
+async def test_check_server_version_warns_below_minimum(caplog):
+    db = MagicMock()
+    db.command = AsyncMock(
+        return_value={"version": "5.0.14", "versionArray": [5, 0, 14, 0]}
+    )
+    with caplog.at_level(logging.WARNING):
+        assert await check_server_version(db) == (5, 0, 14)
+    assert "older than 5.2" in caplog.text
+
+    caplog.clear()
+    db.command.return_value = {"version": "7.0.2", "versionArray": [7, 0, 2, 0]}
+    assert await check_server_version(db) == (7, 0, 2)
+    assert caplog.text == ""
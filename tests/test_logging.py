@@ -0,0 +1,98 @@
+import json
+import logging
+import queue
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.logging_config import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestIdFilter,
+    RequestIdMiddleware,
+    SamplingFilter,
+    get_logger,
+    parse_sample_rates,
+)
+
+
+def _record(name="task_management_app.repositories.task_repository", level=20):
+    return logging.LogRecord(name, level, __file__, 1, "Task %s", ("abc",), None)
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("") == {}
+    assert parse_sample_rates(" a.b=0.25, c=2 ,") == {"a.b": 0.25, "c": 1.0}
+
+
+def test_sampling_uses_most_specific_logger_and_keeps_warnings():
+    sampling = SamplingFilter(
+        {
+            "task_management_app": 1.0,
+            "task_management_app.repositories": 0.0,
+        }
+    )
+
+    assert sampling.filter(_record("task_management_app.services.task_service"))
+    assert not sampling.filter(_record())
+    assert sampling.filter(_record(level=logging.WARNING))
+    with patch("app.logging_config.random.random", return_value=0.05):
+        assert SamplingFilter({"task_management_app": 0.1}).filter(_record())
+
+
+def test_queue_handler_interpolates_message_and_drops_when_full():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    record = _record()
+
+    handler.handle(record)
+    handler.handle(_record())
+
+    queued = handler.queue.get_nowait()
+    assert queued is record
+    assert queued.msg == "Task abc" and queued.args is None
+    assert queued.getMessage() == "Task abc"
+    assert handler.dropped == 1
+
+
+def test_json_formatter_includes_request_id_and_extra_fields():
+    record = _record()
+    record.task_count = 3
+    record.request_id = "req-1"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "Task abc"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "task_management_app.repositories.task_repository"
+    assert entry["request_id"] == "req-1"
+    assert entry["task_count"] == 3
+
+
+def test_get_logger_nests_modules_under_the_app_logger():
+    assert get_logger("app.services.team_service").name == (
+        "task_management_app.services.team_service"
+    )
+
+
+def test_request_id_is_set_for_logs_and_returned():
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+    seen = []
+
+    @app.get("/")
+    def read_root():
+        record = _record()
+        RequestIdFilter().filter(record)
+        seen.append(record.request_id)
+        return {}
+
+    client = TestClient(app)
+    generated = client.get("/")
+    forwarded = client.get("/", headers={"X-Request-ID": "trace-42"})
+    rejected = client.get("/", headers={"X-Request-ID": "bad id\n"})
+
+    assert generated.headers["x-request-id"] == seen[0]
+    assert len(seen[0]) == 32
+    assert forwarded.headers["x-request-id"] == seen[1] == "trace-42"
+    assert rejected.headers["x-request-id"] == seen[2] != "bad id\n"
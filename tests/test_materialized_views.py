@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from app.database.materialized_views import TeamTasksMaterializedView
+
+
+@pytest.fixture
+def team_tasks(get_mongo_db):
+    return TeamTasksMaterializedView(get_mongo_db)
+
+
+@pytest.mark.asyncio
+async def test_refresh_tasks_merges_only_touched_tasks(team_tasks):
+    task_id = ObjectId()
+    team_tasks.source.aggregate = AsyncMock()
+    await team_tasks.refresh_tasks([str(task_id)])
+    pipeline = team_tasks.source.aggregate.call_args.args[0]
+    assert pipeline[0] == {"$match": {"_id": {"$in": [task_id]}}}
+    assert pipeline[-1]["$merge"]["into"] == "team_tasks"
+
+
+@pytest.mark.asyncio
+async def test_merge_keeps_rows_of_a_later_refresh(team_tasks):
+    team_tasks.source.aggregate = AsyncMock()
+    await team_tasks.refresh_tasks([str(ObjectId())])
+    merge = team_tasks.source.aggregate.call_args.args[0][-1]["$merge"]
+    [replace] = merge["whenMatched"]
+    condition, new, current = replace["$replaceWith"]["$cond"]
+    assert condition == {"$gte": ["$$new.refreshed_at", "$refreshed_at"]}
+    assert (new, current) == ("$$new", "$$ROOT")
+
+
+@pytest.mark.asyncio
+async def test_stale_rows_are_served_and_rebuilt_in_the_background(team_tasks):
+    await team_tasks.state.insert_one(
+        {
+            "_id": "team_tasks",
+            "refreshed_at": datetime.now(timezone.utc) - timedelta(hours=1),
+        }
+    )
+    await team_tasks.collection.insert_one({"title": "Stale row"})
+    team_tasks.source.aggregate = AsyncMock()
+    cursor = await team_tasks.find()
+    rows = await cursor.to_list(length=None)
+    assert rows[0]["title"] == "Stale row"
+    team_tasks.source.aggregate.assert_not_called()
+
+    team_tasks.state_check_seconds = 0
+    maintenance = asyncio.create_task(team_tasks.maintain())
+    await asyncio.sleep(0.01)
+    maintenance.cancel()
+    team_tasks.source.aggregate.assert_called()
+    assert await team_tasks.is_fresh()
+
+
+@pytest.mark.asyncio
+async def test_readers_check_the_state_at_most_once_per_interval(team_tasks):
+    team_tasks.source.aggregate = AsyncMock()
+    await team_tasks.rebuild()
+    team_tasks.state.find_one = AsyncMock()
+    await team_tasks.find()
+    await team_tasks.find()
+    team_tasks.state.find_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_find_falls_back_to_view_until_rows_are_built(team_tasks):
+    await team_tasks.view.insert_one({"title": "From view"})
+    team_tasks.source.aggregate = AsyncMock(side_effect=Exception("boom"))
+    assert not await team_tasks.ensure_fresh()
+    cursor = await team_tasks.find()
+    rows = await cursor.to_list(length=None)
+    assert rows[0]["title"] == "From view"
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.metrics import (
+    RequestMetrics,
+    RequestTimings,
+    TimedJSONResponse,
+    TimingMiddleware,
+    db_command_listener,
+    server_timing,
+)
+
+
+@pytest.fixture
+def timed_app():
+    metrics = RequestMetrics()
+    app = FastAPI(default_response_class=TimedJSONResponse)
+    app.add_middleware(TimingMiddleware, metrics=metrics)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: str):
+        # Stands in for two MongoDB commands issued by the endpoint.
+        db_command_listener.succeeded(SimpleNamespace(duration_micros=1500))
+        db_command_listener.failed(SimpleNamespace(duration_micros=500))
+        return {"item_id": item_id}
+
+    @app.get("/events")
+    async def read_events():
+        return StreamingResponse(iter(["data: 1\n\n"]), media_type="text/event-stream")
+
+    return TestClient(app), metrics
+
+
+def test_server_timing_attributes_db_time_to_the_request(timed_app):
+    client, _ = timed_app
+
+    response = client.get("/items/1")
+
+    assert response.status_code == 200
+    parts = dict(
+        part.split(";", 1) for part in response.headers["server-timing"].split(", ")
+    )
+    assert parts["db"] == 'dur=2.00;desc="2 commands"'
+    assert set(parts) == {"db", "render", "app", "total"}
+
+
+def test_metrics_are_grouped_by_route_template(timed_app):
+    client, metrics = timed_app
+
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/missing")
+
+    text = metrics.render()
+    labels = 'method="GET",route="/items/{item_id}"'
+    assert f'http_requests_total{{{labels},status="200"}} 2' in text
+    assert f'http_request_duration_seconds_count{{{labels}}} 2' in text
+    assert f'http_request_db_seconds_bucket{{{labels},le="0.0025"}} 2' in text
+    assert f"http_request_db_commands_total{{{labels}}} 4" in text
+    assert 'route="unmatched",status="404"} 1' in text
+    assert "/items/1" not in text
+
+
+def test_listener_outside_a_request_is_ignored():
+    db_command_listener.succeeded(SimpleNamespace(duration_micros=1000))
+
+
+def test_server_timing_splits_total():
+    timings = RequestTimings(db_seconds=0.004, db_commands=3, render_seconds=0.001)
+
+    header = server_timing(0.010, timings)
+
+    assert header == (
+        'db;dur=4.00;desc="3 commands", render;dur=1.00, app;dur=5.00, '
+        "total;dur=10.00"
+    )
+
+
+def test_streams_are_kept_out_of_latency_histograms(timed_app):
+    client, metrics = timed_app
+
+    client.get("/events")
+
+    text = metrics.render()
+    labels = 'method="GET",route="/events"'
+    assert f'http_requests_total{{{labels},status="200"}} 1' in text
+    assert f"http_stream_seconds_total{{{labels}}}" in text
+    assert f"http_request_duration_seconds_count{{{labels}}}" not in text
+
+
+def test_metrics_endpoint_is_exposed(project_manager_client):
+    project_manager_client.get("/project-manager/teams")
+
+    response = project_manager_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/project-manager/teams"' in response.text
+
+
+@pytest.mark.parametrize("path", ["/metrics", "/health/db-pool", "/health/token-cache"])
+def test_operational_endpoints_are_for_project_managers(team_lead_client, path):
+    assert team_lead_client.get(path).status_code == 403
@@ -0,0 +1,78 @@
+import pytest
+from unittest.mock import AsyncMock
+from bson import ObjectId
+from app.database import migrations
+from app.database.materialized_views import TeamTasksMaterializedView
+
+
+@pytest.fixture(autouse=True)
+def skip_rebuild(monkeypatch):
+    monkeypatch.setattr(TeamTasksMaterializedView, "rebuild", AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_references_are_rewritten_to_object_ids(get_mongo_db):
+    team_id, member_id = ObjectId(), ObjectId()
+    for _ in range(3):
+        await get_mongo_db["tasks"].insert_one(
+            {"title": "Task", "team_id": str(team_id), "assigned_to": str(member_id)}
+        )
+    await get_mongo_db["team_members"].insert_one(
+        {"name": "John", "teams": [str(team_id)]}
+    )
+
+    applied = await migrations.run_migrations(get_mongo_db, batch_size=2, pause_seconds=0)
+
+    assert applied == [1]
+    async for task in get_mongo_db["tasks"].find():
+        assert task["team_id"] == team_id
+        assert task["assigned_to"] == member_id
+    member = await get_mongo_db["team_members"].find_one({"name": "John"})
+    assert member["teams"] == [team_id]
+    assert await migrations.pending_migrations(get_mongo_db) == []
+
+
+@pytest.mark.asyncio
+async def test_interrupted_migration_resumes_from_checkpoint(get_mongo_db):
+    first, second = ObjectId(), ObjectId()
+    await get_mongo_db["tasks"].insert_many(
+        [
+            {"_id": first, "team_id": str(ObjectId())},
+            {"_id": second, "team_id": str(ObjectId())},
+        ]
+    )
+    migration = migrations.CanonicalObjectIdReferences(get_mongo_db, 1, 0)
+    await migration.save_checkpoint("tasks", first)
+
+    await migration.up()
+
+    untouched = await get_mongo_db["tasks"].find_one({"_id": first})
+    rewritten = await get_mongo_db["tasks"].find_one({"_id": second})
+    assert isinstance(untouched["team_id"], str)
+    assert isinstance(rewritten["team_id"], ObjectId)
+
+
+def test_migrations_must_implement_up():
+    class Incomplete(migrations.Migration):
+        version, name = 99, "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete(None, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_startup_refuses_pending_migrations_on_existing_data(get_mongo_db):
+    await get_mongo_db["tasks"].insert_one({"team_id": str(ObjectId())})
+
+    with pytest.raises(RuntimeError, match="canonical_object_id_references"):
+        await migrations.ensure_migrated(get_mongo_db)
+
+    await migrations.run_migrations(get_mongo_db, pause_seconds=0)
+    await migrations.ensure_migrated(get_mongo_db)
+
+
+@pytest.mark.asyncio
+async def test_empty_database_is_marked_migrated(get_mongo_db):
+    await migrations.ensure_migrated(get_mongo_db)
+
+    assert await migrations.pending_migrations(get_mongo_db) == []
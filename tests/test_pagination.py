@@ -0,0 +1,36 @@
+import pytest
+from bson import ObjectId
+from app.pagination import build_page, decode_cursor, encode_cursor
+from app.repositories.team_member_repository import TeamMemberRepository
+
+
+def test_cursor_round_trip():
+    obj_id = ObjectId()
+    assert decode_cursor(encode_cursor(obj_id)) == obj_id
+
+
+def test_invalid_cursor_raises():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_build_page_uses_extra_document_for_has_more():
+    documents = [{"_id": ObjectId()} for _ in range(3)]
+    page = build_page(documents, 2)
+    assert len(page.items) == 2
+    assert page.has_more
+    assert decode_cursor(page.next_cursor) == documents[1]["_id"]
+
+
+@pytest.mark.asyncio
+async def test_repository_pages_follow_cursor(get_mongo_db):
+    repo = TeamMemberRepository(get_mongo_db)
+    for name in ["Ann", "Bob", "Cid"]:
+        await repo.create({"name": name})
+
+    first = await repo.get_page(2)
+    second = await repo.get_page(2, first.next_cursor)
+
+    assert [m["name"] for m in first.items] == ["Ann", "Bob"]
+    assert [m["name"] for m in second.items] == ["Cid"]
+    assert not second.has_more and second.next_cursor is None
@@ -0,0 +1,30 @@
+from typing import List, Optional
+
+from app.dependencies.projection import projection_for
+from app.models.task import ResponseTeamTaskViewCollection, TaskModel
+from app.models.team import ResponseTeamMembersCollection, ResponseTeamMemberSchema
+
+
+def test_projection_uses_field_aliases():
+    projection = projection_for(ResponseTeamMemberSchema)
+    assert projection["_id"] == 1
+    assert "member_id" not in projection
+    assert "hashed_password" not in projection
+
+
+def test_projection_unwraps_lists():
+    assert projection_for(List[TaskModel]) == projection_for(TaskModel)
+    assert projection_for(Optional[TaskModel]) == projection_for(TaskModel)
+
+
+def test_projection_of_page_uses_row_schema():
+    assert projection_for(ResponseTeamMembersCollection) == projection_for(
+        ResponseTeamMemberSchema
+    )
+    projection = projection_for(ResponseTeamTaskViewCollection)
+    assert "next_cursor" not in projection
+    assert {"title", "team_name"} <= set(projection)
+
+
+def test_projection_none_for_non_models():
+    assert projection_for(dict) is None
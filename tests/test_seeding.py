@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from app.database import migrations
+from app.models.task import TaskStatus
+from app.seeding import SeedConfig, build_members, build_teams, iter_task_batches, seed
+from app.services.team_service import MAX_TEAM_SIZE
+
+CONFIG = SeedConfig(members=40, tasks=120, batch_size=50, seed=7)
+
+
+def _generate(config):
+    rng = random.Random(config.seed)
+    members = build_members(rng, config, "hashed")
+    teams = build_teams(rng, config, members)
+    tasks = [task for batch in iter_task_batches(rng, config, teams) for task in batch]
+    return members, teams, tasks
+
+
+def test_generation_is_deterministic():
+    assert _generate(CONFIG) == _generate(CONFIG)
+    assert _generate(CONFIG) != _generate(SeedConfig(members=40, tasks=120, seed=8))
+
+
+def test_generated_documents_are_consistent():
+    members, teams, tasks = _generate(CONFIG)
+    by_id = {member["_id"]: member for member in members}
+    teams_by_id = {team["_id"]: team for team in teams}
+
+    assert len({member["email"] for member in members}) == len(members)
+    assert len(teams) == CONFIG.team_count
+    for team in teams:
+        assert 0 < len(team["member_ids"]) <= MAX_TEAM_SIZE
+        assert by_id[team["project_manager"]]["role"] == "team_lead"
+        for member_id in team["member_ids"]:
+            assert team["_id"] in by_id[member_id]["teams"]
+
+    assert len(tasks) == CONFIG.tasks
+    for task in tasks:
+        team = teams_by_id[task["team_id"]]
+        if task["status"] == TaskStatus.UN_ASSIGNED.value:
+            assert task["assigned_to"] is None
+        else:
+            assert task["assigned_to"] in team["member_ids"]
+        assert task["created_at"] <= task["updated_at"]
+
+
+@pytest.mark.asyncio
+async def test_seed_inserts_in_batches_and_marks_migrations_applied(get_mongo_db):
+    counts = await seed(get_mongo_db, CONFIG)
+
+    assert counts == {
+        "team_members": CONFIG.members,
+        "teams": CONFIG.team_count,
+        "tasks": CONFIG.tasks,
+    }
+    assert await get_mongo_db["tasks"].count_documents({}) == CONFIG.tasks
+    assert await migrations.pending_migrations(get_mongo_db) == []
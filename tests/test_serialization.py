@@ -0,0 +1,62 @@
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.metrics import TimedJSONResponse
+from app.models.task import CreateTaskSchema, TaskModel
+from app.repositories.task_repository import TaskRepository
+from app.serialization import dumps, trusted_rows
+from app.services.task_service import TaskService
+from benchmarks.serialization import task_documents, trusted, validated
+
+
+def test_trusted_rows_match_the_validated_response():
+    documents = task_documents(50)
+
+    assert json.loads(trusted(documents)) == json.loads(validated(documents))
+
+
+def test_trusted_rows_keep_only_model_fields():
+    task_id = ObjectId()
+    document = {"_id": task_id, "title": "Write docs", "created_by": ObjectId()}
+
+    [row] = trusted_rows(TaskModel, [document])
+    [by_name] = trusted_rows(TaskModel, [document], by_alias=False)
+
+    assert list(row) == [
+        field.alias or name for name, field in TaskModel.model_fields.items()
+    ]
+    assert row["_id"] is task_id and row["status"] is None
+    assert "created_by" not in row
+    assert by_name["task_id"] is task_id and "_id" not in by_name
+
+
+def test_dumps_encodes_driver_values():
+    task_id = ObjectId()
+
+    body = dumps({"_id": task_id, "created_at": datetime(2025, 1, 2, 3, 4, 5)})
+
+    assert json.loads(body) == {
+        "_id": str(task_id),
+        "created_at": "2025-01-02T03:04:05+00:00",
+    }
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+@pytest.mark.asyncio
+async def test_member_tasks_render_without_validation(get_mongo_db):
+    service = TaskService(TaskRepository(get_mongo_db))
+    member_id = str(ObjectId())
+    created = await service.create_task(
+        CreateTaskSchema(title="Review", status="assigned", assigned_to=member_id)
+    )
+
+    tasks = await service.get_tasks_by_member(member_id)
+    [row] = json.loads(TimedJSONResponse(tasks).body)
+
+    assert row["_id"] == str(created["_id"])
+    assert row["assigned_to"] == member_id
+    assert row["status"] == "assigned"
@@ -0,0 +1,219 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from bson import ObjectId
+
+from app.database.slow_queries import (
+    SlowQueryLog,
+    command_shape,
+    redact,
+    slow_query_log,
+    summarize_plan,
+)
+
+TEAM_ID = ObjectId()
+
+
+def _event(request_id, duration_ms=0, command=None, name="find"):
+    return SimpleNamespace(
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+        command_name=name,
+        database_name="task_management_dev",
+        command=command,
+        duration_micros=int(duration_ms * 1000),
+        failure={"errmsg": "boom"},
+    )
+
+
+class ProbeRepository:
+    def __init__(self, log):
+        self.log = log
+
+    async def get_tasks_by_team_ids(self, duration_ms):
+        command = {
+            "find": "tasks",
+            "filter": {"team_id": {"$in": [TEAM_ID]}},
+            "lsid": {"id": "session"},
+            "$db": "task_management_dev",
+        }
+        self.log.started(_event(1, command=command))
+        self.log.succeeded(_event(1, duration_ms))
+
+
+@pytest.fixture
+def log():
+    log = SlowQueryLog(threshold_ms=50, size=2)
+    log._run_explain = AsyncMock(
+        return_value={
+            "queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}},
+            "executionStats": {
+                "nReturned": 3,
+                "executionTimeMillis": 80,
+                "totalKeysExamined": 0,
+                "totalDocsExamined": 100000,
+            },
+        }
+    )
+    return log
+
+
+@pytest.mark.asyncio
+async def test_slow_command_is_captured_with_caller_and_plan(log):
+    await ProbeRepository(log).get_tasks_by_team_ids(duration_ms=120)
+    await asyncio.sleep(0)
+
+    [entry] = log.entries()
+    assert entry["caller"] == "ProbeRepository.get_tasks_by_team_ids"
+    assert entry["collection"] == "tasks"
+    assert entry["duration_ms"] == 120
+    # Session fields are dropped and filter values replaced by their types.
+    assert entry["command"] == {
+        "find": "tasks",
+        "filter": {"team_id": {"$in": ["<ObjectId>"]}},
+    }
+    log._run_explain.assert_awaited_once_with(
+        "task_management_dev",
+        {"find": "tasks", "filter": {"team_id": {"$in": [TEAM_ID]}}},
+    )
+    assert entry["plan"]["collection_scan"] is True
+    assert entry["plan"]["docs_examined"] == 100000
+
+
+@pytest.mark.asyncio
+async def test_fast_and_unexplainable_commands_are_ignored(log):
+    await ProbeRepository(log).get_tasks_by_team_ids(duration_ms=10)
+    log.started(_event(2, command={"insert": "tasks"}, name="insert"))
+    log.succeeded(_event(2, 500, name="insert"))
+
+    assert log.entries() == []
+    assert log._running == {}
+
+
+@pytest.mark.asyncio
+async def test_buffer_keeps_most_recent_entries(log):
+    for request_id in range(3):
+        log.started(_event(request_id, command={"find": f"c{request_id}"}))
+        log.failed(_event(request_id, 60))
+    await asyncio.sleep(0)
+
+    entries = log.entries()
+    assert [e["collection"] for e in entries] == ["c2", "c1"]
+    assert entries[0]["failure"] == "{'errmsg': 'boom'}"
+    assert [e["collection"] for e in log.entries(limit=1)] == ["c2"]
+
+
+@pytest.mark.asyncio
+async def test_explains_are_deduplicated_by_shape_and_capped():
+    def slow_find(request_id, collection, filter):
+        log.started(_event(request_id, command={"find": collection, "filter": filter}))
+        log.succeeded(_event(request_id, 60))
+
+    log = SlowQueryLog(threshold_ms=50, size=10)
+    log._run_explain = AsyncMock(return_value={"stages": [{"$cursor": {}}]})
+    slow_find(1, "tasks", {"team_id": 1})
+    slow_find(2, "tasks", {"team_id": 2})
+    slow_find(3, "teams", {"name": "A"})
+    # Two explains are running, so a third shape waits for its next capture.
+    slow_find(4, "tasks", {"status": "pending"})
+    for _ in range(5):
+        await asyncio.sleep(0)
+    slow_find(5, "tasks", {"status": "completed"})
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    plans = [entry["plan"] for entry in reversed(log.entries())]
+    assert "stages" in plans[0] and "stages" in plans[2] and "stages" in plans[4]
+    assert plans[1] == {"skipped": "same shape explained recently"}
+    assert plans[3] == {"skipped": "explains already running"}
+    assert log._run_explain.await_count == 3
+
+
+def test_command_shape_ignores_values():
+    def aggregate(team_id):
+        pipeline = [{"$match": {"team_id": team_id}}, {"$sort": {"due_date": 1}}]
+        return command_shape(
+            "aggregate", "db", {"aggregate": "tasks", "pipeline": pipeline}
+        )
+
+    assert aggregate(1) == aggregate(2)
+    assert aggregate(1) == (
+        "db",
+        "aggregate",
+        "tasks",
+        ("$match", "$sort"),
+        ("team_id",),
+    )
+    update = {"update": "tasks", "updates": [{"q": {"_id": 1}, "u": {}}]}
+    assert command_shape("update", "db", update)[-1] == ("_id",)
+
+
+def test_captured_update_keeps_no_values(log):
+    command = {
+        "update": "team_members",
+        "updates": [
+            {
+                "q": {"email": "ann@example.com"},
+                "u": {"$set": {"hashed_password": "$2b$12$secret", "active": None}},
+            }
+        ],
+    }
+    log.started(_event(1, command=command, name="update"))
+    log.succeeded(_event(1, 60, name="update"))
+
+    [entry] = log.entries()
+    assert entry["command"] == {
+        "update": "team_members",
+        "updates": [
+            {
+                "q": {"email": "<str>"},
+                "u": {"$set": {"hashed_password": "<str>", "active": None}},
+            }
+        ],
+    }
+    assert redact({"n": [1, 2.5]}) == {"n": ["<int>", "<float>"]}
+
+
+def test_summarize_aggregate_plan_over_a_view():
+    explain = {
+        "stages": [
+            {
+                "$cursor": {
+                    "queryPlanner": {
+                        "winningPlan": {
+                            "stage": "FETCH",
+                            "inputStage": {"stage": "IXSCAN"},
+                        },
+                        "rejectedPlans": [{"stage": "COLLSCAN"}],
+                    },
+                    "executionStats": {
+                        "totalKeysExamined": 10,
+                        "totalDocsExamined": 10,
+                    },
+                }
+            },
+            {
+                "$lookup": {"from": "teams"},
+                "totalDocsExamined": 400,
+                "collectionScans": 10,
+            },
+        ]
+    }
+
+    plan = summarize_plan(explain)
+
+    assert plan["stages"] == ["FETCH", "IXSCAN", "$cursor", "$lookup"]
+    assert plan["collection_scan"] is True
+    assert plan["keys_examined"] == 10
+    assert plan["docs_examined"] == 410
+
+
+def test_slow_queries_endpoint(project_manager_client):
+    slow_query_log.clear()
+
+    response = project_manager_client.get("/project-manager/slow-queries")
+
+    assert response.status_code == 200
+    assert response.json()["queries"] == []
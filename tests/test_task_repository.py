@@ -1,7 +1,9 @@
+import mongomock
 import pytest
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock
 from bson import ObjectId
-from app.repositories.task_repository import TaskRepository
+from app.repositories.task_repository import TaskRepository, dashboard_pipeline
 
 
 
@@ -30,3 +32,112 @@ async def test_update_task(repo):
     repo.collection.update_one = AsyncMock(return_value=AsyncMock(modified_count=1))
     result = await repo.update(str(obj_id), {'title': 'Updated'})
     repo.collection.update_one.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_create_many_reports_failed_positions(repo):
+    existing_id = ObjectId()
+    await repo.collection.insert_one({'_id': existing_id, 'title': 'Existing'})
+    repo.team_tasks.refresh_tasks = AsyncMock()
+    documents = [
+        {'_id': ObjectId(), 'title': 'A'},
+        {'_id': existing_id, 'title': 'Duplicate'},
+        {'_id': ObjectId(), 'title': 'B'},
+    ]
+
+    errors = await repo.create_many(documents)
+
+    assert list(errors) == [1]
+    assert await repo.collection.count_documents({}) == 3
+    refreshed = repo.team_tasks.refresh_tasks.call_args.args[0]
+    assert refreshed == [documents[0]['_id'], documents[2]['_id']]
+
+@pytest.mark.asyncio
+async def test_update_many_uses_one_bulk_write(repo):
+    ids = [ObjectId(), ObjectId()]
+    await repo.collection.insert_many([{'_id': i, 'status': 'pending'} for i in ids])
+    repo.team_tasks.refresh_tasks = AsyncMock()
+
+    result = await repo.update_many(
+        [(str(i), {'status': 'completed'}, None) for i in ids]
+    )
+
+    assert result.errors == {} and not result.missing and not result.out_of_scope
+    assert await repo.collection.count_documents({'status': 'completed'}) == 2
+
+@pytest.mark.asyncio
+async def test_update_many_reports_tasks_outside_their_scope(repo):
+    own_team, other_team = ObjectId(), ObjectId()
+    own, moved, gone, moving = ObjectId(), ObjectId(), ObjectId(), ObjectId()
+    await repo.collection.insert_many([
+        {'_id': own, 'team_id': own_team},
+        {'_id': moved, 'team_id': other_team},
+        {'_id': moving, 'team_id': own_team},
+    ])
+    repo.team_tasks.refresh_tasks = AsyncMock()
+    done = {'status': 'completed'}
+
+    result = await repo.update_many([
+        (str(own), done, [str(own_team)]),
+        (str(moved), done, [str(own_team)]),
+        (str(gone), done, [str(own_team)]),
+        (str(moving), {'team_id': str(other_team)}, [str(own_team)]),
+    ])
+
+    assert (result.missing, result.out_of_scope) == ({2}, {1})
+    assert (await repo.collection.find_one({'_id': moved})).get('status') is None
+    assert (await repo.collection.find_one({'_id': moving}))['team_id'] == other_team
+    refreshed = repo.team_tasks.refresh_tasks.call_args.args[0]
+    assert refreshed == [str(own), str(moving)]
+
+@pytest.mark.asyncio
+async def test_update_and_get_returns_new_document(repo):
+    obj_id = ObjectId()
+    await repo.collection.insert_one({'_id': obj_id, 'status': 'pending'})
+    repo.team_tasks.refresh_tasks = AsyncMock()
+
+    result = await repo.update_and_get(str(obj_id), {'status': 'completed'})
+
+    assert result.matched and result.modified
+    assert result.document['status'] == 'completed'
+    repo.team_tasks.refresh_tasks.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_updated_task_moves_to_top_of_recent_tasks(repo):
+    older, newer = ObjectId(), ObjectId()
+    await repo.collection.insert_many([
+        {'_id': older, 'status': 'pending',
+         'updated_at': datetime(2025, 1, 1, tzinfo=timezone.utc)},
+        {'_id': newer, 'status': 'pending',
+         'updated_at': datetime(2025, 1, 2, tzinfo=timezone.utc)},
+    ])
+    repo.team_tasks.refresh_tasks = AsyncMock()
+
+    await repo.update_and_get(str(older), {'status': 'completed'})
+
+    # mongomock_motor has no awaitable aggregate; run the facets on a copy.
+    db = mongomock.MongoClient()['task_management_dev']
+    db.tasks.insert_many(await repo.collection.find().to_list(length=None))
+    [stats] = db.tasks.aggregate(dashboard_pipeline(2))
+    assert [task['_id'] for task in stats['recent_tasks']] == [older, newer]
+
+@pytest.mark.asyncio
+async def test_update_and_get_tells_no_change_from_not_found(repo):
+    obj_id = ObjectId()
+    updated_at = datetime(2025, 1, 1)
+    await repo.collection.insert_one(
+        {'_id': obj_id, 'status': 'pending', 'updated_at': updated_at}
+    )
+    repo.team_tasks.refresh_tasks = AsyncMock()
+    repo.get = AsyncMock()
+
+    unchanged = await repo.update_and_get(str(obj_id), {'status': 'pending'})
+    missing = await repo.update_and_get(str(ObjectId()), {'status': 'pending'})
+
+    assert unchanged.matched and not unchanged.modified
+    assert unchanged.document['status'] == 'pending'
+    assert not missing.matched and missing.document is None
+    # Both are told from the write's result alone.
+    repo.get.assert_not_awaited()
+    repo.team_tasks.refresh_tasks.assert_not_awaited()
+    stored = await repo.collection.find_one({'_id': obj_id})
+    assert stored['updated_at'] == updated_at
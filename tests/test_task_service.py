@@ -1,8 +1,16 @@
 import pytest
 from unittest.mock import AsyncMock
 from app.services.task_service import TaskService
-from app.models.task import CreateTaskSchema
+from app.models.task import (
+    AssignTaskSchema,
+    BulkUpdateTaskItem,
+    CreateTaskSchema,
+    UpdateTaskSchema,
+)
+from bson import ObjectId
+from fastapi import HTTPException
 from app.repositories.task_repository import TaskRepository
+from app.utils import BulkUpdateResult
 
 @pytest.fixture
 def task_service(get_mongo_db):
@@ -16,3 +24,102 @@ async def test_create_task_success(task_service):
     assert result['title'] == 'Test'
 
  
+
+@pytest.mark.asyncio
+async def test_create_tasks_keeps_request_indexes():
+    repository = AsyncMock()
+    repository.create_many.return_value = {1: 'duplicate key'}
+    service = TaskService(repository)
+    tasks = {
+        0: CreateTaskSchema(title='A'),
+        3: CreateTaskSchema(title='B'),
+    }
+
+    results = await service.create_tasks(tasks)
+
+    repository.create_many.assert_awaited_once()
+    assert [(r.index, r.status_code) for r in results] == [(0, 200), (3, 400)]
+    assert results[1].detail == 'duplicate key'
+
+@pytest.mark.asyncio
+async def test_update_tasks_rejects_empty_updates():
+    repository = AsyncMock()
+    repository.update_many.return_value = BulkUpdateResult()
+    service = TaskService(repository)
+    updates = {
+        0: BulkUpdateTaskItem(task_id='a', status='completed'),
+        1: BulkUpdateTaskItem(task_id='b'),
+    }
+
+    results = await service.update_tasks(updates)
+
+    repository.update_many.assert_awaited_once_with(
+        [('a', {'status': 'completed'}, None)]
+    )
+    assert {r.index: r.status_code for r in results} == {0: 200, 1: 400}
+
+@pytest.mark.asyncio
+async def test_update_tasks_reports_unmatched_tasks():
+    repository = AsyncMock()
+    repository.update_many.return_value = BulkUpdateResult(
+        errors={0: 'bad'}, missing={1}, out_of_scope={2}
+    )
+    service = TaskService(repository)
+    updates = {
+        index: BulkUpdateTaskItem(task_id=task_id, status='completed')
+        for index, task_id in enumerate('abcd')
+    }
+    team_id = ObjectId()
+
+    results = await service.update_tasks(updates, {2: [team_id]})
+
+    assert repository.update_many.call_args.args[0][2][2] == [team_id]
+    assert [r.status_code for r in results] == [400, 404, 403, 200]
+
+@pytest.mark.asyncio
+async def test_update_task_scoped_to_teams(task_service):
+    own_team, other_team = ObjectId(), ObjectId()
+    own_task, other_task = ObjectId(), ObjectId()
+    await task_service.task_repository.collection.insert_many([
+        {'_id': own_task, 'title': 'Mine', 'team_id': own_team},
+        {'_id': other_task, 'title': 'Theirs', 'team_id': other_team},
+    ])
+    update = UpdateTaskSchema(title='Renamed')
+
+    task = await task_service.update_task(str(own_task), update, {str(own_team)})
+    assert task['title'] == 'Renamed'
+
+    with pytest.raises(HTTPException) as exc:
+        await task_service.update_task(str(other_task), update, {str(own_team)})
+    assert exc.value.status_code == 403
+    stored = await task_service.task_repository.get(str(other_task))
+    assert stored['title'] == 'Theirs'
+
+    with pytest.raises(HTTPException) as exc:
+        await task_service.update_task(str(ObjectId()), update, {str(own_team)})
+    assert exc.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_assign_task_requires_team_membership(task_service):
+    team_id, member, outsider, task_id = ObjectId(), ObjectId(), ObjectId(), ObjectId()
+    await task_service.task_repository.collection.insert_one(
+        {'_id': task_id, 'title': 'Task', 'team_id': team_id}
+    )
+    teams = {str(team_id): {'_id': team_id, 'member_ids': [member]}}
+
+    with pytest.raises(HTTPException) as exc:
+        await task_service.assign_task(
+            str(task_id), AssignTaskSchema(assigned_to=str(outsider)), teams
+        )
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        await task_service.assign_task(
+            str(task_id), AssignTaskSchema(assigned_to=str(member)), {}
+        )
+    assert exc.value.status_code == 403
+
+    task = await task_service.assign_task(
+        str(task_id), AssignTaskSchema(assigned_to=str(member)), teams
+    )
+    assert task['assigned_to'] == member
@@ -20,3 +20,69 @@ async def test_get_team_by_id(repo):
     repo.collection.find_one = AsyncMock(return_value={'_id': obj_id, 'name': 'Team'})
     result = await repo.get_team_by_id(str(obj_id))
     repo.collection.find_one.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_add_team_members_guards_size_on_server(repo):
+    existing = ObjectId()
+    team_id = await repo.create({'name': 'Team', 'member_ids': [existing]})
+
+    team = await repo.add_team_members(team_id, [str(existing), str(ObjectId())], 2)
+    assert len(team['member_ids']) == 2
+
+    assert await repo.add_team_members(team_id, [str(ObjectId())], 2) is None
+    assert len((await repo.get(team_id))['member_ids']) == 2
+
+@pytest.mark.asyncio
+async def test_remove_team_members(repo):
+    members = [ObjectId(), ObjectId(), ObjectId()]
+    team_id = await repo.create({'name': 'Team', 'member_ids': members})
+
+    team = await repo.remove_team_members(team_id, [str(m) for m in members[:2]])
+
+    assert team['member_ids'] == [members[2]]
+
+@pytest.mark.asyncio
+async def test_membership_changes_bump_member_versions(repo):
+    manager, member, newcomer = ObjectId(), ObjectId(), ObjectId()
+    await repo.members.insert_many([{'_id': m} for m in (manager, member, newcomer)])
+    team_id = await repo.create(
+        {'name': 'Team', 'project_manager': manager, 'member_ids': [member]}
+    )
+    await repo.add_team_members(team_id, [str(newcomer)], 5)
+
+    versions = {
+        m['_id']: m.get('membership_version', 0)
+        async for m in repo.members.find()
+    }
+    assert versions == {manager: 1, member: 1, newcomer: 1}
+
+    await repo.update_and_get(team_id, {'name': 'Renamed'})
+    assert (await repo.members.find_one({'_id': manager}))['membership_version'] == 1
+
+@pytest.mark.asyncio
+async def test_only_added_or_removed_members_are_bumped(repo):
+    member, newcomer, outsider = ObjectId(), ObjectId(), ObjectId()
+    await repo.members.insert_many([{'_id': m} for m in (member, newcomer, outsider)])
+    team_id = await repo.create({'name': 'Team', 'member_ids': [member]})
+
+    async def versions():
+        return {
+            m['_id']: m.get('membership_version', 0)
+            async for m in repo.members.find()
+        }
+
+    team = await repo.add_team_members(team_id, [str(member), str(newcomer)], 5)
+    assert team['member_ids'] == [member, newcomer]
+    assert await versions() == {member: 1, newcomer: 1, outsider: 0}
+
+    team = await repo.remove_team_members(team_id, [str(newcomer), str(outsider)])
+    assert team['member_ids'] == [member]
+    assert await versions() == {member: 1, newcomer: 2, outsider: 0}
+
+@pytest.mark.asyncio
+async def test_invalid_member_ids_are_rejected(repo):
+    team_id = await repo.create({'name': 'Team'})
+    with pytest.raises(ValueError, match='Invalid member ID: nope'):
+        await repo.add_team_members(team_id, ['nope'], 5)
+    with pytest.raises(ValueError, match='Invalid team ID'):
+        await repo.remove_team_members('nope', [str(ObjectId())])
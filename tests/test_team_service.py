@@ -2,7 +2,9 @@ import pytest
 from unittest.mock import AsyncMock
 from app.services.team_service import TeamService
 from app.repositories.team_repository import TeamRepository
-from app.models.team import CreateTeamSchema
+from app.models.team import AddTeamMembersSchema, CreateTeamSchema, UpdateTeamSchema
+from bson import ObjectId
+from fastapi import HTTPException
 
 @pytest.fixture
 def team_service(get_mongo_db):
@@ -15,3 +17,39 @@ async def test_create_team_success(team_service):
     schema = CreateTeamSchema(name='Team', member_ids=[])
     result = await team_service.create_team(schema)
     assert result['name'] == 'Team'
+
+@pytest.mark.asyncio
+async def test_add_team_members_over_limit(team_service):
+    team = await team_service.create_team(CreateTeamSchema(name='Team', member_ids=[]))
+    members = AddTeamMembersSchema(member_ids=[str(ObjectId()) for _ in range(6)])
+    with pytest.raises(HTTPException) as exc:
+        await team_service.add_team_members(str(team['_id']), members)
+    assert exc.value.status_code == 400
+
+@pytest.mark.asyncio
+async def test_add_team_members_unknown_team(team_service):
+    members = AddTeamMembersSchema(member_ids=[str(ObjectId())])
+    with pytest.raises(HTTPException) as exc:
+        await team_service.add_team_members(str(ObjectId()), members)
+    assert exc.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_invalid_member_ids_are_bad_requests(team_service):
+    team = await team_service.create_team(CreateTeamSchema(name='Team', member_ids=[]))
+    members = AddTeamMembersSchema(member_ids=['not-an-id'])
+    for change in (team_service.add_team_members, team_service.remove_team_members):
+        with pytest.raises(HTTPException) as exc:
+            await change(str(team['_id']), members)
+        assert exc.value.status_code == 400
+
+@pytest.mark.asyncio
+async def test_update_team_returns_updated_document(team_service):
+    team = await team_service.create_team(CreateTeamSchema(name='Team', member_ids=[]))
+    updated = await team_service.update_team(
+        str(team['_id']), UpdateTeamSchema(name='Renamed')
+    )
+    assert updated['name'] == 'Renamed'
+
+    with pytest.raises(HTTPException) as exc:
+        await team_service.update_team(str(ObjectId()), UpdateTeamSchema(name='X'))
+    assert exc.value.status_code == 404